@@ -0,0 +1,177 @@
+"""Hot-path benchmarks: stats, spawns, drops, combat, shop, crafting, saves.
+
+Usage (from MainGame/):
+  python benchmarks/bench_hot_paths.py                 # run and print timings
+  python benchmarks/bench_hot_paths.py --save          # write benchmarks/baselines/hot_paths.json
+  python benchmarks/bench_hot_paths.py --compare       # fail (exit 1) on >20% p50 slowdowns
+  python benchmarks/bench_hot_paths.py --compare --threshold 0.1 --only 'shop_*'
+
+baselines/hot_paths.json is a committed reference run; timings are machine
+specific, so re-run --save on your machine before comparing a change.
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from harness import DATA_PATH, main
+
+from player import Player
+from enemy import Enemy
+from battle_system import BattleSystem
+from effect_manager import EffectManager
+from combat_resolver import CombatResolver
+from skill_manager import SkillManager
+from shop import Shop
+from crafting_system import CraftingSystem
+from save_manager import SaveManager
+
+SUITE = 'hot_paths'
+WAVE = 120
+
+
+def make_player():
+    """Late-game player: full equipment, a big inventory and every skill"""
+    player = Player({"name": "Bench", "hp": 2500, "atk": 180, "def": 90, "gold": 50000, "game_seed": 42})
+    player.level = 60
+    player.equipment.update({'weapon': 'mythril_blade', 'armor': 'dragon_plate', 'offhand': 'guardian_shield',
+                             'relic1': 'power_ring', 'relic2': 'critical_charm', 'relic3': 'dragon_eye'})
+    shop = Shop(DATA_PATH)
+    for n, item in enumerate(shop.items):
+        player.inventory[item['id']] = 1 + n % 25
+    skills = SkillManager(DATA_PATH)
+    player.skills = list(skills.skills)
+    player.skill_levels = {skill_id: 3 for skill_id in player.skills}
+    player._recalc_stats()
+    return player
+
+
+def bench_recalc_stats():
+    player = make_player()
+    return player._recalc_stats
+
+
+def bench_random_enemy():
+    return lambda: Enemy.random_enemy(WAVE, 'volcanic_peak')
+
+
+def bench_process_drops():
+    battle = BattleSystem(make_player(), DATA_PATH)
+    enemy = Enemy.from_id('wolf', WAVE)
+    inventory = dict(battle.player.inventory)
+
+    def run():
+        battle.player.inventory = dict(inventory)
+        battle._process_drops(enemy)
+    return run
+
+
+def _combat_snapshots():
+    """Resolver plus attacker/defender snapshots, as taken once per action"""
+    effects = EffectManager()
+    resolver = CombatResolver(effects)
+    player = make_player()
+    enemy = Enemy.from_id('miniboss_golem', WAVE)
+    return resolver, resolver.snapshot_attacker(player), resolver.snapshot_defender(enemy), enemy
+
+
+def bench_resolve_hit():
+    resolver, attacker, defender, enemy = _combat_snapshots()
+
+    def run():
+        enemy.hp = 10 ** 9
+        resolver.resolve_hit(attacker, defender, 250)
+    return run
+
+
+def bench_resolve_multi_hit():
+    resolver, attacker, defender, enemy = _combat_snapshots()
+
+    def run():
+        enemy.hp = 10 ** 9
+        resolver.resolve_multi_hit(attacker, defender, 60, 50)
+    return run
+
+
+def bench_use_skill():
+    player = make_player()
+    skills = SkillManager(DATA_PATH)
+    effects = EffectManager()
+    enemy = Enemy.from_id('miniboss_golem', WAVE)
+    events = []
+
+    def run():
+        enemy.hp = 10 ** 9
+        player.skill_cooldowns = {}
+        events.clear()
+        skills.use_skill(player, enemy, 'skill_power_strike', effects, events)
+    return run
+
+
+def bench_shop_offers_cold():
+    shop = Shop(DATA_PATH)
+    zone = {'id': 'volcanic_peak'}
+
+    def run():
+        shop._offer_cache.clear()
+        shop.get_offers_for_wave(WAVE, player_seed=42, cumulative_increase=0.35, current_zone=zone)
+    return run
+
+
+def bench_shop_offers_cached():
+    shop = Shop(DATA_PATH)
+    zone = {'id': 'volcanic_peak'}
+    return lambda: shop.get_offers_for_wave(WAVE, player_seed=42, cumulative_increase=0.35, current_zone=zone)
+
+
+def bench_available_recipes():
+    crafting = CraftingSystem(DATA_PATH)
+    player = make_player()
+    return lambda: crafting.get_available_recipes(player.inventory, player.level)
+
+
+class _Battle:
+    wave = WAVE
+    current_zone = {'id': 'volcanic_peak'}
+    enemy = None
+    in_shop = False
+
+
+def _save_manager():
+    # Kept alive with the manager; cleaned up at interpreter exit
+    tmp = tempfile.TemporaryDirectory()
+    manager = SaveManager(tmp.name)
+    manager._bench_tmp = tmp
+    return manager
+
+
+def bench_save():
+    manager = _save_manager()
+    player = make_player()
+    return lambda: manager.save(player, battle=_Battle())
+
+
+def bench_load():
+    manager = _save_manager()
+    manager.save(make_player(), battle=_Battle())
+    return manager.load
+
+
+BENCHMARKS = [
+    ('player.recalc_stats', bench_recalc_stats),
+    ('enemy.random_enemy', bench_random_enemy),
+    ('battle.process_drops', bench_process_drops),
+    ('combat.resolve_hit', bench_resolve_hit),
+    ('combat.resolve_multi_hit', bench_resolve_multi_hit),
+    ('skills.use_skill', bench_use_skill),
+    ('shop_offers_cold', bench_shop_offers_cold),
+    ('shop_offers_cached', bench_shop_offers_cached),
+    ('crafting.available_recipes', bench_available_recipes),
+    ('save_manager.save', bench_save),
+    ('save_manager.load', bench_load),
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main(SUITE, BENCHMARKS))
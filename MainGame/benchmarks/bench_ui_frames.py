@@ -0,0 +1,184 @@
+"""Headless UI frame benchmark: UIManager.update + draw per screen.
+
+Renders with SDL's dummy video driver (no window) for a synthetic
+worst-case player: hundreds of inventory stacks, every skill, dozens of
+active effects and a full combat log. Each sample is one frame
+(update, background blit, draw, flip).
+
+Usage (from MainGame/):
+  python benchmarks/bench_ui_frames.py                     # p50/p95/p99 ms per screen
+  python benchmarks/bench_ui_frames.py --save              # write benchmarks/baselines/ui_frames.json
+  python benchmarks/bench_ui_frames.py --compare --metric p95
+  python benchmarks/bench_ui_frames.py --only 'character_*'
+"""
+import os
+import sys
+import json
+import time
+from pathlib import Path
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from harness import DATA_PATH, GAME_DIR, main
+
+import pygame
+
+from player import Player
+from enemy import Enemy
+from battle_system import BattleSystem
+from crafting_system import CraftingSystem
+from shop import Shop
+from effects import Buff, Debuff
+from ui_manager import UIManager
+from shop_screens import shop_layout, draw_shop, challenge_shop_layout, draw_challenge_shop
+
+SUITE = 'ui_frames'
+ASSETS_PATH = GAME_DIR / 'assets'
+SCREEN_SIZE = (1280, 720)
+WAVE = 150
+# Inventory stacks on top of every real item (unknown ids show up as misc)
+EXTRA_STACKS = 300
+FRAMES = 120
+WARMUP_FRAMES = 10
+
+_state = {}
+
+
+def _screen():
+    """Shared dummy-driver display surface"""
+    if 'screen' not in _state:
+        pygame.init()
+        _state['screen'] = pygame.display.set_mode(SCREEN_SIZE)
+        _state['background'] = pygame.Surface(SCREEN_SIZE).convert()
+        _state['background'].fill((40, 60, 40))
+    return _state['screen']
+
+
+def make_battle():
+    """Worst-case late-game battle state"""
+    player = Player({"name": "Hoarder", "hp": 5000, "atk": 400, "def": 150, "gold": 10 ** 6, "game_seed": 7})
+    player.level = 80
+    player.equipment.update({'weapon': 'mythril_blade', 'armor': 'dragon_plate', 'offhand': 'guardian_shield',
+                             'relic1': 'power_ring', 'relic2': 'critical_charm', 'relic3': 'dragon_eye'})
+    battle = BattleSystem(player, DATA_PATH)
+    battle.crafting_system = CraftingSystem(DATA_PATH)
+    battle.wave = WAVE
+    battle.enemy = Enemy.from_id('boss_dragon', WAVE)
+    with open(DATA_PATH / 'items.json', 'r', encoding='utf-8') as f:
+        for n, item in enumerate(json.load(f)['items']):
+            player.inventory[item['id']] = 1 + n * 7 % 999
+    for n in range(EXTRA_STACKS):
+        player.inventory[f"bench_stack_{n:03d}"] = 1 + n
+    player.skills = list(battle.skill_manager.skills)
+    player.skill_levels = {skill_id: 1 + n % 9 for n, skill_id in enumerate(player.skills)}
+    player.equipped_skills = player.skills[:5]
+    player.challenge_coins = 500
+    player.permanent_upgrades = {}
+    for n in range(40):
+        effect = Buff('atk', 5 + n, 10 + n, f"Bench buff {n}") if n % 2 else Debuff('def', -3, 8 + n, f"Bench debuff {n}")
+        battle.effect_manager.add_effect(player, effect)
+    for n in range(100):
+        battle.add_log(f"Turn {n}: Hoarder hits {battle.enemy.name} for {1000 + n} damage!", ('info', 'damage', 'buff')[n % 3])
+    player._recalc_stats()
+    return battle
+
+
+def frame_bench(configure=None, overlay=None, damage_events=0):
+    """Factory for one screen: configure(ui, battle) sets the modal state,
+    overlay(screen, battle) draws on top of the UI (shop modals)"""
+    def factory():
+        screen = _screen()
+        background = _state['background']
+        battle = make_battle()
+        player = battle.player
+        ui = UIManager(screen, assets_path=ASSETS_PATH, data_path=DATA_PATH)
+        ui.set_actions(battle)
+        ui.combat_log_open = False
+        if configure:
+            configure(ui, battle)
+
+        def frame():
+            for n in range(damage_events):
+                battle.damage_events.append({'target': 'enemy' if n % 2 else 'player', 'amount': 999 + n,
+                                             'time': time.time(), 'is_crit': n % 3 == 0})
+            ui.update(player, battle)
+            screen.blit(background, (0, 0))
+            ui.draw(player, battle)
+            if overlay:
+                overlay(screen, battle)
+            pygame.display.flip()
+        return frame
+    return factory
+
+
+def _character(tab, select=None):
+    def configure(ui, battle):
+        ui.character_sheet_open = True
+        ui.character_sheet_tab = tab
+        if select:
+            item_def = ui.shop_loader.find_item(select)
+            ui.inventory_selected = {'item_id': select, 'count': battle.player.inventory.get(select, 1), 'def': item_def}
+    return configure
+
+
+def _skills(ui, battle):
+    ui.skills_ui_open = True
+
+
+def _crafting(tab):
+    def configure(ui, battle):
+        ui.crafting_ui_open = True
+        ui.crafting_tab = tab
+        ui.crafting_selected_recipe = 'health_potion'
+    return configure
+
+
+def _combat_log(ui, battle):
+    ui.combat_log_open = True
+
+
+def _shop_overlay():
+    state = {}
+
+    def overlay(screen, battle):
+        if not state:
+            state['layout'] = shop_layout(*SCREEN_SIZE)
+            state['offers'] = Shop(DATA_PATH).get_offers_for_wave(WAVE, player_seed=7, current_zone=None)
+        # Mouse over the first offer so the tooltip is drawn too
+        layout = state['layout']
+        mouse = (layout['panel_x'] + 60, layout['panel_y'] + 140)
+        draw_shop(screen, battle.player, battle, state['offers'], 'items', 0, mouse, layout)
+    return overlay
+
+
+def _challenge_overlay():
+    state = {}
+
+    def overlay(screen, battle):
+        if not state:
+            state['layout'] = challenge_shop_layout(*SCREEN_SIZE)
+            with open(DATA_PATH / 'upgrades.json', 'r', encoding='utf-8') as f:
+                state['upgrades'] = json.load(f).get('upgrades', [])
+        draw_challenge_shop(screen, battle.player, state['upgrades'], 'all', 0, state['layout'])
+    return overlay
+
+
+BENCHMARKS = [
+    ('battle', frame_bench(damage_events=2)),
+    ('character_equipment', frame_bench(_character('equipment'))),
+    ('character_inventory', frame_bench(_character('inventory', select='potion'))),
+    ('character_stats', frame_bench(_character('stats'))),
+    ('skills', frame_bench(_skills)),
+    ('crafting_craft', frame_bench(_crafting('craft'))),
+    ('crafting_scrap', frame_bench(_crafting('scrap'))),
+    ('combat_log', frame_bench(_combat_log)),
+    ('shop', frame_bench(overlay=_shop_overlay())),
+    ('challenge_shop', frame_bench(overlay=_challenge_overlay())),
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main(SUITE, BENCHMARKS, default_repeat=FRAMES, min_batch=0, warmup=WARMUP_FRAMES))
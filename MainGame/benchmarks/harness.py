@@ -0,0 +1,213 @@
+# benchmarks/harness.py
+"""Timing harness shared by the benchmark scripts.
+
+Each benchmark is a (name, factory) pair: the factory does the setup and
+returns the zero-argument callable to time. Results are per-call
+milliseconds (p50/p95/p99 over the repeats), saved as JSON baselines and
+compared against them to flag regressions.
+"""
+import argparse
+import contextlib
+import fnmatch
+import io
+import json
+import logging
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+GAME_DIR = HERE.parent
+SRC_DIR = GAME_DIR / 'src'
+DATA_PATH = GAME_DIR / 'data'
+BASELINE_DIR = HERE / 'baselines'
+
+# A benchmark is a regression when its p50 (or --metric) is this much slower than the baseline
+DEFAULT_THRESHOLD = 0.20
+# Seed reset before every factory and every timed batch, so runs are repeatable
+SEED = 1234
+
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from game_log import muted
+
+
+@contextlib.contextmanager
+def quiet():
+    """Swallow the game's print() and log output while timing"""
+    with contextlib.redirect_stdout(io.StringIO()), muted(logging.CRITICAL):
+        yield
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers (pct in 0..100)"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    pos = (len(ordered) - 1) * pct / 100.0
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+def summarize(samples_ms):
+    """p50/p95/p99/min/mean of per-call samples (ms)"""
+    return {
+        'p50': percentile(samples_ms, 50),
+        'p95': percentile(samples_ms, 95),
+        'p99': percentile(samples_ms, 99),
+        'min': min(samples_ms) if samples_ms else 0.0,
+        'mean': statistics.fmean(samples_ms) if samples_ms else 0.0,
+        'samples': len(samples_ms),
+    }
+
+
+def time_call(fn, repeat=15, min_batch=0.02, warmup=0):
+    """Per-call time (ms) of fn for each of `repeat` batches.
+
+    The batch size is calibrated once so a batch lasts at least min_batch
+    seconds; fast calls are averaged over many loops, slow ones run once.
+    With min_batch=0 every sample is a single call (e.g. one frame).
+    """
+    with quiet():
+        for _ in range(warmup):
+            fn()
+        loops = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_batch or loops >= 1 << 20:
+                break
+            loops *= 10 if elapsed < min_batch / 10 else 2
+        samples = []
+        for _ in range(repeat):
+            random.seed(SEED)
+            start = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            samples.append((time.perf_counter() - start) * 1000.0 / loops)
+    return samples
+
+
+def run_suite(benchmarks, pattern=None, repeat=15, min_batch=0.02, warmup=0):
+    """Run every (name, factory) matching pattern. Returns {name: summary}"""
+    results = {}
+    for name, factory in benchmarks:
+        if pattern and not fnmatch.fnmatch(name, pattern):
+            continue
+        random.seed(SEED)
+        with quiet():
+            fn = factory()
+        results[name] = summarize(time_call(fn, repeat=repeat, min_batch=min_batch, warmup=warmup))
+        result = results[name]
+        print(f"  {name:<32} p50 {result['p50']:9.4f} ms   p95 {result['p95']:9.4f} ms   p99 {result['p99']:9.4f} ms")
+    return results
+
+
+def save_results(path, suite, results):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        'suite': suite,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+    print(f"💾 Baseline saved: {path}")
+
+
+def load_results(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('results', {})
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD, metric='p50'):
+    """Rows of (name, baseline ms, current ms, ratio, status).
+
+    status: 'regression' (slower than 1 + threshold), 'faster' (quicker than
+    1 - threshold), 'ok', 'new' (no baseline) or 'missing' (not run).
+    """
+    rows = []
+    for name, result in current.items():
+        base = baseline.get(name)
+        if base is None:
+            rows.append((name, None, result[metric], None, 'new'))
+            continue
+        ratio = result[metric] / base[metric] if base[metric] else float('inf')
+        if ratio > 1.0 + threshold:
+            status = 'regression'
+        elif ratio < 1.0 - threshold:
+            status = 'faster'
+        else:
+            status = 'ok'
+        rows.append((name, base[metric], result[metric], ratio, status))
+    for name, base in baseline.items():
+        if name not in current:
+            rows.append((name, base[metric], None, None, 'missing'))
+    return rows
+
+
+def print_comparison(rows, threshold, metric='p50'):
+    marks = {'regression': '❌', 'faster': '🚀', 'ok': '✓', 'new': '＋', 'missing': '?'}
+    print(f"\nComparison ({metric}, threshold ±{threshold * 100:.0f}%):")
+    for name, base, cur, ratio, status in rows:
+        base_text = f"{base:9.4f}" if base is not None else '        -'
+        cur_text = f"{cur:9.4f}" if cur is not None else '        -'
+        ratio_text = f"{ratio:6.2f}x" if ratio is not None else '      -'
+        print(f"  {marks[status]} {name:<32} {base_text} -> {cur_text} ms  {ratio_text}  {status}")
+
+
+def main(suite, benchmarks, argv=None, default_repeat=15, min_batch=0.02, warmup=0):
+    """Command line entry point shared by the benchmark scripts.
+
+    Exit code is 1 when --compare finds a regression.
+    """
+    default_path = BASELINE_DIR / f"{suite}.json"
+    parser = argparse.ArgumentParser(description=f"VintageLegends benchmarks: {suite}")
+    parser.add_argument('--save', nargs='?', const=str(default_path), metavar='PATH',
+                        help=f"write results as a JSON baseline (default {default_path.relative_to(GAME_DIR)})")
+    parser.add_argument('--compare', nargs='?', const=str(default_path), metavar='PATH',
+                        help="compare against a JSON baseline and fail on regressions")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before a regression is flagged (0.2 = 20%%)")
+    parser.add_argument('--metric', choices=('p50', 'p95', 'p99'), default='p50',
+                        help="statistic compared against the baseline")
+    parser.add_argument('--only', metavar='PATTERN', help="run benchmarks matching a glob (e.g. 'shop_*')")
+    parser.add_argument('--repeat', type=int, default=default_repeat, help="timed samples per benchmark")
+    parser.add_argument('--list', action='store_true', help="list benchmark names and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, _ in benchmarks:
+            print(name)
+        return 0
+
+    print(f"⏱️  {suite} ({platform.python_version()}, repeat={args.repeat})")
+    results = run_suite(benchmarks, args.only, args.repeat, min_batch, warmup)
+
+    status = 0
+    if args.compare:
+        baseline = load_results(args.compare)
+        if args.only:
+            baseline = {name: r for name, r in baseline.items() if fnmatch.fnmatch(name, args.only)}
+        rows = compare_results(baseline, results, args.threshold, args.metric)
+        print_comparison(rows, args.threshold, args.metric)
+        regressions = [row[0] for row in rows if row[4] == 'regression']
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+            status = 1
+        else:
+            print("\n✅ No regressions")
+    if args.save:
+        save_results(args.save, suite, results)
+    return status
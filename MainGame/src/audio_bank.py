@@ -0,0 +1,166 @@
+# src/audio_bank.py
+"""Process-wide bank of decoded combat sound effects.
+
+The MP3s are decoded once per process (not once per BattleSystem, so a
+Retry after game over reuses them). With a cache directory set, the decoded
+PCM is also written to disk, keyed by the source file and mixer format, so
+later launches skip the MP3 decode.
+
+`play()` picks the channel itself and applies per-sound limits: a sound
+already playing `max_voices` times restarts its oldest voice instead of
+taking another channel, and when every channel is busy a sound may take
+over the channel of a lower-priority one. Hit spam from multi-hit attacks
+therefore never starves the kill/player-hit sounds.
+"""
+import hashlib
+from collections import namedtuple
+from pathlib import Path
+
+import pygame
+
+try:
+    from game_log import get_logger
+except Exception:
+    from .game_log import get_logger
+
+log = get_logger('audio')
+
+EFFECTS_DIR = Path(__file__).resolve().parents[1] / 'assets' / 'sounds' / 'effects'
+
+SoundSpec = namedtuple('SoundSpec', ('file', 'volume', 'max_voices', 'priority'))
+
+# Higher priority may take the channel of a lower one when all are busy
+SOUNDS = {
+    'monster_hit': SoundSpec('MonsterHit.mp3', 0.3, 3, 1),
+    'player_hit': SoundSpec('MageHit.mp3', 0.3, 2, 2),
+    'monster_kill': SoundSpec('MonsterKill.mp3', 0.6, 2, 3),
+}
+
+
+class AudioBank:
+    def __init__(self, specs=None, effects_dir=EFFECTS_DIR, cache_dir=None):
+        self.specs = dict(SOUNDS if specs is None else specs)
+        self.effects_dir = Path(effects_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.effects_volume = 1.0
+        self.sounds = {}
+        self.loaded = False
+        self.stats = {'decoded': 0, 'cached': 0, 'played': 0, 'restarted': 0, 'stolen': 0, 'dropped': 0}
+        self._channels = []
+        # channel index -> (sound key, play sequence number)
+        self._owners = {}
+        self._sequence = 0
+
+    def load(self):
+        """Decode every sound once; returns {key: Sound} (empty without a mixer)"""
+        if self.loaded:
+            return self.sounds
+        mixer_format = pygame.mixer.get_init()
+        if not mixer_format:
+            log.warning("Could not load sound effects: mixer not initialized")
+            return self.sounds
+        self.loaded = True
+        for key, spec in self.specs.items():
+            path = self.effects_dir / spec.file
+            if not path.exists():
+                continue
+            try:
+                sound = self._decode(path, mixer_format)
+            except Exception as e:
+                log.warning("Could not load sound effect %s: %s", spec.file, e)
+                continue
+            sound.set_volume(spec.volume * self.effects_volume)
+            self.sounds[key] = sound
+        return self.sounds
+
+    def _cache_file(self, path, mixer_format):
+        stat = path.stat()
+        key = f"{path.name}|{stat.st_mtime_ns}|{stat.st_size}|{mixer_format}"
+        return self.cache_dir / f"{path.stem}-{hashlib.sha1(key.encode()).hexdigest()[:16]}.pcm"
+
+    def _decode(self, path, mixer_format):
+        cache_file = self._cache_file(path, mixer_format) if self.cache_dir else None
+        if cache_file is not None and cache_file.exists():
+            try:
+                sound = pygame.mixer.Sound(buffer=cache_file.read_bytes())
+                self.stats['cached'] += 1
+                return sound
+            except Exception:
+                pass
+        sound = pygame.mixer.Sound(str(path))
+        self.stats['decoded'] += 1
+        if cache_file is not None:
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                for stale in cache_file.parent.glob(f"{path.stem}-*.pcm"):
+                    stale.unlink()
+                tmp = cache_file.with_suffix('.tmp')
+                tmp.write_bytes(sound.get_raw())
+                tmp.replace(cache_file)
+            except Exception as e:
+                log.debug("PCM cache write failed for %s: %s", path.name, e)
+        return sound
+
+    def set_effects_volume(self, volume):
+        """Master effects volume (usersettings volume.effects), 0..1"""
+        self.effects_volume = max(0.0, min(1.0, float(volume)))
+        for key, sound in self.sounds.items():
+            sound.set_volume(self.specs[key].volume * self.effects_volume)
+
+    def _live_voices(self):
+        """[(channel index, key, sequence)] of channels still playing a bank sound"""
+        live = []
+        for index, (key, sequence) in list(self._owners.items()):
+            channel = self._channels[index]
+            if channel.get_busy() and channel.get_sound() is self.sounds.get(key):
+                live.append((index, key, sequence))
+            else:
+                del self._owners[index]
+        return live
+
+    def play(self, key):
+        """Play `key` within its voice limit; returns the Channel or None if dropped"""
+        sound = self.sounds.get(key)
+        if sound is None:
+            return None
+        count = pygame.mixer.get_num_channels()
+        if len(self._channels) != count:
+            self._channels = [pygame.mixer.Channel(i) for i in range(count)]
+            self._owners.clear()
+        spec = self.specs[key]
+        live = self._live_voices()
+        voices = [voice for voice in live if voice[1] == key]
+        index = None
+        if len(voices) >= spec.max_voices:
+            index = min(voices, key=lambda voice: voice[2])[0]
+            self.stats['restarted'] += 1
+        else:
+            for i, channel in enumerate(self._channels):
+                if not channel.get_busy():
+                    index = i
+                    break
+            if index is None:
+                lower = [voice for voice in live if self.specs[voice[1]].priority < spec.priority]
+                if lower:
+                    index = min(lower, key=lambda voice: (self.specs[voice[1]].priority, voice[2]))[0]
+                    self.stats['stolen'] += 1
+        if index is None:
+            self.stats['dropped'] += 1
+            return None
+        channel = self._channels[index]
+        channel.play(sound)
+        self._sequence += 1
+        self._owners[index] = (key, self._sequence)
+        self.stats['played'] += 1
+        return channel
+
+
+_bank = None
+
+
+def get_audio_bank():
+    """The process-wide AudioBank"""
+    global _bank
+    if _bank is None:
+        _bank = AudioBank()
+    return _bank
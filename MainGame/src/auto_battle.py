@@ -0,0 +1,264 @@
+# src/auto_battle.py
+"""Fast-forward mode: resolve whole waves without the frame loop.
+
+An AutoPlayPolicy picks each player action (potion below an HP threshold,
+then skills by priority, then a basic attack). fast_forward() drives the
+normal BattleSystem actions in a tight loop — same damage, drops, next_wave,
+shop rolls and zone changes — but skips the action_delay/cooldown pauses,
+sounds, info logging and per-hit UI events. The UI only gets a summary.
+"""
+import time
+from collections import Counter
+
+try:
+    from zones import select_zone
+except Exception:
+    from .zones import select_zone
+try:
+    from enemy import Enemy
+except Exception:
+    from .enemy import Enemy
+try:
+    from game_log import muted
+except Exception:
+    from .game_log import muted
+
+
+class AutoPlayPolicy:
+    """Decides what the player does each turn in fast-forward mode"""
+
+    def __init__(self, skill_priority=None, potion_threshold=0.35, use_skills=True,
+                 restock_potions=0):
+        # Skill ids in the order they should be tried (None = known skills in learned order)
+        self.skill_priority = skill_priority
+        # Drink a healing potion when HP falls below this fraction of max HP
+        self.potion_threshold = potion_threshold
+        self.use_skills = use_skills
+        # Buy healing potions in shops until holding this many (0 = never buy)
+        self.restock_potions = restock_potions
+        self._heal_items = {}
+
+    def is_low_hp(self, player):
+        return player.max_hp > 0 and player.hp < player.max_hp * self.potion_threshold
+
+    def heal_value(self, item):
+        """Rough HP value of a consumable for a given item def (0 if it doesn't heal)"""
+        if not item or item.get('type') != 'consumable':
+            return 0
+        effect = item.get('effect', {})
+        if effect.get('full_heal'):
+            return float('inf')
+        return effect.get('heal', 0) + effect.get('heal_percent', 0) * 1000
+
+    def _item_heal_value(self, player, item_id):
+        """heal_value() of an inventory item, cached per item id"""
+        value = self._heal_items.get(item_id)
+        if value is None:
+            value = self._heal_items[item_id] = self.heal_value(player._load_item_by_id(item_id))
+        return value
+
+    def choose_potion(self, player):
+        """Strongest healing consumable in the inventory, or None"""
+        best_id, best_value = None, 0
+        for item_id, qty in player.inventory.items():
+            if qty <= 0:
+                continue
+            value = self._item_heal_value(player, item_id)
+            if value > best_value:
+                best_id, best_value = item_id, value
+        return best_id
+
+    def choose_skill(self, battle):
+        """First usable skill in priority order, or None for a basic attack"""
+        if not self.use_skills or not battle.skill_manager:
+            return None
+        player = battle.player
+        manager = battle.skill_manager
+        for skill_id in (self.skill_priority or getattr(player, 'skills', [])):
+            if skill_id not in getattr(player, 'skills', []):
+                continue
+            skill = manager.get_skill(skill_id)
+            if not skill:
+                continue
+            # Heals are only worth a turn when low on HP
+            if skill.get('type') == 'heal' and not self.is_low_hp(player):
+                continue
+            can_use, _ = manager.can_use_skill(player, skill_id)
+            if not can_use:
+                continue
+            level = manager.get_skill_level(player, skill_id)
+            mana_cost = int(skill.get('mana_cost', 0) * (1 + (level - 1) * 0.2))
+            if player.current_mana >= mana_cost:
+                return skill_id
+        return None
+
+    def shop(self, player, offers):
+        """Items to buy from a shop's offers (list of offer dicts)"""
+        if self.restock_potions <= 0:
+            return []
+        held = sum(qty for item_id, qty in player.inventory.items() if qty > 0 and self._item_heal_value(player, item_id))
+        potions = sorted((o for o in offers if self.heal_value(o) > 0),
+                         key=lambda o: o.get('_final_cost', o.get('cost', 0)))
+        buys = []
+        gold = player.gold
+        for offer in potions:
+            cost = offer.get('_final_cost', offer.get('cost', 0))
+            while held < self.restock_potions and gold >= cost:
+                buys.append(offer)
+                gold -= cost
+                held += 1
+        return buys
+
+
+def _spawn_wave_enemy(battle):
+    """Spawn the enemy for the current wave after a shop (same as the main loop)"""
+    battle.in_shop = False
+    zone_id = battle.current_zone.get('id') if battle.current_zone else None
+    battle.enemy = Enemy.random_enemy(battle.wave, current_zone_id=zone_id)
+    battle.enemy_hit_time = 0
+    battle.turn = 'player'
+    battle.turn_processed = False
+
+
+def _visit_shop(battle, policy, shop, summary):
+    """Roll the wave's offers and let the policy buy from them"""
+    if shop is None:
+        return
+    player = battle.player
+    offers = shop.get_offers_for_wave(
+        battle.wave,
+        player_seed=getattr(player, 'game_seed', None),
+        cumulative_increase=getattr(player, 'cumulative_price_increase', 0.0),
+        current_zone=battle.current_zone,
+    )
+    for offer in policy.shop(player, offers):
+        if not player.buy_item(offer):
+            break
+        summary['bought'][offer.get('id')] += 1
+
+
+def _player_turn(battle, policy, summary):
+    """One player action chosen by the policy (potions don't use the turn)"""
+    player = battle.player
+    if policy.is_low_hp(player):
+        potion = policy.choose_potion(player)
+        if potion and player.use_item(potion, battle.effect_manager):
+            summary['potions_used'][potion] += 1
+
+    battle.player_action_cooldown_until = 0.0
+    wave = battle.wave
+    skill_id = policy.choose_skill(battle)
+    if skill_id:
+        battle.player_use_skill(skill_id)
+        # Turn passed to the enemy or the enemy died: the skill was used
+        if battle.turn == 'enemy' or battle.wave != wave:
+            return
+    battle.player_attack()
+
+
+def fast_forward(battle, waves, policy=None, zones=None, shop=None, max_turns_per_wave=500):
+    """Auto-resolve `waves` waves. Returns a summary dict.
+
+    Stops early if the player dies or a fight takes more than
+    `max_turns_per_wave` turns. A shop rolled on the last wave is left open
+    (battle.in_shop) so the player can still visit it.
+    """
+    policy = policy or AutoPlayPolicy()
+    player = battle.player
+    start = time.perf_counter()
+    start_wave = battle.wave
+    target_wave = start_wave + max(0, int(waves))
+    start_gold = player.gold
+    start_level = player.level
+    start_inventory = Counter({k: v for k, v in player.inventory.items() if v > 0})
+    summary = {
+        'start_wave': start_wave,
+        'waves_cleared': 0,
+        'kills': 0,
+        'xp': 0,
+        'gold': 0,
+        'levels': 0,
+        'loot': {},
+        'bought': Counter(),
+        'potions_used': Counter(),
+        'shops': 0,
+        'zone_changes': [],
+        'died': False,
+        'stalled': False,
+    }
+
+    # UI-only state is restored afterwards: one summary note replaces the per-hit events
+    events_before = len(battle.damage_events)
+    log_before = list(battle.combat_log)
+    sounds = battle.sounds
+    battle.sounds = {}
+    try:
+        with muted():
+            while battle.wave < target_wave:
+                if battle.in_shop or battle.enemy is None:
+                    summary['shops'] += 1
+                    _visit_shop(battle, policy, shop, summary)
+                    _spawn_wave_enemy(battle)
+
+                enemy = battle.enemy
+                wave = battle.wave
+                turns = 0
+                while battle.wave == wave:
+                    if player.is_dead():
+                        summary['died'] = True
+                        break
+                    if turns >= max_turns_per_wave:
+                        summary['stalled'] = True
+                        break
+                    turns += 1
+                    if battle.turn == 'player':
+                        _player_turn(battle, policy, summary)
+                    if battle.turn == 'enemy' and battle.wave == wave:
+                        # Skip the visual action_delay
+                        battle.last_action_time = 0.0
+                        battle.update()
+                if summary['died'] or summary['stalled']:
+                    break
+
+                summary['kills'] += 1
+                summary['xp'] += int(enemy.xp * getattr(player, 'exp_modifier', 1.0))
+                # Zone changes happen on every 25th wave, like the main loop
+                if zones and battle.wave % 25 == 0:
+                    new_zone = select_zone(battle.wave, zones, battle.current_zone)
+                    if new_zone and new_zone != battle.current_zone:
+                        battle.current_zone = new_zone
+                        summary['zone_changes'].append((battle.wave, new_zone.get('name', 'Unknown')))
+    finally:
+        battle.sounds = sounds
+        del battle.damage_events[events_before:]
+        battle.combat_log = log_before
+
+    summary['waves_cleared'] = battle.wave - start_wave
+    summary['gold'] = player.gold - start_gold
+    summary['levels'] = player.level - start_level
+    # Loot = what was picked up, not counting shop purchases or potions drunk
+    loot = Counter({k: v for k, v in player.inventory.items() if v > 0})
+    loot.subtract(start_inventory)
+    loot.subtract(summary['bought'])
+    loot.update(summary['potions_used'])
+    summary['loot'] = {item_id: qty for item_id, qty in loot.items() if qty > 0}
+    summary['bought'] = dict(summary['bought'])
+    summary['potions_used'] = dict(summary['potions_used'])
+    summary['elapsed'] = time.perf_counter() - start
+
+    battle.player_action_cooldown_until = time.time() + 0.3
+    battle.add_log(f"Fast-forward: {summary['waves_cleared']} waves, +{summary['gold']}g, "
+                   f"+{summary['levels']} levels", 'info')
+    battle.damage_events.append({'type': 'note', 'msg': format_summary(summary), 'time': time.time()})
+    return summary
+
+
+def format_summary(summary):
+    """One-line summary for UI notes and the console"""
+    msg = (f"Fast-forward: {summary['waves_cleared']} waves, +{summary['gold']}g, "
+           f"+{summary['xp']} XP, +{summary['levels']} Lv, {sum(summary['loot'].values())} items")
+    if summary['died']:
+        msg += " (défaite)"
+    elif summary['stalled']:
+        msg += " (combat bloqué)"
+    return msg
@@ -1,7 +1,5 @@
 # src/battle_system.py
 import time
-import pygame
-from pathlib import Path
 try:
     from enemy import Enemy
 except Exception:
@@ -14,8 +12,28 @@ try:
     from effect_manager import EffectManager
 except Exception:
     from .effect_manager import EffectManager
+try:
+    from combat_resolver import CombatResolver, combo_event
+except Exception:
+    from .combat_resolver import CombatResolver, combo_event
+try:
+    from skill_index import get_skill_index
+except Exception:
+    from .skill_index import get_skill_index
+try:
+    from game_log import get_logger
+except Exception:
+    from .game_log import get_logger
+try:
+    from audio_bank import get_audio_bank
+except Exception:
+    from .audio_bank import get_audio_bank
 import random
 
+log = get_logger('combat')
+wave_log = get_logger('waves')
+drop_log = get_logger('drops')
+
 class BattleSystem:
     def __init__(self, player, data_path=None):
         self.player = player
@@ -42,41 +60,40 @@ class BattleSystem:
         # Skill and effect managers
         self.skill_manager = SkillManager(data_path=data_path)
         self.effect_manager = EffectManager()
+        # Shared damage pipeline for attacks, multi-hits and counters
+        self.combat = CombatResolver(self.effect_manager)
         # Track if turn start effects have been processed
         self.turn_processed = False
         self.enemy_turn_processed = False
         
-        # Load sound effects
-        self.sounds = {}
-        try:
-            # Find assets/sounds/effects directory
-            current_file = Path(__file__)
-            src_dir = current_file.parent
-            base_dir = src_dir.parent
-            effects_dir = base_dir / "assets" / "sounds" / "effects"
-            
-            if effects_dir.exists():
-                monster_hit = effects_dir / "MonsterHit.mp3"
-                monster_kill = effects_dir / "MonsterKill.mp3"
-                mage_hit = effects_dir / "MageHit.mp3"
-                
-                if monster_hit.exists():
-                    self.sounds['monster_hit'] = pygame.mixer.Sound(str(monster_hit))
-                    self.sounds['monster_hit'].set_volume(0.3)
-                if monster_kill.exists():
-                    self.sounds['monster_kill'] = pygame.mixer.Sound(str(monster_kill))
-                    self.sounds['monster_kill'].set_volume(0.6)
-                if mage_hit.exists():
-                    self.sounds['player_hit'] = pygame.mixer.Sound(str(mage_hit))
-                    self.sounds['player_hit'].set_volume(0.3)
-        except Exception as e:
-            print(f"Warning: Could not load sound effects: {e}")
+        # Sound effects come from the shared AudioBank on first use (or by main.py after the first frame)
+        self.sounds = None
+
+    def load_sounds(self):
+        """Attach the process-wide decoded sound effects (decoded on first call)"""
+        self.sounds = get_audio_bank().load()
+        return self.sounds
+    
+    @property
+    def enemy(self):
+        return self._enemy
+    
+    @enemy.setter
+    def enemy(self, new_enemy):
+        """Swap the current enemy, dropping any effects left on the one that leaves"""
+        old_enemy = getattr(self, '_enemy', None)
+        effect_manager = getattr(self, 'effect_manager', None)
+        if old_enemy is not None and old_enemy is not new_enemy and effect_manager:
+            effect_manager.clear_entity_effects(old_enemy)
+        self._enemy = new_enemy
     
     def play_sound(self, sound_key):
         """Play a sound effect if it's loaded"""
         try:
+            if self.sounds is None:
+                self.load_sounds()
             if sound_key in self.sounds:
-                self.sounds[sound_key].play()
+                get_audio_bank().play(sound_key)
         except Exception:
             pass
     
@@ -134,7 +151,7 @@ class BattleSystem:
             try:
                 self.effect_manager.tick_effects(self.player)
             except Exception as e:
-                print(f"Warning: Failed to tick player effects: {e}")
+                log.warning("Failed to tick player effects: %s", e)
 
         # Process player DoT effects at start of player turn
         if hasattr(self, 'effect_manager') and self.effect_manager:
@@ -152,7 +169,7 @@ class BattleSystem:
                     except Exception:
                         pass
             except Exception as e:
-                print(f"Warning: Failed to process player DoT: {e}")
+                log.warning("Failed to process player DoT: %s", e)
         
         # Apply HP regeneration at turn start
         player_hp_regen = getattr(self.player, 'hp_regen', 0.0)
@@ -190,7 +207,7 @@ class BattleSystem:
         
         # Safety check: ensure enemy exists
         if not self.enemy or self.enemy.is_dead():
-            print("No enemy to attack!")
+            log.debug("No enemy to attack!")
             return
         
         # Check if equipped weapon has multi-hit property
@@ -206,48 +223,16 @@ class BattleSystem:
             self._execute_multi_hit_attack(multi_hit_data)
             return
         
-        # Apply active effect modifiers to player stats
-        player_modifiers = self.effect_manager.apply_active_effects(self.player)
-        
-        # base damage with buffs applied
-        base_dmg = getattr(self.player, 'atk', 0) + player_modifiers.get('atk', 0)
-        
-        # Overcrit mechanic: crit chance >100% converts to bonuses
-        crit_chance = float(getattr(self.player, 'critchance', 0.0))
-        base_crit_damage = float(getattr(self.player, 'critdamage', 1.5))
-        
-        # Calculate overcrit bonuses
-        is_overcrit = False
-        if crit_chance > 1.0:
-            overcrit_amount = crit_chance - 1.0
-            # 1% crit damage per 1% overcrit
-            bonus_crit_damage = overcrit_amount
-            # 0.5% chance to deal 3x total crit damage
-            overcrit_chance = overcrit_amount * 0.5
-            effective_crit_chance = 1.0  # Always crit when >100%
-            effective_crit_damage = base_crit_damage + bonus_crit_damage
-            is_overcrit = random.random() < overcrit_chance
-        else:
-            effective_crit_chance = crit_chance
-            effective_crit_damage = base_crit_damage
+        # Player/enemy stats captured once for this action (buffs/debuffs applied)
+        attacker = self.combat.snapshot_attacker(self.player)
+        defender = self.combat.snapshot_defender(self.enemy)
         
-        # Roll for critical hit
-        try:
-            is_crit = random.random() < effective_crit_chance
-        except Exception:
-            is_crit = False
-
-        if is_crit:
-            crit_mult = effective_crit_damage * (3.0 if is_overcrit else 1.0)
-            dmg = int(round(base_dmg * crit_mult))
-        else:
-            dmg = int(base_dmg)
-
-        # apply damage to enemy (pass player penetration and effect manager)
-        player_pen = getattr(self.player, 'penetration', 0)
-        enemy_modifiers = self.effect_manager.apply_active_effects(self.enemy)
-        # Apply defense debuffs to enemy
-        dmg_dealt = self.enemy.take_damage(dmg, player_pen, self.effect_manager)
+        # Roll for critical hit (overcrit included) and apply damage to enemy
+        hit = self.combat.resolve_hit(attacker, defender, attacker.atk)
+        dmg_dealt = hit.damage
+        is_crit = hit.is_crit
+        is_overcrit = hit.is_overcrit
+        crit_mult = hit.crit_mult
         
         # Play monster hit sound only if it didn't die from this hit
         # (death sound will be played later)
@@ -255,7 +240,7 @@ class BattleSystem:
             self.play_sound('monster_hit')
         
         # Apply lifesteal if player has it
-        player_lifesteal = getattr(self.player, 'lifesteal', 0.0)
+        player_lifesteal = attacker.lifesteal
         if player_lifesteal > 0 and dmg_dealt > 0:
             lifesteal_amount = int(dmg_dealt * (player_lifesteal / 100.0))
             if lifesteal_amount > 0:
@@ -288,14 +273,14 @@ class BattleSystem:
             pass
         if is_crit:
             crit_label = "OVERCRIT!!!" if is_overcrit else "CRIT!"
-            print(f"{crit_label} {self.player.name} inflige {dmg_dealt} (x{crit_mult:.1f}) à {self.enemy.name} !")
+            log.debug("%s %s inflige %s (x%.1f) à %s !", crit_label, self.player.name, dmg_dealt, crit_mult, self.enemy.name)
             self.add_log(f"{crit_label} {dmg_dealt} damage!", 'damage')
         else:
-            print(f"{self.player.name} inflige {dmg_dealt} à {self.enemy.name} !")
+            log.debug("%s inflige %s à %s !", self.player.name, dmg_dealt, self.enemy.name)
             self.add_log(f"Dealt {dmg_dealt} damage", 'damage')
 
         if self.enemy.is_dead():
-            print(f"{self.enemy.name} est vaincu !")
+            log.debug("%s est vaincu !", self.enemy.name)
             # Play monster kill sound
             self.play_sound('monster_kill')
             self.add_log(f"{self.enemy.name} defeated!", 'info')
@@ -327,78 +312,28 @@ class BattleSystem:
         num_hits = multi_hit_data.get('hits', 2)
         damage_per_hit_multiplier = multi_hit_data.get('damage_per_hit', 0.4)
         
-        # Apply active effect modifiers to player stats
-        player_modifiers = self.effect_manager.apply_active_effects(self.player)
+        # Stats captured once for the whole combo
+        attacker = self.combat.snapshot_attacker(self.player)
+        defender = self.combat.snapshot_defender(self.enemy)
+        hit_base = int(round(attacker.atk * damage_per_hit_multiplier))
         
-        # Base damage with buffs applied
-        base_dmg = getattr(self.player, 'atk', 0) + player_modifiers.get('atk', 0)
+        # Resolve every hit in one batched pass (stops at the overkill point)
+        combo = self.combat.resolve_multi_hit(attacker, defender, hit_base, num_hits)
+        total_damage_dealt = combo.total
+        crit_count = combo.crit_count
+        overcrit_count = combo.overcrit_count
         
-        # Overcrit mechanic: crit chance >100% converts to bonuses
-        crit_chance = float(getattr(self.player, 'critchance', 0.0))
-        base_crit_damage = float(getattr(self.player, 'critdamage', 1.5))
-        
-        # Calculate overcrit bonuses
-        if crit_chance > 1.0:
-            overcrit_amount = crit_chance - 1.0
-            bonus_crit_damage = overcrit_amount
-            overcrit_chance = overcrit_amount * 0.5
-            effective_crit_chance = 1.0
-            effective_crit_damage = base_crit_damage + bonus_crit_damage
-        else:
-            effective_crit_chance = crit_chance
-            effective_crit_damage = base_crit_damage
-        
-        total_damage_dealt = 0
+        # Lifesteal is computed per hit, then healed once
         total_lifesteal = 0
-        crit_count = 0
-        overcrit_count = 0
-        player_pen = getattr(self.player, 'penetration', 0)
-        player_lifesteal = getattr(self.player, 'lifesteal', 0.0)
-        
-        # Execute each hit
-        for hit_num in range(num_hits):
-            # Check if enemy died from previous hits
-            if self.enemy.is_dead():
-                break
-            
-            # Calculate damage for this hit
-            hit_damage = int(round(base_dmg * damage_per_hit_multiplier))
-            
-            # Roll for critical hit (independent per hit)
-            try:
-                is_crit = random.random() < effective_crit_chance
-                is_overcrit = False
-                if is_crit and crit_chance > 1.0:
-                    is_overcrit = random.random() < (overcrit_chance)
-            except Exception:
-                is_crit = False
-                is_overcrit = False
-            
-            if is_crit:
-                crit_mult = effective_crit_damage * (3.0 if is_overcrit else 1.0)
-                hit_damage = int(round(hit_damage * crit_mult))
-                crit_count += 1
-                if is_overcrit:
-                    overcrit_count += 1
-            
-            # Apply damage to enemy
-            dmg_dealt = self.enemy.take_damage(hit_damage, player_pen, self.effect_manager)
-            total_damage_dealt += dmg_dealt
-            
-            # Apply lifesteal for this hit
-            if player_lifesteal > 0 and dmg_dealt > 0:
-                lifesteal_amount = int(dmg_dealt * (player_lifesteal / 100.0))
-                if lifesteal_amount > 0:
-                    total_lifesteal += lifesteal_amount
-            
-            # Register damage event for UI
+        player_lifesteal = attacker.lifesteal
+        if player_lifesteal > 0:
+            ratio = player_lifesteal / 100.0
+            total_lifesteal = sum(int(hit.damage * ratio) for hit in combo.hits)
+        
+        # Register one aggregated damage event for UI (per-hit detail in 'hits')
+        if combo.hits:
             try:
-                self.damage_events.append({
-                    'target': 'enemy',
-                    'amount': int(dmg_dealt),
-                    'time': time.time(),
-                    'is_crit': bool(is_crit),
-                })
+                self.damage_events.append(combo_event(combo))
                 # Record enemy hit time for visual effect
                 self.enemy_hit_time = time.time()
             except Exception:
@@ -430,15 +365,15 @@ class BattleSystem:
             crit_label = f"{crit_count}x CRIT"
             if overcrit_count > 0:
                 crit_label += f" ({overcrit_count}x OVERCRIT)"
-            print(f"{crit_label}! {self.player.name} multi-hit deals {total_damage_dealt} damage ({num_hits} hits)!")
+            log.debug("%s! %s multi-hit deals %s damage (%s hits)!", crit_label, self.player.name, total_damage_dealt, num_hits)
             self.add_log(f"{num_hits}-HIT COMBO! {crit_label} {total_damage_dealt} dmg!", 'damage')
         else:
-            print(f"{self.player.name} multi-hit deals {total_damage_dealt} damage ({num_hits} hits)!")
+            log.debug("%s multi-hit deals %s damage (%s hits)!", self.player.name, total_damage_dealt, num_hits)
             self.add_log(f"{num_hits}-HIT COMBO! {total_damage_dealt} damage", 'damage')
         
         # Check if enemy died
         if self.enemy.is_dead():
-            print(f"{self.enemy.name} est vaincu !")
+            log.debug("%s est vaincu !", self.enemy.name)
             self.play_sound('monster_kill')
             self.add_log(f"{self.enemy.name} defeated!", 'info')
             gold_gained = int(self.enemy.gold * getattr(self.player, 'gold_modifier', 1.0))
@@ -468,13 +403,13 @@ class BattleSystem:
         self.start_player_turn()
         
         if not self.enemy or self.enemy.is_dead():
-            print("No enemy to block!")
+            log.debug("No enemy to block!")
             return
         
         # Add temporary defense bonus
         self.block_defense_bonus = 300
         self.add_log("Blocking! +300 defense this turn", 'buff')
-        print(f"{self.player.name} is blocking! (+300 defense)")
+        log.debug("%s is blocking! (+300 defense)", self.player.name)
         
         # Pass turn to enemy
         self.turn = "enemy"
@@ -494,29 +429,29 @@ class BattleSystem:
         self.start_player_turn()
         
         if not self.enemy or self.enemy.is_dead():
-            print("No enemy to target!")
+            log.debug("No enemy to target!")
             return
         
         # Check if skill manager exists
         if not hasattr(self, 'skill_manager') or self.skill_manager is None:
-            print("Skill system not initialized!")
+            log.warning("Skill system not initialized!")
             return
         
         # Get skill data
         skill = self.skill_manager.get_skill(skill_id)
         if not skill:
-            print(f"Skill {skill_id} not found!")
+            log.warning("Skill %s not found!", skill_id)
             return
         
         # Check if player has the skill
         if not hasattr(self.player, 'skills') or skill_id not in self.player.skills:
-            print(f"Player doesn't know {skill_id}!")
+            log.debug("Player doesn't know %s!", skill_id)
             return
         
         # Check if skill can be used (cooldown check)
         can_use, msg = self.skill_manager.can_use_skill(self.player, skill_id)
         if not can_use:
-            print(f"Cannot use skill: {msg}")
+            log.debug("Cannot use skill: %s", msg)
             self.add_log(msg, 'debuff')
             return
         
@@ -525,7 +460,7 @@ class BattleSystem:
         skill_level = self.skill_manager.get_skill_level(self.player, skill_id)
         mana_cost = int(base_mana_cost * (1 + (skill_level - 1) * 0.2))
         if not self.player.consume_mana(mana_cost):
-            print(f"Not enough mana! Need {mana_cost}, have {self.player.current_mana}")
+            log.debug("Not enough mana! Need %s, have %s", mana_cost, self.player.current_mana)
             self.add_log(f"Not enough mana for {skill_id}!", 'debuff')
             return
         
@@ -556,7 +491,7 @@ class BattleSystem:
             
             if damage > 0:
                 self.add_log(f"Used {skill_name}: {damage} damage!", 'skill')
-                print(f"{self.player.name} used {skill_id} for {damage} damage!")
+                log.debug("%s used %s for %s damage!", self.player.name, skill_id, damage)
                 
                 # For multi-hit skills, damage events are already added by skill_manager
                 # For regular skills, add the damage event here
@@ -575,7 +510,7 @@ class BattleSystem:
             
             if healing > 0:
                 self.add_log(f"Used {skill_name}: healed {healing}!", 'heal')
-                print(f"{self.player.name} healed {healing} HP!")
+                log.debug("%s healed %s HP!", self.player.name, healing)
                 # Add healing counter
                 try:
                     self.damage_events.append({
@@ -604,7 +539,7 @@ class BattleSystem:
             
             # Check if enemy died
             if self.enemy.is_dead():
-                print(f"{self.enemy.name} est vaincu !")
+                log.debug("%s est vaincu !", self.enemy.name)
                 # Play monster kill sound
                 self.play_sound('monster_kill')
                 gold_gained = int(self.enemy.gold * getattr(self.player, 'gold_modifier', 1.0))
@@ -625,7 +560,7 @@ class BattleSystem:
                 self.action_delay = 0.9
                 self.enemy_turn_processed = False
         else:
-            print(f"Failed to use skill: {msg}")
+            log.debug("Failed to use skill: %s", msg)
             self.add_log(f"Skill failed: {msg}", 'debuff')
 
     def update(self):
@@ -645,7 +580,7 @@ class BattleSystem:
                         try:
                             self.effect_manager.tick_effects(self.enemy)
                         except Exception as e:
-                            print(f"Warning: Failed to tick enemy effects: {e}")
+                            log.warning("Failed to tick enemy effects: %s", e)
 
                         # Process enemy DoT effects at start of enemy turn
                         try:
@@ -662,7 +597,7 @@ class BattleSystem:
                                 except Exception:
                                     pass
                         except Exception as e:
-                            print(f"Warning: Failed to process enemy DoT: {e}")
+                            log.warning("Failed to process enemy DoT: %s", e)
 
                     # If enemy dies from DoT, resolve defeat and skip attack
                     if self.enemy and self.enemy.is_dead():
@@ -695,7 +630,7 @@ class BattleSystem:
                         })
                     except Exception:
                         pass
-                    print(f"{self.player.name} esquive l'attaque de {self.enemy.name}!")
+                    log.debug("%s esquive l'attaque de %s!", self.player.name, self.enemy.name)
                     self.add_log("Dodged enemy attack!", 'buff')
                 else:
                     dmg = self.enemy.atk
@@ -703,7 +638,7 @@ class BattleSystem:
                     original_defense = self.player.defense
                     if self.block_defense_bonus > 0:
                         self.player.defense += self.block_defense_bonus
-                        print(f"Block reduces damage! (Defense: {original_defense} -> {self.player.defense})")
+                        log.debug("Block reduces damage! (Defense: %s -> %s)", original_defense, self.player.defense)
                     
                     # Enemies don't have penetration (for now), pass 0
                     enemy_pen = getattr(self.enemy, 'penetration', 0)
@@ -735,11 +670,11 @@ class BattleSystem:
                         self.player_hit_time = time.time()
                     except Exception:
                         pass
-                    print(f"{self.enemy.name} inflige {dmg_taken} à {self.player.name} !")
+                    log.debug("%s inflige %s à %s !", self.enemy.name, dmg_taken, self.player.name)
                     self.add_log(f"Took {dmg_taken} damage!", 'debuff')
 
                     if self.player.is_dead():
-                        print(f"{self.player.name} est vaincu... 💀")
+                        log.info("%s est vaincu... 💀", self.player.name)
                     # Do not auto-respawn here; main loop will handle game over
 
                 # Check if player has counter ready to strike (turn 2)
@@ -763,24 +698,27 @@ class BattleSystem:
     def _execute_counter_strike(self, counter_effect):
         """Execute automatic counter strike with skill scaling + stored damage"""
         # Get skill data from counter effect
-        skill_power = counter_effect.get('skill_power', 0)
-        scaling_stat_name = counter_effect.get('skill_scaling_stat', 'atk')
-        damage_stored = counter_effect.get('damage_stored', 0)
-        skill_name = counter_effect.get('source', 'Counter Strike')
+        skill_power = counter_effect.skill_power
+        scaling_stat_name = counter_effect.skill_scaling_stat
+        damage_stored = counter_effect.damage_stored
+        skill_name = counter_effect.source or 'Counter Strike'
         
         # Calculate scaling damage
-        scaling_stat = getattr(self.player, scaling_stat_name, 0)
-        scaling_damage = int(skill_power + scaling_stat * 0.5)  # 50% scaling
+        attacker = self.combat.snapshot_attacker(self.player)
+        defender = self.combat.snapshot_defender(self.enemy)
+        scaling_damage = int(skill_power + attacker.stat(scaling_stat_name) * 0.5)  # 50% scaling
         
         # Total damage = skill scaling + damage taken on turn 1
         total_damage = scaling_damage + damage_stored
         
-        # Apply damage to enemy
-        actual_damage = self.enemy.take_damage(total_damage, getattr(self.player, 'magic_penetration', 0), self.effect_manager)
+        # Apply damage to enemy (counters can't crit; magic penetration vs defense)
+        hit = self.combat.resolve_hit(attacker, defender, total_damage,
+                                      pen_percent=attacker.magic_pen_percent, can_crit=False)
+        actual_damage = hit.damage
         
         # Log and display
         self.add_log(f"{skill_name} strikes back for {actual_damage} damage! (Skill: {scaling_damage} + Stored: {damage_stored})", 'skill')
-        print(f"Counter Strike! {actual_damage} damage (Scaling: {scaling_damage}, Stored: {damage_stored})")
+        log.debug("Counter Strike! %s damage (Scaling: %s, Stored: %s)", actual_damage, scaling_damage, damage_stored)
         
         # Play skill sound
         self.play_sound('skill')
@@ -848,7 +786,7 @@ class BattleSystem:
                 if hasattr(self.player, 'cumulative_price_increase'):
                     self.player.cumulative_price_increase = getattr(self.player, 'cumulative_price_increase', 0.0) + wave_increase
         except Exception as e:
-            print(f"Error calculating price increase: {e}")
+            wave_log.warning("Error calculating price increase: %s", e)
         
         # Update highest wave
         if hasattr(self.player, 'highest_wave'):
@@ -869,46 +807,38 @@ class BattleSystem:
             self.enemy = Enemy.random_enemy(self.wave, current_zone_id=zone_id)
             # Reset enemy hit time so new enemy doesn't appear with red/shake effect
             self.enemy_hit_time = 0
-            print(f"👹 Nouvelle vague : {self.enemy.name}")
+            wave_log.info("👹 Nouvelle vague : %s", self.enemy.name)
             self.turn = "player"
             self.turn_processed = False  # Reset for new wave
             # Brief pause before the player can act after a new enemy appears
             self.player_action_cooldown_until = time.time() + 0.3
         else:
             self.enemy = None
-            print(f"🛒 Shop opens at wave {self.wave}")
+            wave_log.info("🛒 Shop opens at wave %s", self.wave)
     
     
+    def fast_forward(self, waves, policy=None, zones=None, shop=None):
+        """Auto-resolve `waves` waves without the frame loop (see auto_battle.fast_forward)"""
+        try:
+            from auto_battle import fast_forward
+        except Exception:
+            from .auto_battle import fast_forward
+        return fast_forward(self, waves, policy=policy, zones=zones, shop=shop)
+
     def _try_boss_skill_unlock(self):
         """Try to unlock a random locked skill when killing a boss (15% chance)"""
-        import json
         import random
-        from pathlib import Path
         
         # 15% chance to unlock a skill from boss
         if random.random() > 0.15:
             return
         
         try:
-            base = Path(__file__).resolve().parents[1]
-            skills_path = base / 'data' / 'skills.json'
-            if not skills_path.exists():
-                return
-            
-            with open(skills_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Handle both dict and array formats
-            if isinstance(data, dict) and 'skills' in data:
-                all_skills = data['skills']
-            elif isinstance(data, list):
-                all_skills = data
-            else:
-                all_skills = []
-            
-            # Get list of locked skills (not yet unlocked)
+            index = get_skill_index()
+            # Skills not unlocked yet (kept up to date by Player.unlock_skill),
+            # in skills.json order so seeded runs pick the same skill
+            locked_skills = sorted(self.player.get_unowned_skills(), key=index.order.get)
             player_skills = getattr(self.player, 'skills', [])
-            locked_skills = [skill.get('id') for skill in all_skills if skill.get('id') and skill.get('id') not in player_skills]
             
             # If no locked skills, try to level up an existing skill instead
             if not locked_skills:
@@ -917,12 +847,7 @@ class BattleSystem:
                     skill_id = random.choice(player_skills)
                     result, level = self.player.unlock_skill(skill_id)
                     if result == 'levelup':
-                        # Get skill name for better display
-                        skill_name = skill_id
-                        for skill in all_skills:
-                            if skill.get('id') == skill_id:
-                                skill_name = skill.get('name', skill_id)
-                                break
+                        skill_name = index.names.get(skill_id, skill_id)
                         self.add_log(f"Boss upgraded skill: {skill_name} -> Lv{level}!", 'buff')
                 else:
                     self.add_log("No skills available!", 'info')
@@ -932,15 +857,10 @@ class BattleSystem:
             skill_id = random.choice(locked_skills)
             result, level = self.player.unlock_skill(skill_id)
             if result == 'new':
-                # Get skill name for better display
-                skill_name = skill_id
-                for skill in all_skills:
-                    if skill.get('id') == skill_id:
-                        skill_name = skill.get('name', skill_id)
-                        break
+                skill_name = index.names.get(skill_id, skill_id)
                 self.add_log(f"Boss dropped skill: {skill_name}!", 'buff')
         except Exception as e:
-            print(f"Warning: Failed to process boss skill drop: {e}")
+            drop_log.warning("Failed to process boss skill drop: %s", e)
     
     def _process_drops(self, enemy):
         """Check items.json for droppable items matching the enemy category and roll.
@@ -979,7 +899,7 @@ class BattleSystem:
                 chance = float(it.get('drop_chance', 0.25))
                 if random.random() < chance:
                     # grant the item
-                    print(f"Loot trouvé: {it.get('name')} de {enemy.name}")
+                    drop_log.debug("Loot trouvé: %s de %s", it.get('name'), enemy.name)
                     # call add_item with auto_equip=False so drops go to inventory
                     self.player.add_item(it, auto_equip=False)
 
@@ -1005,9 +925,9 @@ class BattleSystem:
                                         break
                                 if not item_def:
                                     item_def = {'id': iid, 'name': iid, 'type': 'misc'}
-                                print(f"Loot (monster table): {item_def.get('name')} x{qty} from {enemy.name}")
+                                drop_log.debug("Loot (monster table): %s x%s from %s", item_def.get('name'), qty, enemy.name)
                                 for _ in range(qty):
                                     self.player.add_item(item_def, auto_equip=False)
                         break
         except Exception as e:
-            print("Erreur lors du traitement des drops:", e)
+            drop_log.error("Erreur lors du traitement des drops: %s", e)
@@ -0,0 +1,219 @@
+# src/combat_resolver.py
+"""Single damage pipeline for basic attacks, multi-hits, skills and counters.
+
+The attacker's stats (base + active modifiers, crit/overcrit thresholds,
+penetration percentages) are captured once per action in an immutable
+snapshot; the defender snapshot holds its effective defense percentages.
+Resolving a hit is then one or two RNG draws and a few multiplies.
+"""
+import random
+import time
+from collections import namedtuple
+
+
+def effective_percent(raw_value, soft_cap, hard_cap):
+    """Stat -> percentage with soft and hard caps (same curve as Player/Enemy).
+    Below soft_cap: 1:1, between caps: 2:1, above hard_cap: capped.
+    """
+    if raw_value <= soft_cap:
+        return raw_value
+    if raw_value > hard_cap:
+        raw_value = hard_cap
+    return soft_cap + (raw_value - soft_cap) * 0.5
+
+
+def defense_percent(defense):
+    """Effective defense percentage (0-52.5) with soft cap at 30"""
+    return effective_percent(defense, 30, 75)
+
+
+def penetration_percent(penetration):
+    """Effective penetration percentage with soft cap at 50 (0 if none)"""
+    return effective_percent(penetration, 50, 75) if penetration > 0 else 0
+
+
+_AttackerFields = namedtuple('AttackerSnapshot', (
+    'entity', 'modifiers', 'atk', 'magic_power',
+    'crit_chance', 'crit_damage', 'overcrit_chance',
+    'penetration', 'magic_penetration', 'pen_percent', 'magic_pen_percent',
+    'lifesteal',
+))
+
+
+class AttackerSnapshot(_AttackerFields):
+    """Immutable view of an attacker's stats for one action"""
+    __slots__ = ()
+
+    def stat(self, name):
+        """Any stat with active modifiers applied (atk/magic_power are precomputed)"""
+        if name == 'atk':
+            return self.atk
+        if name == 'magic_power':
+            return self.magic_power
+        return getattr(self.entity, name, 0) + self.modifiers.get(name, 0)
+
+
+DefenderSnapshot = namedtuple('DefenderSnapshot', ('entity', 'defense_percent', 'magic_defense_percent'))
+
+# Result of one resolved hit
+Hit = namedtuple('Hit', ('damage', 'is_crit', 'is_overcrit', 'crit_mult'))
+
+# Result of a batched combo: hits actually landed (stops at overkill) and their sum
+Combo = namedtuple('Combo', ('hits', 'total', 'crit_count', 'overcrit_count'))
+
+
+def combo_event(combo, target='enemy'):
+    """One aggregated UI damage event for a combo, with per-hit detail"""
+    return {
+        'target': target,
+        'amount': int(combo.total),
+        'time': time.time(),
+        'is_crit': combo.crit_count > 0,
+        'hits': [{'amount': hit.damage, 'is_crit': hit.is_crit, 'is_overcrit': hit.is_overcrit}
+                 for hit in combo.hits],
+    }
+
+
+class CombatResolver:
+    """Builds stat snapshots and resolves hits against them"""
+
+    def __init__(self, effect_manager=None, rng=None):
+        self.effect_manager = effect_manager
+        # Module-level random by default, so seeding random keeps working
+        self.rng = rng or random
+
+    def snapshot_attacker(self, entity, effect_manager=None):
+        """Capture attacker stats + active modifiers once per action"""
+        effect_manager = effect_manager or self.effect_manager
+        modifiers = {}
+        if effect_manager:
+            modifiers = dict(effect_manager.apply_active_effects(entity))
+
+        crit_chance = float(getattr(entity, 'critchance', 0.0))
+        crit_damage = float(getattr(entity, 'critdamage', 1.5))
+        overcrit_chance = 0.0
+        # Overcrit mechanic: crit chance >100% always crits, each 1% over adds
+        # 1% crit damage and 0.5% chance to deal 3x total crit damage
+        if crit_chance > 1.0:
+            overcrit_amount = crit_chance - 1.0
+            crit_damage += overcrit_amount
+            overcrit_chance = overcrit_amount * 0.5
+            crit_chance = 1.0
+
+        penetration = getattr(entity, 'penetration', 0)
+        magic_penetration = getattr(entity, 'magic_penetration', 0)
+        return AttackerSnapshot(
+            entity=entity,
+            modifiers=modifiers,
+            atk=getattr(entity, 'atk', 0) + modifiers.get('atk', 0),
+            magic_power=getattr(entity, 'magic_power', 0) + modifiers.get('magic_power', 0),
+            crit_chance=crit_chance,
+            crit_damage=crit_damage,
+            overcrit_chance=overcrit_chance,
+            penetration=penetration,
+            magic_penetration=magic_penetration,
+            pen_percent=penetration_percent(penetration),
+            magic_pen_percent=penetration_percent(magic_penetration),
+            lifesteal=getattr(entity, 'lifesteal', 0.0),
+        )
+
+    def snapshot_defender(self, entity, effect_manager=None):
+        """Capture defender's effective defense percentages (with buffs/debuffs)"""
+        effect_manager = effect_manager or self.effect_manager
+        modifiers = {}
+        if effect_manager:
+            modifiers = effect_manager.apply_active_effects(entity)
+        defense = getattr(entity, 'defense', 0) + modifiers.get('def', 0)
+        magic_defense = getattr(entity, 'magic_defense', 0) + modifiers.get('magic_defense', 0)
+        return DefenderSnapshot(entity, defense_percent(defense), defense_percent(magic_defense))
+
+    def roll_crit(self, attacker):
+        """Returns (is_crit, is_overcrit, damage multiplier)"""
+        rng = self.rng
+        if rng.random() >= attacker.crit_chance:
+            return False, False, 1.0
+        if attacker.overcrit_chance and rng.random() < attacker.overcrit_chance:
+            return True, True, attacker.crit_damage * 3.0
+        return True, False, attacker.crit_damage
+
+    @staticmethod
+    def mitigate(defender, dmg, pen_percent, magic=False):
+        """Damage after defense; penetration reduces defense effectiveness (min 1)"""
+        defense = defender.magic_defense_percent if magic else defender.defense_percent
+        effective_defense = defense * (1.0 - pen_percent / 100.0)
+        return max(1, int(dmg * (1.0 - effective_defense / 100.0)))
+
+    @staticmethod
+    def apply_damage(defender, amount):
+        """Subtract already-mitigated damage from the defender"""
+        entity = defender.entity
+        entity.hp = max(0, entity.hp - amount)
+        return amount
+
+    def resolve_hit(self, attacker, defender, raw_damage, pen_percent=None, magic=False, can_crit=True):
+        """Crit roll + mitigation + damage for one hit. Returns a Hit."""
+        is_crit, is_overcrit, crit_mult = self.roll_crit(attacker) if can_crit else (False, False, 1.0)
+        if is_crit:
+            raw_damage = int(round(raw_damage * crit_mult))
+        else:
+            raw_damage = int(raw_damage)
+        if pen_percent is None:
+            pen_percent = attacker.magic_pen_percent if magic else attacker.pen_percent
+        dealt = self.apply_damage(defender, self.mitigate(defender, raw_damage, pen_percent, magic))
+        return Hit(dealt, is_crit, is_overcrit, crit_mult)
+
+    def resolve_multi_hit(self, attacker, defender, raw_per_hit, hits, pen_percent=None, magic=False,
+                          crit_round=round):
+        """Resolve a whole combo in one pass. Returns a Combo.
+
+        crit_round: how crit damage is made whole before mitigation (weapon
+        multi-hits round; skills truncate, pass `int`).
+
+        Every hit has the same raw damage, so there are only three possible
+        mitigated outcomes (normal, crit, overcrit); they are computed once.
+        Crit/overcrit rolls for all hits are drawn up front, capped at the
+        number of hits that could possibly be needed to kill the defender,
+        and resolution stops at the overkill point. HP is updated once.
+        """
+        entity = defender.entity
+        hp = entity.hp
+        if hits <= 0 or hp <= 0:
+            return Combo([], 0, 0, 0)
+        if pen_percent is None:
+            pen_percent = attacker.magic_pen_percent if magic else attacker.pen_percent
+
+        mitigate = self.mitigate
+        normal_hit = Hit(mitigate(defender, int(raw_per_hit), pen_percent, magic), False, False, 1.0)
+        crit_mult = attacker.crit_damage
+        crit_hit = Hit(mitigate(defender, int(crit_round(raw_per_hit * crit_mult)), pen_percent, magic),
+                       True, False, crit_mult)
+        over_hit = Hit(mitigate(defender, int(crit_round(raw_per_hit * crit_mult * 3.0)), pen_percent, magic),
+                       True, True, crit_mult * 3.0)
+
+        # Never need more hits than it takes normal (weakest) hits to kill
+        hits = min(hits, -(-hp // normal_hit.damage))
+        rand = self.rng.random
+        crit_chance = attacker.crit_chance
+        overcrit_chance = attacker.overcrit_chance
+        crit_rolls = [rand() for _ in range(hits)]
+        over_rolls = [rand() for _ in range(hits)] if overcrit_chance else None
+
+        landed = []
+        total = crit_count = overcrit_count = 0
+        for i, roll in enumerate(crit_rolls):
+            if roll < crit_chance:
+                crit_count += 1
+                if over_rolls is not None and over_rolls[i] < overcrit_chance:
+                    hit = over_hit
+                    overcrit_count += 1
+                else:
+                    hit = crit_hit
+            else:
+                hit = normal_hit
+            landed.append(hit)
+            total += hit.damage
+            if total >= hp:
+                break
+
+        entity.hp = max(0, hp - total)
+        return Combo(landed, total, crit_count, overcrit_count)
@@ -0,0 +1,306 @@
+# src/crafting_planner.py
+"""Multi-step crafting planner over the recipe graph.
+
+Recipes form a DAG from ingredient items to result items. For each item
+the planner picks (once per player level, memoized) the recipe needing the
+fewest crafts per unit. A plan walks the graph products-first so demand
+for shared intermediates is summed before it is expanded, uses what is
+already in the inventory, and crafts only the deficit.
+"""
+from collections import namedtuple
+
+# Cap for "unlimited" counts (recipes without ingredients)
+MAX_CRAFT_COUNT = 9999
+
+# steps: [(recipe_id, times)] in execution order (ingredients first)
+# consumed: {item_id: qty} taken from the inventory
+# missing: {item_id: qty} still needed (empty if the plan is feasible)
+CraftPlan = namedtuple('CraftPlan', ('steps', 'consumed', 'missing'))
+
+
+class CraftingPlanner:
+    """Recipe DAG with max-craftable counts and minimal craft plans"""
+
+    def __init__(self, recipes):
+        # recipe id -> (result item, result qty), ((ingredient, qty), ...), required level
+        self.outputs = {}
+        self.ingredients = {}
+        self.levels = {}
+        # item id -> recipe ids producing it (file order)
+        self.producers = {}
+        for recipe in recipes:
+            recipe_id = recipe.get('id')
+            if not recipe_id or recipe_id in self.outputs:
+                continue
+            needs = {}
+            for ingredient in recipe.get('ingredients', []):
+                qty = int(ingredient.get('quantity', 1))
+                if qty > 0:
+                    needs[ingredient.get('item_id')] = needs.get(ingredient.get('item_id'), 0) + qty
+            result = recipe.get('result_item_id')
+            self.outputs[recipe_id] = (result, max(1, int(recipe.get('result_quantity', 1))))
+            self.ingredients[recipe_id] = tuple(needs.items())
+            self.levels[recipe_id] = int(recipe.get('required_level', 1) or 1)
+            self.producers.setdefault(result, []).append(recipe_id)
+        self._max_level = max(self.levels.values(), default=1)
+        # player level -> (item -> chosen recipe, craftable items products-first)
+        self._choices = {}
+        # (level, recipe id) -> (craftable items the recipe depends on
+        # products-first, all items it can consume)
+        self._sub_graphs = {}
+        # level -> {item: {raw material: amount per unit}}
+        self._raw_memo = {}
+        # Max craftable counts for the last inventory snapshot seen
+        self._max_cache = {'key': None, 'level': None, 'counts': {}}
+
+    def _chosen(self, player_level):
+        """Best recipe per craftable item at this level, and the items in
+        products-first order. Memoized per level."""
+        level = min(player_level, self._max_level)
+        cached = self._choices.get(level)
+        if cached is not None:
+            return cached
+
+        best = {}
+        cost = {}  # item -> crafts per unit (0 for raw materials)
+        visiting = set()
+
+        def item_cost(item):
+            if item in cost:
+                return cost[item]
+            if item in visiting:
+                return None  # cycle: can't be crafted through this path
+            visiting.add(item)
+            best_cost = None
+            for recipe_id in self.producers.get(item, ()):
+                if self.levels[recipe_id] > level:
+                    continue
+                total = 1.0
+                for ingredient, qty in self.ingredients[recipe_id]:
+                    sub = item_cost(ingredient)
+                    if sub is None:
+                        break
+                    total += qty * sub
+                else:
+                    per_unit = total / self.outputs[recipe_id][1]
+                    if best_cost is None or per_unit < best_cost:
+                        best_cost = per_unit
+                        best[item] = recipe_id
+            visiting.discard(item)
+            if best_cost is None and self.producers.get(item):
+                # Only uncraftable producers: treat as a raw material here
+                best_cost = 0.0
+            cost[item] = best_cost if best_cost is not None else 0.0
+            return cost[item]
+
+        for item in self.producers:
+            item_cost(item)
+
+        # Depth-first post-order over chosen recipes gives ingredients before
+        # products; reversed it is products first
+        order = []
+        done = set()
+
+        def visit(item):
+            if item in done:
+                return
+            done.add(item)
+            recipe_id = best.get(item)
+            if recipe_id is None:
+                return
+            for ingredient, _ in self.ingredients[recipe_id]:
+                visit(ingredient)
+            order.append(item)
+
+        for item in best:
+            visit(item)
+        order.reverse()
+        self._choices[level] = (best, order)
+        return self._choices[level]
+
+    def _sub_graph(self, recipe_id, player_level):
+        """(craftable items below recipe_id products-first, every item the
+        recipe can consume). Memoized per level."""
+        key = (min(player_level, self._max_level), recipe_id)
+        sub = self._sub_graphs.get(key)
+        if sub is None:
+            best, order = self._chosen(player_level)
+            reachable = set()
+            items = set()
+            stack = [ingredient for ingredient, _ in self.ingredients.get(recipe_id, ())]
+            while stack:
+                item = stack.pop()
+                if item in items:
+                    continue
+                items.add(item)
+                if item in best:
+                    reachable.add(item)
+                    stack.extend(ingredient for ingredient, _ in self.ingredients[best[item]])
+            sub = self._sub_graphs[key] = ([item for item in order if item in reachable], frozenset(items))
+        return sub
+
+    def _sub_order(self, recipe_id, player_level):
+        return self._sub_graph(recipe_id, player_level)[0]
+
+    def _expand(self, demands, inventory, player_level, order=None):
+        """Spread demands over the DAG. Returns a CraftPlan."""
+        best, full_order = self._chosen(player_level)
+        if order is None:
+            order = full_order
+        need = dict(demands)
+        crafts = {}
+        for item in order:
+            deficit = need.get(item, 0) - inventory.get(item, 0)
+            if deficit <= 0:
+                continue
+            recipe_id = best[item]
+            times = -(-deficit // self.outputs[recipe_id][1])
+            crafts[recipe_id] = crafts.get(recipe_id, 0) + times
+            for ingredient, qty in self.ingredients[recipe_id]:
+                need[ingredient] = need.get(ingredient, 0) + qty * times
+
+        consumed = {}
+        missing = {}
+        for item, qty in need.items():
+            have = inventory.get(item, 0)
+            if item in best:
+                # Crafted items: inventory stock is used first, the rest is produced
+                if have:
+                    consumed[item] = min(have, qty)
+            elif qty > have:
+                missing[item] = qty - have
+                if have:
+                    consumed[item] = have
+            else:
+                consumed[item] = qty
+        # Execution order: ingredients before the products that use them
+        steps = [(best[item], crafts[best[item]]) for item in reversed(order) if best[item] in crafts]
+        return CraftPlan(steps, consumed, missing)
+
+    def plan(self, item_id, quantity, inventory, player_level=1):
+        """Minimal craft plan to end up with `quantity` more of item_id"""
+        best, _ = self._chosen(player_level)
+        if item_id not in best:
+            return CraftPlan([], {}, {item_id: quantity})
+        recipe_id = best[item_id]
+        result_qty = self.outputs[recipe_id][1]
+        times = -(-quantity // result_qty)
+        return self.plan_recipe(recipe_id, times, inventory, player_level)
+
+    def plan_recipe(self, recipe_id, times, inventory, player_level=1):
+        """Plan for crafting recipe_id `times` times, crafting missing intermediates"""
+        demands = {ingredient: qty * times for ingredient, qty in self.ingredients.get(recipe_id, ())}
+        plan = self._expand(demands, inventory, player_level, self._sub_order(recipe_id, player_level))
+        plan.steps.append((recipe_id, times))
+        return plan
+
+    def _raw_content(self, item, player_level):
+        """Raw materials per unit of item via the chosen recipes (memoized per level)"""
+        level = min(player_level, self._max_level)
+        memo = self._raw_memo.setdefault(level, {})
+        content = memo.get(item)
+        if content is None:
+            best, _ = self._chosen(level)
+            recipe_id = best.get(item)
+            if recipe_id is None:
+                content = {item: 1.0}
+            else:
+                content = {}
+                per_unit = 1.0 / self.outputs[recipe_id][1]
+                for ingredient, qty in self.ingredients[recipe_id]:
+                    for raw, amount in self._raw_content(ingredient, level).items():
+                        content[raw] = content.get(raw, 0.0) + qty * amount * per_unit
+            memo[item] = content
+        return content
+
+    def _upper_bound(self, recipe_id, inventory, player_level):
+        """Crafts possible if every raw material (held or inside held
+        intermediates) could be split freely; ignores batch rounding, so it
+        is never below the real maximum"""
+        needed = {}
+        for ingredient, qty in self.ingredients[recipe_id]:
+            for raw, amount in self._raw_content(ingredient, player_level).items():
+                needed[raw] = needed.get(raw, 0.0) + qty * amount
+        available = {raw: inventory.get(raw, 0) for raw in needed}
+        for item in self._sub_order(recipe_id, player_level):
+            held = inventory.get(item, 0)
+            if held:
+                for raw, amount in self._raw_content(item, player_level).items():
+                    if raw in available:
+                        available[raw] += held * amount
+        bound = MAX_CRAFT_COUNT
+        for raw, amount in needed.items():
+            bound = min(bound, int(available[raw] / amount + 1e-9))
+        return bound
+
+    def _feasible(self, recipe_id, times, inventory, player_level):
+        """True if recipe_id can be crafted `times` times (same walk as _expand,
+        without building the plan)"""
+        best, _ = self._chosen(player_level)
+        need = {ingredient: qty * times for ingredient, qty in self.ingredients[recipe_id]}
+        for item in self._sub_order(recipe_id, player_level):
+            deficit = need.get(item, 0) - inventory.get(item, 0)
+            if deficit > 0:
+                made_by = best[item]
+                batches = -(-deficit // self.outputs[made_by][1])
+                for ingredient, qty in self.ingredients[made_by]:
+                    need[ingredient] = need.get(ingredient, 0) + qty * batches
+        for item, qty in need.items():
+            if item not in best and qty > inventory.get(item, 0):
+                return False
+        return True
+
+    def max_craftable(self, inventory, player_level=1, recipe_ids=None):
+        """{recipe_id: max times it can be crafted} for recipe_ids (default
+        all), crafting intermediates from the inventory when needed.
+
+        Counts are memoized per inventory snapshot and computed lazily, so a
+        UI page only pays for the recipes it shows. When the inventory
+        changes, counts of recipes that can't consume any changed item are
+        kept.
+        """
+        level = min(player_level, self._max_level)
+        cache = self._max_cache
+        key = frozenset(inventory.items())
+        if cache['key'] != key or cache['level'] != level:
+            kept = {}
+            if cache['key'] is not None and cache['level'] == level:
+                changed = {item for item, _ in key.symmetric_difference(cache['key'])}
+                for recipe_id, count in cache['counts'].items():
+                    if changed.isdisjoint(self._sub_graph(recipe_id, level)[1]):
+                        kept[recipe_id] = count
+            cache['key'], cache['level'], cache['counts'] = key, level, kept
+        counts = cache['counts']
+
+        best, _ = self._chosen(level)
+        for recipe_id in (self.ingredients if recipe_ids is None else recipe_ids):
+            if recipe_id in counts or recipe_id not in self.ingredients:
+                continue
+            if self.levels[recipe_id] > player_level:
+                counts[recipe_id] = 0
+                continue
+            direct = MAX_CRAFT_COUNT
+            chained = False
+            for ingredient, qty in self.ingredients[recipe_id]:
+                direct = min(direct, inventory.get(ingredient, 0) // qty)
+                if ingredient in best:
+                    chained = True
+            if chained:
+                direct = self._search_max(recipe_id, direct, inventory, level)
+            counts[recipe_id] = direct
+
+        if recipe_ids is None:
+            return dict(counts)
+        return {recipe_id: counts.get(recipe_id, 0) for recipe_id in recipe_ids}
+
+    def _search_max(self, recipe_id, low, inventory, player_level):
+        """Largest feasible count between low (direct count) and the raw
+        material upper bound (binary search)"""
+        high = self._upper_bound(recipe_id, inventory, player_level) + 1
+        while high - low > 1:
+            mid = (low + high) // 2
+            if self._feasible(recipe_id, mid, inventory, player_level):
+                low = mid
+            else:
+                high = mid
+        return low
@@ -2,6 +2,15 @@
 import json
 from pathlib import Path
 
+try:
+    from crafting_planner import CraftingPlanner
+    from game_log import get_logger
+except Exception:
+    from .crafting_planner import CraftingPlanner
+    from .game_log import get_logger
+
+log = get_logger('crafting')
+
 class CraftingSystem:
     """Manages crafting recipes and crafting operations"""
     
@@ -13,6 +22,8 @@ class CraftingSystem:
         """
         self.data_path = Path(data_path)
         self.recipes = []
+        self.recipes_by_id = {}
+        self.planner = CraftingPlanner([])
         self.load_recipes()
     
     def load_recipes(self):
@@ -23,13 +34,18 @@ class CraftingSystem:
                 with open(recipes_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     self.recipes = data.get('recipes', [])
-                print(f"📜 Loaded {len(self.recipes)} crafting recipes")
+                log.info("📜 Loaded %s crafting recipes", len(self.recipes))
             except Exception as e:
-                print(f"Error loading recipes: {e}")
+                log.error("Error loading recipes: %s", e)
                 self.recipes = []
         else:
-            print("No recipes.json found, crafting system disabled")
+            log.warning("No recipes.json found, crafting system disabled")
             self.recipes = []
+        # id index (first definition wins) and recipe DAG for planning
+        self.recipes_by_id = {}
+        for recipe in self.recipes:
+            self.recipes_by_id.setdefault(recipe.get('id'), recipe)
+        self.planner = CraftingPlanner(self.recipes)
     
     def get_all_recipes(self):
         """Get all available recipes"""
@@ -44,10 +60,7 @@ class CraftingSystem:
         Returns:
             Recipe dict or None if not found
         """
-        for recipe in self.recipes:
-            if recipe.get('id') == recipe_id:
-                return recipe
-        return None
+        return self.recipes_by_id.get(recipe_id)
     
     def get_recipes_by_category(self, category):
         """Get all recipes in a specific category
@@ -102,29 +115,71 @@ class CraftingSystem:
         Returns:
             (bool, str, result_item_id, result_quantity): (success, message, crafted_item_id, quantity)
         """
-        can_craft, reason = self.can_craft(recipe_id, player_inventory, player_level)
-        if not can_craft:
-            return False, reason, None, 0
+        return self.craft_bulk(recipe_id, 1, player_inventory, player_level)
+    
+    def craft_bulk(self, recipe_id, count, player_inventory, player_level=1, use_sub_recipes=False):
+        """Craft a recipe `count` times as one transaction
         
-        recipe = self.get_recipe_by_id(recipe_id)
+        Ingredients for the whole batch are validated once; nothing is
+        consumed unless every craft can be made. With use_sub_recipes,
+        missing intermediates are crafted first (see plan_craft).
         
-        # Remove ingredients from inventory
-        for ingredient in recipe.get('ingredients', []):
-            item_id = ingredient.get('item_id')
-            required_qty = ingredient.get('quantity', 1)
-            player_inventory[item_id] = player_inventory.get(item_id, 0) - required_qty
+        Args:
+            recipe_id: The recipe to craft
+            count: How many times to craft it
+            player_inventory: Dictionary of {item_id: quantity} (will be modified)
+            player_level: Player's current level
+            use_sub_recipes: Craft missing intermediate ingredients
             
+        Returns:
+            (bool, str, result_item_id, result_quantity): (success, message, crafted_item_id, total quantity)
+        """
+        recipe = self.get_recipe_by_id(recipe_id)
+        if not recipe:
+            return False, "Recipe not found", None, 0
+        
+        # Check level requirement
+        required_level = recipe.get('required_level', 1)
+        if player_level < required_level:
+            return False, f"Requires level {required_level}", None, 0
+        
+        count = int(count)
+        if count <= 0:
+            return False, "Nothing to craft", None, 0
+        
+        # Net inventory change of the whole batch
+        if use_sub_recipes:
+            plan = self.planner.plan_recipe(recipe_id, count, player_inventory, player_level)
+            if plan.missing:
+                item_id, missing_qty = next(iter(plan.missing.items()))
+                return False, f"Need {missing_qty}x more {item_id}", None, 0
+            steps = plan.steps
+        else:
+            steps = [(recipe_id, count)]
+        delta = {}
+        for step_id, times in steps:
+            for item_id, qty in self.planner.ingredients[step_id]:
+                delta[item_id] = delta.get(item_id, 0) - qty * times
+            result_id, result_qty = self.planner.outputs[step_id]
+            delta[result_id] = delta.get(result_id, 0) + result_qty * times
+        
+        for item_id, change in delta.items():
+            current_qty = player_inventory.get(item_id, 0)
+            if current_qty + change < 0:
+                return False, f"Need {-change}x {item_id} (have {current_qty})", None, 0
+        
+        # Commit
+        for item_id, change in delta.items():
+            if not change:
+                continue
+            player_inventory[item_id] = player_inventory.get(item_id, 0) + change
             # Remove item from inventory if quantity is 0
             if player_inventory[item_id] <= 0:
                 del player_inventory[item_id]
         
-        # Add result to inventory
-        result_item_id = recipe.get('result_item_id')
-        result_quantity = recipe.get('result_quantity', 1)
-        
-        player_inventory[result_item_id] = player_inventory.get(result_item_id, 0) + result_quantity
-        
-        return True, f"Crafted {result_quantity}x {recipe.get('name')}", result_item_id, result_quantity
+        result_item_id, result_quantity = self.planner.outputs[recipe_id]
+        total = result_quantity * count
+        return True, f"Crafted {total}x {recipe.get('name')}", result_item_id, total
     
     def get_available_recipes(self, player_inventory, player_level=1):
         """Get recipes that can be crafted with current resources
@@ -142,3 +197,33 @@ class CraftingSystem:
             if can_craft:
                 available.append(recipe.get('id'))
         return available
+    
+    def get_direct_craftable(self, recipe_id, player_inventory, player_level=1):
+        """How many times a recipe can be crafted from the inventory alone (no sub-recipes)"""
+        if player_level < self.planner.levels.get(recipe_id, 1):
+            return 0
+        counts = [player_inventory.get(item_id, 0) // qty
+                  for item_id, qty in self.planner.ingredients.get(recipe_id, ())]
+        return min(counts) if counts else 0
+    
+    def get_max_craftable(self, player_inventory, player_level=1, recipe_ids=None):
+        """How many times each recipe can be crafted
+        
+        Intermediate ingredients that have their own recipe are crafted
+        from the inventory when needed.
+        
+        Args:
+            recipe_ids: Only compute these recipes (default: all)
+        
+        Returns:
+            Dict of {recipe_id: max count}
+        """
+        return self.planner.max_craftable(player_inventory, player_level, recipe_ids)
+    
+    def plan_craft(self, item_id, quantity, player_inventory, player_level=1):
+        """Minimal chain of recipes to get `quantity` of item_id
+        
+        Returns:
+            CraftPlan (steps [(recipe_id, times)], consumed, missing)
+        """
+        return self.planner.plan(item_id, quantity, player_inventory, player_level)
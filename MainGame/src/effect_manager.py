@@ -1,39 +1,108 @@
 # src/effect_manager.py
+import heapq
+import itertools
 import random
 
+try:
+    from effects import BUFF, DEBUFF, DOT, COUNTER, Effect, from_dict
+except Exception:
+    from .effects import BUFF, DEBUFF, DOT, COUNTER, Effect, from_dict
+
+# Process-wide source of entity handles. Unlike id(entity), a handle is never
+# reused, so a new Enemy can't inherit effects left behind by a dead one.
+_handle_counter = itertools.count(1)
+
 
 class EffectManager:
-    """Manages active effects (buffs, debuffs, counters, DoT) on entities"""
+    """Manages active effects (buffs, debuffs, counters, DoT) on entities
+    
+    Each entity has its own turn clock (advanced by tick_effects). Effects store
+    the absolute turn they expire on and sit in a per-entity min-heap, so a tick
+    only touches the effects that actually expire.
+    """
     
     def __init__(self):
-        # Map of entity -> list of effects
-        # entity can be player or enemy (identified by id(entity))
+        # Map of entity handle -> {effect_id: effect} (insertion ordered)
+        # entity can be player or enemy (identified by entity.effect_handle)
         self.active_effects = {}
+        # Map of entity handle -> {stat: summed buff/debuff value}
+        # Kept in sync on add/expire/remove so lookups don't rescan effects
+        self.stat_modifiers = {}
+        # Map of entity handle -> number of ticks so far (the entity's turn clock)
+        self.turn_clock = {}
+        # Map of entity handle -> min-heap of (expire_turn, effect_id)
+        # Removed effects are skipped lazily when their entry surfaces
+        self.expiry_heap = {}
+        # Per-kind buckets so DoT and counter lookups skip the other effects
+        self.dot_effects = {}
+        self.counter_effects = {}
+        # Effect ids are unique for the life of this manager (one battle)
+        self._effect_ids = itertools.count(1)
+    
+    @staticmethod
+    def get_handle(entity):
+        """Return the entity's stable handle, assigning one on first use"""
+        handle = getattr(entity, 'effect_handle', None)
+        if handle is None:
+            handle = next(_handle_counter)
+            entity.effect_handle = handle
+        return handle
+    
+    def _adjust_modifier(self, entity_id, effect, sign):
+        """Add (sign=1) or subtract (sign=-1) a buff/debuff from the modifier sums"""
+        stat = effect.stat
+        if not stat:
+            return
+        modifiers = self.stat_modifiers.setdefault(entity_id, {})
+        total = modifiers.get(stat, 0) + sign * effect.value
+        if total:
+            modifiers[stat] = total
+        else:
+            modifiers.pop(stat, None)
+    
+    def _detach(self, entity_id, effect_id):
+        """Remove an effect from every index. Returns the effect or None."""
+        effects = self.active_effects.get(entity_id)
+        if not effects:
+            return None
+        effect = effects.pop(effect_id, None)
+        if effect is None:
+            return None
+        kind = effect.kind
+        if kind == DOT:
+            self.dot_effects[entity_id].pop(effect_id, None)
+        elif kind == COUNTER:
+            self.counter_effects[entity_id].pop(effect_id, None)
+        else:
+            self._adjust_modifier(entity_id, effect, -1)
+        return effect
     
     def add_effect(self, entity, effect, caster=None):
         """Add an effect to an entity
         
-        effect structure:
-        {
-            'type': 'buff'|'debuff'|'counter'|'dot',
-            'stat': 'atk'|'def'|'magic_power'|etc (for buff/debuff),
-            'value': int (for buff/debuff),
-            'damage': int (for dot),
-            'damage_type': 'physical'|'magic' (for dot scaling),
-            'damage_percent': float (for counter),
-            'duration': int (turns),
-            'source': str (skill name),
-            'caster_stats': dict (snapshot of caster stats for DoT scaling)
-        }
+        effect is an effects.Effect record (Buff, Debuff, Dot, Counter). Templates
+        are cloned here, so callers can pass a shared template directly. Legacy
+        effect dicts are converted.
+        
+        Returns the effect id.
         """
-        entity_id = id(entity)
+        if isinstance(effect, Effect):
+            effect = effect.clone()
+        else:
+            effect = from_dict(effect)
+        entity_id = self.get_handle(entity)
         if entity_id not in self.active_effects:
-            self.active_effects[entity_id] = []
+            self.active_effects[entity_id] = {}
+            self.turn_clock.setdefault(entity_id, 0)
+            self.expiry_heap[entity_id] = []
+            self.dot_effects[entity_id] = {}
+            self.counter_effects[entity_id] = {}
         
         # For DoT effects, scale with caster's stats
-        if effect.get('type') == 'dot' and caster:
-            damage_type = effect.get('damage_type', 'physical')
-            base_damage = effect.get('damage', 0)
+        kind = effect.kind
+        if kind == DOT and caster:
+            damage_type = effect.damage_type
+            base_damage = effect.damage
             
             # Scale DoT with relevant stat
             if damage_type == 'magic':
@@ -45,94 +114,97 @@ class EffectManager:
                 # Physical DoT scales 20% with attack
                 scaled_damage = base_damage + int(scaling_stat * 0.2)
             
-            effect['damage'] = max(1, scaled_damage)
-            effect['damage_type'] = damage_type
+            effect.damage = max(1, scaled_damage)
         
-        # Add effect with internal ID
-        effect['_id'] = len(self.active_effects[entity_id])
-        self.active_effects[entity_id].append(effect)
+        # Add effect with internal ID and absolute expiry turn
+        effect_id = next(self._effect_ids)
+        expires_at = self.turn_clock[entity_id] + effect.duration
+        effect.id = effect_id
+        effect.expires_at = expires_at
+        self.active_effects[entity_id][effect_id] = effect
+        heapq.heappush(self.expiry_heap[entity_id], (expires_at, effect_id))
+        
+        if kind == DOT:
+            self.dot_effects[entity_id][effect_id] = effect
+        elif kind == COUNTER:
+            self.counter_effects[entity_id][effect_id] = effect
+        else:
+            self._adjust_modifier(entity_id, effect, 1)
+        return effect_id
     
     def get_effects(self, entity):
         """Get all active effects on an entity"""
-        entity_id = id(entity)
-        return self.active_effects.get(entity_id, [])
+        entity_id = getattr(entity, 'effect_handle', None)
+        effects = self.active_effects.get(entity_id)
+        return list(effects.values()) if effects else []
+    
+    def get_remaining_duration(self, entity, effect):
+        """Turns left before an effect expires"""
+        clock = self.turn_clock.get(getattr(entity, 'effect_handle', None), 0)
+        expires_at = effect.expires_at
+        return max(0, expires_at - clock) if expires_at is not None else 0
     
     def remove_effect(self, entity, effect_id):
         """Remove a specific effect by ID"""
-        entity_id = id(entity)
-        if entity_id not in self.active_effects:
-            return
-        
-        self.active_effects[entity_id] = [
-            e for e in self.active_effects[entity_id]
-            if e.get('_id') != effect_id
-        ]
+        self._detach(getattr(entity, 'effect_handle', None), effect_id)
     
     def tick_effects(self, entity):
-        """Decrease duration of all effects on entity, remove expired ones
+        """Advance the entity's turn clock and remove expired effects
         
+        Costs O(expired effects) rather than touching every active effect.
         Returns list of expired effects (for logging/feedback)
         """
-        entity_id = id(entity)
+        entity_id = getattr(entity, 'effect_handle', None)
         if entity_id not in self.active_effects:
             return []
         
+        clock = self.turn_clock[entity_id] + 1
+        self.turn_clock[entity_id] = clock
+        heap = self.expiry_heap[entity_id]
         expired = []
-        remaining = []
-        
-        for effect in self.active_effects[entity_id]:
-            duration = effect.get('duration', 0)
-            duration -= 1
-            effect['duration'] = duration
-            
-            if duration <= 0:
+        while heap and heap[0][0] <= clock:
+            _, effect_id = heapq.heappop(heap)
+            effect = self._detach(entity_id, effect_id)
+            if effect is not None:
+                effect.duration = 0
                 expired.append(effect)
-            else:
-                remaining.append(effect)
-        
-        self.active_effects[entity_id] = remaining
         return expired
     
     def apply_active_effects(self, entity):
         """Apply stat modifiers from active buffs/debuffs
         
-        Returns dict of stat modifiers to apply temporarily
+        Returns dict of stat modifiers to apply temporarily (read-only: it is
+        the live running sum, not a copy)
         """
-        modifiers = {}
-        
-        for effect in self.get_effects(entity):
-            effect_type = effect.get('type')
-            
-            if effect_type in ['buff', 'debuff']:
-                stat = effect.get('stat')
-                value = effect.get('value', 0)
-                
-                if stat:
-                    modifiers[stat] = modifiers.get(stat, 0) + value
-        
-        return modifiers
+        return self.stat_modifiers.get(getattr(entity, 'effect_handle', None)) or {}
+    
+    def get_modifier(self, entity, stat):
+        """Get the summed buff/debuff value for one stat (0 if none)"""
+        modifiers = self.stat_modifiers.get(getattr(entity, 'effect_handle', None))
+        return modifiers.get(stat, 0) if modifiers else 0
     
     def process_dot_effects(self, entity):
         """Process damage over time effects
         
         Returns total DoT damage dealt this turn
         """
-        total_damage = 0
+        dots = self.dot_effects.get(getattr(entity, 'effect_handle', None))
+        if not dots:
+            return 0
         
-        for effect in self.get_effects(entity):
-            if effect.get('type') == 'dot':
-                damage = effect.get('damage', 0)
-                total_damage += damage
-                entity.hp = max(0, entity.hp - damage)
+        total_damage = 0
+        for effect in dots.values():
+            total_damage += effect.damage
+        entity.hp = max(0, entity.hp - total_damage)
         
         return total_damage
     
     def has_counter_effect(self, entity):
         """Check if entity has an active counter effect"""
-        for effect in self.get_effects(entity):
-            if effect.get('type') == 'counter':
-                return effect
-        return None
+        counters = self.counter_effects.get(getattr(entity, 'effect_handle', None))
+        if not counters:
+            return None
+        return next(iter(counters.values()))
     
     def store_counter_damage(self, entity, incoming_damage):
         """Store damage taken during counter stance for turn 2 retaliation
@@ -144,10 +216,8 @@ class EffectManager:
             return False
         
         # Only store damage on turn 1 (turn_count == 0)
-        if counter.get('turn_count', 0) == 0:
-            damage_percent = counter.get('damage_percent', 1.0)
-            damage_to_store = int(incoming_damage * damage_percent)
-            counter['damage_stored'] = counter.get('damage_stored', 0) + damage_to_store
+        if counter.turn_count == 0:
+            counter.damage_stored += int(incoming_damage * counter.damage_percent)
             return True
         
         return False
@@ -162,7 +232,7 @@ class EffectManager:
             return None
         
         # Counter strikes on turn 2 (turn_count == 1)
-        if counter.get('turn_count', 0) == 1:
+        if counter.turn_count == 1:
             return counter
         
         return None
@@ -171,13 +241,14 @@ class EffectManager:
         """Increment counter turn counter (called at start of player turn)"""
         counter = self.has_counter_effect(entity)
         if counter:
-            counter['turn_count'] = counter.get('turn_count', 0) + 1
+            counter.turn_count += 1
     
     def clear_entity_effects(self, entity):
         """Remove all effects from an entity (e.g., on death)"""
-        entity_id = id(entity)
-        if entity_id in self.active_effects:
-            del self.active_effects[entity_id]
+        entity_id = getattr(entity, 'effect_handle', None)
+        for index in (self.active_effects, self.stat_modifiers, self.turn_clock,
+                      self.expiry_heap, self.dot_effects, self.counter_effects):
+            index.pop(entity_id, None)
     
     def get_effect_summary(self, entity):
         """Get human-readable summary of active effects
@@ -187,26 +258,23 @@ class EffectManager:
         summary = []
         
         for effect in self.get_effects(entity):
-            effect_type = effect.get('type')
-            duration = effect.get('duration', 0)
-            source = effect.get('source', 'Unknown')
+            kind = effect.kind
+            duration = self.get_remaining_duration(entity, effect)
+            source = effect.source
             
-            if effect_type == 'buff':
-                stat = effect.get('stat', '?')
-                value = effect.get('value', 0)
-                summary.append(f"+{value} {stat.upper()} ({duration}t) [{source}]")
+            if kind == BUFF:
+                stat = effect.stat or '?'
+                summary.append(f"+{effect.value} {stat.upper()} ({duration}t) [{source}]")
             
-            elif effect_type == 'debuff':
-                stat = effect.get('stat', '?')
-                value = effect.get('value', 0)
-                summary.append(f"{value} {stat.upper()} ({duration}t) [{source}]")
+            elif kind == DEBUFF:
+                stat = effect.stat or '?'
+                summary.append(f"{effect.value} {stat.upper()} ({duration}t) [{source}]")
             
-            elif effect_type == 'counter':
-                percent = int(effect.get('damage_percent', 0.5) * 100)
+            elif kind == COUNTER:
+                percent = int(effect.damage_percent * 100)
                 summary.append(f"Counter {percent}% ({duration}t) [{source}]")
             
-            elif effect_type == 'dot':
-                damage = effect.get('damage', 0)
-                summary.append(f"DoT {damage}dmg/t ({duration}t) [{source}]")
+            elif kind == DOT:
+                summary.append(f"DoT {effect.damage}dmg/t ({duration}t) [{source}]")
         
         return summary
@@ -0,0 +1,156 @@
+# src/effects.py
+"""Typed effect records (buffs, debuffs, DoT, counter stances).
+
+Effects are small __slots__ objects instead of free-form dicts. Templates are
+built once from a skill/item definition and cloned onto an entity when applied.
+"""
+
+# Integer kinds, compared with == / used as dispatch keys instead of strings
+BUFF = 0
+DEBUFF = 1
+DOT = 2
+COUNTER = 3
+
+KIND_NAMES = ('buff', 'debuff', 'dot', 'counter')
+
+# Skill elements whose DoT scales with magic power instead of attack
+MAGIC_ELEMENTS = ('fire', 'ice', 'arcane', 'light', 'dark')
+
+
+class Effect:
+    """Base effect record. `id` and `expires_at` are set by EffectManager."""
+    __slots__ = ('duration', 'source', 'id', 'expires_at')
+    kind = None
+    _fields = __slots__
+
+    def __init__(self, duration=0, source='Unknown'):
+        self.duration = duration or 0
+        self.source = source
+        self.id = None
+        self.expires_at = None
+
+    @property
+    def type(self):
+        return KIND_NAMES[self.kind]
+
+    def clone(self):
+        """Cheap copy of a template (no dict building, no deepcopy)"""
+        cls = self.__class__
+        copy = cls.__new__(cls)
+        for name in cls._fields:
+            setattr(copy, name, getattr(self, name))
+        return copy
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.source!r}, duration={self.duration})"
+
+
+class StatEffect(Effect):
+    """Flat stat modifier (value is signed)"""
+    __slots__ = ('stat', 'value')
+    _fields = Effect._fields + __slots__
+
+    def __init__(self, stat, value, duration=0, source='Unknown'):
+        super().__init__(duration, source)
+        self.stat = stat
+        self.value = value or 0
+
+
+class Buff(StatEffect):
+    __slots__ = ()
+    kind = BUFF
+
+
+class Debuff(StatEffect):
+    __slots__ = ()
+    kind = DEBUFF
+
+
+class Dot(Effect):
+    """Damage over time; damage is scaled by the caster when applied"""
+    __slots__ = ('damage', 'damage_type')
+    kind = DOT
+    _fields = Effect._fields + __slots__
+
+    def __init__(self, damage, damage_type='physical', duration=0, source='Unknown'):
+        super().__init__(duration, source)
+        self.damage = damage or 0
+        self.damage_type = damage_type
+
+
+class Counter(Effect):
+    """Counter stance: stores damage taken on turn 1, strikes back on turn 2"""
+    __slots__ = ('damage_percent', 'skill_id', 'skill_power', 'skill_scaling_stat',
+                 'damage_stored', 'turn_count')
+    kind = COUNTER
+    _fields = Effect._fields + __slots__
+
+    def __init__(self, damage_percent=1.0, duration=2, source='Unknown',
+                 skill_id=None, skill_power=0, skill_scaling_stat='atk'):
+        super().__init__(duration, source)
+        self.damage_percent = damage_percent
+        self.skill_id = skill_id
+        self.skill_power = skill_power
+        self.skill_scaling_stat = skill_scaling_stat
+        # Damage taken during the stance
+        self.damage_stored = 0
+        # Which turn of the stance we're on (strike when it reaches 1)
+        self.turn_count = 0
+
+
+def from_dict(data):
+    """Build an effect record from a legacy effect dict"""
+    kind = data.get('type')
+    source = data.get('source', 'Unknown')
+    duration = data.get('duration', 0)
+    if kind == 'buff':
+        return Buff(data.get('stat'), data.get('value'), duration, source)
+    if kind == 'debuff':
+        return Debuff(data.get('stat'), data.get('value'), duration, source)
+    if kind == 'dot':
+        return Dot(data.get('damage'), data.get('damage_type', 'physical'), duration, source)
+    if kind == 'counter':
+        return Counter(data.get('damage_percent', 1.0), duration or 2, source,
+                       data.get('skill_id'), data.get('skill_power', 0),
+                       data.get('skill_scaling_stat', 'atk'))
+    raise ValueError(f"Unknown effect type: {kind}")
+
+
+def build_skill_templates(skill):
+    """Effect templates for a skills.json entry (heal is handled by the skill itself)"""
+    source = skill.get('name', skill.get('id'))
+    damage_type = 'magic' if skill.get('element', 'physical') in MAGIC_ELEMENTS else 'physical'
+    templates = []
+    for effect in skill.get('effects', []):
+        effect_type = effect.get('type')
+        if effect_type == 'buff':
+            templates.append(Buff(effect.get('stat'), effect.get('value'), effect.get('duration'), source))
+        elif effect_type == 'debuff':
+            templates.append(Debuff(effect.get('stat'), effect.get('value'), effect.get('duration'), source))
+        elif effect_type == 'counter':
+            # Always 2 turns: store on turn 1, strike on turn 2
+            templates.append(Counter(effect.get('damage_percent', 1.0), 2, source, skill.get('id'),
+                                     skill.get('power', 0), skill.get('scaling_stat', 'atk')))
+        elif effect_type == 'dot':
+            templates.append(Dot(effect.get('damage'), damage_type, effect.get('duration'), source))
+    return tuple(templates)
+
+
+# items.json effect key -> buffed stat
+ITEM_BOOSTS = (('atk_boost', 'atk'), ('def_boost', 'def'), ('magic_power_boost', 'magic_power'))
+
+# Item id -> templates, built on first use of each item
+_item_templates = {}
+
+
+def get_item_templates(item_id, item):
+    """Temporary buff templates for a consumable's `effect` block (cached per item id)"""
+    templates = _item_templates.get(item_id)
+    if templates is None:
+        effect = item.get('effect', {}) or {}
+        duration = effect.get('duration', 0)
+        source = item.get('name', item_id)
+        templates = tuple(Buff(stat, effect[key], duration, source)
+                          for key, stat in ITEM_BOOSTS if key in effect)
+        _item_templates[item_id] = templates
+    return templates
@@ -0,0 +1,68 @@
+# src/elements.py
+"""Element registry: element id <-> dense index.
+
+Indices come from data/elements.json (in file order). Elements used by skills
+or items but missing from elements.json (e.g. "void") are registered on first
+lookup so they still get their own slot.
+"""
+import json
+from pathlib import Path
+
+try:
+    from game_log import get_logger
+except Exception:
+    from .game_log import get_logger
+
+log = get_logger('skills')
+
+_element_ids = []
+_element_index = {}
+_loaded = False
+
+
+def _load():
+    global _loaded
+    _loaded = True
+    try:
+        path = Path(__file__).resolve().parents[1] / 'data' / 'elements.json'
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for element in data.get('elements', []):
+            element_index(element.get('id'))
+    except Exception as e:
+        log.warning("Could not load elements.json: %s", e)
+
+
+def element_index(element_id):
+    """Dense index for an element id (unknown ids are registered)"""
+    if not _loaded:
+        _load()
+    index = _element_index.get(element_id)
+    if index is None:
+        index = len(_element_ids)
+        _element_ids.append(element_id)
+        _element_index[element_id] = index
+    return index
+
+
+def element_ids():
+    """All registered element ids, in index order"""
+    if not _loaded:
+        _load()
+    return list(_element_ids)
+
+
+def bonus_vector(bonus_dicts):
+    """Sum `damage_type_bonuses`-style dicts into a list indexed by element"""
+    totals = {}
+    for bonuses in bonus_dicts:
+        for element, value in (bonuses or {}).items():
+            try:
+                index = element_index(element)
+                totals[index] = totals.get(index, 0.0) + float(value)
+            except (ValueError, TypeError):
+                continue
+    vector = [0.0] * len(_element_ids)
+    for index, value in totals.items():
+        vector[index] = value
+    return vector
@@ -1,12 +1,84 @@
 # src/enemy.py
 import random
 import json
+from collections import OrderedDict
 from pathlib import Path
 
+try:
+    from game_log import get_logger
+except Exception:
+    from .game_log import get_logger
+
+log = get_logger('enemy')
+
+# Scaled stat rows keyed by (monster template, wave); least recently used rows are
+# evicted past this size so long runs don't grow the table without bound
+SCALING_CACHE_SIZE = 4096
+_scaling_cache = OrderedDict()
+# Parsed monsters.json and its templates, reloaded only if the file changes on disk
+_monster_data = {'mtime': None, 'data': None, 'by_id': {}, 'by_def': {}}
+# Order of the stat values in a scaling row (the row also carries the display name)
+SCALED_STATS = ('hp', 'atk', 'defense', 'magic_defense', 'gold', 'xp')
+
+
+def _int_field(mon_def, key, default):
+    try:
+        return int(mon_def.get(key, default))
+    except (ValueError, TypeError):
+        log.warning("⚠️ Invalid %s for monster %s, using %s", key, mon_def.get('id'), default)
+        return default
+
+
+class MonsterTemplate:
+    """Immutable, validated monster definition shared by every Enemy of that kind"""
+    __slots__ = ('id', 'name', 'classification', 'category', 'image', 'is_boss',
+                 'hp_base', 'atk_base', 'gold_base', 'xp_base', 'def_base', 'magic_def_base',
+                 'pen_base', 'definition')
+
+    def __init__(self, mon_def=None, name=None, id=None):
+        mon_def = mon_def or {}
+        classification = mon_def.get('classification', 'normal') if mon_def else None
+        try:
+            pen_base = float(mon_def.get('pen_base', 0.0))
+        except (ValueError, TypeError):
+            pen_base = 0.0
+        values = {
+            'id': mon_def.get('id', id),
+            'name': str(mon_def.get('name', name or 'Enemy')),
+            'classification': classification,
+            # Category is an optional tag like 'demon'/'dragon'; fall back to classification
+            'category': mon_def.get('category', classification) if mon_def else None,
+            'image': mon_def.get('image', None),
+            'is_boss': classification in ('boss', 'miniboss'),
+            'hp_base': _int_field(mon_def, 'hp_base', 10),
+            'atk_base': _int_field(mon_def, 'atk_base', 1),
+            'gold_base': _int_field(mon_def, 'gold_base', 1),
+            'xp_base': _int_field(mon_def, 'xp_base', 1),
+            'def_base': _int_field(mon_def, 'def_base', 0),
+            'magic_def_base': _int_field(mon_def, 'magic_def_base', 0),
+            'pen_base': pen_base,
+            # Raw definition (drops, attacks, spawn rules)
+            'definition': mon_def,
+        }
+        for key, value in values.items():
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("MonsterTemplate is immutable")
+
+    def __repr__(self):
+        return f"MonsterTemplate({self.id!r})"
+
 
 class Enemy:
+    """A live enemy: shared template + mutable hp and wave-scaled stats"""
+    __slots__ = ('template', 'name', 'hp', 'max_hp', 'atk', 'gold', 'xp',
+                 'defense', 'magic_defense', 'penetration', 'category',
+                 'effect_handle', '__weakref__')
+
     def __init__(self, name="Slime", hp=30, atk=5, gold=10, xp=15, id=None):
-        self.id = id
+        # Ad-hoc enemy (fallback slimes, tests): gets its own bare template
+        self.template = MonsterTemplate(name=str(name), id=id)
         self.name = str(name)
         try:
             self.hp = max(1, int(hp))
@@ -27,7 +99,6 @@ class Enemy:
         except (ValueError, TypeError):
             self.xp = 15
         self.category = None
-        self.classification = None
         # Defense stored as raw value, will be converted to % when calculating damage
         # Initialized to 0, will be set later when creating from monster data
         self.defense = 0
@@ -35,6 +106,20 @@ class Enemy:
         self.magic_defense = 0
         # Penetration stat (most enemies won't have this)
         self.penetration = 0.0
+        # Stable key for EffectManager (assigned on first effect)
+        self.effect_handle = None
+
+    @property
+    def id(self):
+        return self.template.id
+
+    @property
+    def classification(self):
+        return self.template.classification
+
+    @property
+    def image(self):
+        return self.template.image
 
     @staticmethod
     def _load_monsters():
@@ -42,8 +127,26 @@ class Enemy:
             base = Path(__file__).resolve().parents[1]
             path = base / 'data' / 'monsters.json'
             if path.exists():
-                with open(path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                mtime = path.stat().st_mtime
+                if _monster_data['data'] is None or _monster_data['mtime'] != mtime:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    # Templates are built (and validated) once per load
+                    by_id = {}
+                    by_def = {}
+                    for mon in data.get('enemies', []):
+                        template = MonsterTemplate(mon)
+                        by_def[id(mon)] = template
+                        # First definition wins when an id is duplicated (same as a linear scan)
+                        if template.id:
+                            by_id.setdefault(template.id, template)
+                    _monster_data['data'] = data
+                    _monster_data['mtime'] = mtime
+                    _monster_data['by_id'] = by_id
+                    _monster_data['by_def'] = by_def
+                    # Scaling rows were built from the old templates
+                    _scaling_cache.clear()
+                return _monster_data['data']
         except Exception:
             return None
         return None
@@ -68,21 +171,6 @@ class Enemy:
                 pass
         return True
 
-    @staticmethod
-    def _scale_value(base_val, wave, per_wave_pct, flat_per_5waves=0, is_boss=False):
-        try:
-            # Reduce percentage scaling for normal mobs (not bosses)
-            if not is_boss:
-                per_wave_pct = per_wave_pct * 0.6  # 40% reduction in % scaling
-            
-            # Add flat scaling every 5 waves
-            flat_bonus = (wave // 5) * flat_per_5waves
-            
-            factor = 1.0 + per_wave_pct * wave
-            return max(1, int(round(base_val * factor + flat_bonus)))
-        except Exception:
-            return int(base_val)
-
     @staticmethod
     def random_enemy(wave=1, current_zone_id=None):
         """Create an enemy definition based on monsters.json rules and scaling.
@@ -105,8 +193,6 @@ class Enemy:
 
         enemies = data.get('enemies', [])
         scaling = data.get('scaling_notes', {})
-        hp_pct = float(scaling.get('hp_scale_per_wave_pct', 0.06))
-        atk_pct = float(scaling.get('atk_scale_per_wave_pct', 0.025))
         
         # RARE MONSTER CHECK - Roll for rare monsters first
         rare_candidates = []
@@ -130,7 +216,7 @@ class Enemy:
         # (in this case all successful rolls are 1, so we pick randomly among candidates)
         if rare_candidates:
             chosen_rare = random.choice(rare_candidates)[0]
-            print(f"✨ RARE SPAWN: {chosen_rare.get('name')}! (1/{chosen_rare.get('rare_spawn_chance')} chance)")
+            log.info("✨ RARE SPAWN: %s! (1/%s chance)", chosen_rare.get('name'), chosen_rare.get('rare_spawn_chance'))
             # Use this rare monster as the chosen one
             chosen = chosen_rare
         else:
@@ -198,43 +284,7 @@ class Enemy:
                     xp = 10 + wave * 4
                     return Enemy(name=f"Slime Lv.{wave}", hp=hp, atk=atk, gold=gold, xp=xp)
 
-        # Build stats from chosen def
-        hp_base = int(chosen.get('hp_base', 10))
-        atk_base = int(chosen.get('atk_base', 1))
-        gold_base = int(chosen.get('gold_base', 1))
-        xp_base = int(chosen.get('xp_base', 1))
-        def_base = int(chosen.get('def_base', 0))
-        magic_def_base = int(chosen.get('magic_def_base', 0))
-        pen_base = float(chosen.get('pen_base', 0.0))
-
-        hp = Enemy._scale_value(hp_base, wave, hp_pct, flat_per_5waves=10, is_boss=(chosen.get('classification') in ('boss', 'miniboss')))
-        atk = Enemy._scale_value(atk_base, wave, atk_pct, flat_per_5waves=1, is_boss=(chosen.get('classification') in ('boss', 'miniboss')))
-        # Defense scales slower (0.015 per wave instead of 0.025)
-        defense = Enemy._scale_value(def_base, wave, 0.015, flat_per_5waves=1, is_boss=(chosen.get('classification') in ('boss', 'miniboss')))
-        # Magic defense scales same as physical defense
-        magic_defense = Enemy._scale_value(magic_def_base, wave, 0.015, flat_per_5waves=1, is_boss=(chosen.get('classification') in ('boss', 'miniboss')))
-        # gold/xp scaling: use simple formulas if provided in scaling_notes
-        try:
-            gold = int(round(gold_base * (1 + wave * 0.05)))
-        except Exception:
-            gold = gold_base
-        try:
-            xp = int(round(xp_base * (1 + wave * 0.06)))
-        except Exception:
-            xp = xp_base
-
-        e = Enemy(name=f"{chosen.get('name', 'Enemy')} Lv.{wave}", hp=hp, atk=atk, gold=gold, xp=xp, id=chosen.get('id'))
-        # Add defense and penetration
-        e.defense = defense
-        e.magic_defense = magic_defense
-        e.penetration = pen_base  # Penetration doesn't scale with wave for enemies
-        # classification comes from monster def (normal/elite/miniboss/boss). Category is an optional tag like 'demon'/'dragon'.
-        e.classification = chosen.get('classification', 'normal')
-        # Ensure category is set - fall back to classification if not specified
-        e.category = chosen.get('category', chosen.get('classification', 'normal'))
-        # Add image attribute
-        e.image = chosen.get('image', None)
-        return e
+        return Enemy._spawn(_monster_data['by_def'][id(chosen)], wave, scaling)
 
     @staticmethod
     def from_id(enemy_id, wave=1):
@@ -243,55 +293,91 @@ class Enemy:
         if not data:
             return None
 
-        enemies = data.get('enemies', [])
-        chosen = None
-        for mon in enemies:
-            if mon.get('id') == enemy_id:
-                chosen = mon
-                break
-
-        if not chosen:
+        template = _monster_data['by_id'].get(enemy_id)
+        if not template:
             return None
 
-        scaling = data.get('scaling_notes', {})
-        hp_pct = float(scaling.get('hp_scale_per_wave_pct', 0.06))
-        atk_pct = float(scaling.get('atk_scale_per_wave_pct', 0.025))
-
-        hp_base = int(chosen.get('hp_base', 10))
-        atk_base = int(chosen.get('atk_base', 1))
-        gold_base = int(chosen.get('gold_base', 1))
-        xp_base = int(chosen.get('xp_base', 1))
-        def_base = int(chosen.get('def_base', 0))
-        magic_def_base = int(chosen.get('magic_def_base', 0))
-        pen_base = float(chosen.get('pen_base', 0.0))
-
-        is_boss = chosen.get('classification') in ('boss', 'miniboss')
-        hp = Enemy._scale_value(hp_base, wave, hp_pct, flat_per_5waves=10, is_boss=is_boss)
-        atk = Enemy._scale_value(atk_base, wave, atk_pct, flat_per_5waves=1, is_boss=is_boss)
-        defense = Enemy._scale_value(def_base, wave, 0.015, flat_per_5waves=1, is_boss=is_boss)
-        magic_defense = Enemy._scale_value(magic_def_base, wave, 0.015, flat_per_5waves=1, is_boss=is_boss)
-        try:
-            gold = int(round(gold_base * (1 + wave * 0.05)))
-        except Exception:
-            gold = gold_base
-        try:
-            xp = int(round(xp_base * (1 + wave * 0.06)))
-        except Exception:
-            xp = xp_base
+        return Enemy._spawn(template, wave, data.get('scaling_notes', {}))
 
-        e = Enemy(name=f"{chosen.get('name', 'Enemy')} Lv.{wave}", hp=hp, atk=atk, gold=gold, xp=xp, id=chosen.get('id'))
+    @staticmethod
+    def _scaled_row(template, wave, scaling):
+        """(name, hp, atk, defense, magic_defense, gold, xp) for a monster at a wave.
+        Rows are computed once per (template, wave) and then looked up."""
+        key = (template, wave)
+        row = _scaling_cache.get(key)
+        if row is not None:
+            _scaling_cache.move_to_end(key)
+            return row
+        curves = Enemy._stat_curves_for_template(template, (wave,), scaling)
+        row = (f"{template.name} Lv.{wave}",) + tuple(curves[stat][0] for stat in SCALED_STATS)
+        _scaling_cache[key] = row
+        if len(_scaling_cache) > SCALING_CACHE_SIZE:
+            _scaling_cache.popitem(last=False)
+        return row
+
+    @staticmethod
+    def _stat_curves_for_template(template, waves, scaling):
+        """Scaled stat lists over `waves` for one monster template.
+        Evaluated a whole stat at a time; _scaled_row uses it for single waves."""
+        # Reduce percentage scaling for normal mobs (not bosses)
+        pct_mult = 1.0 if template.is_boss else 0.6
+        hp_pct = float(scaling.get('hp_scale_per_wave_pct', 0.06)) * pct_mult
+        atk_pct = float(scaling.get('atk_scale_per_wave_pct', 0.025)) * pct_mult
+        # Defense and magic defense scale slower (0.015 per wave)
+        def_pct = 0.015 * pct_mult
+
+        def curve(base_val, per_wave_pct, flat_per_5waves):
+            return [max(1, int(round(base_val * (1.0 + per_wave_pct * w) + (w // 5) * flat_per_5waves)))
+                    for w in waves]
+
+        gold_base = template.gold_base
+        xp_base = template.xp_base
+        return {
+            'hp': curve(template.hp_base, hp_pct, 10),
+            'atk': curve(template.atk_base, atk_pct, 1),
+            'defense': curve(template.def_base, def_pct, 1),
+            'magic_defense': curve(template.magic_def_base, def_pct, 1),
+            # gold/xp scaling (see scaling_notes formulas)
+            'gold': [int(round(gold_base * (1 + w * 0.05))) for w in waves],
+            'xp': [int(round(xp_base * (1 + w * 0.06))) for w in waves],
+        }
+
+    @staticmethod
+    def stat_curves(enemy_id, max_wave):
+        """Whole stat curves for waves 1..max_wave in one call (for analysis tools).
+        Returns {'hp': [...], 'atk': [...], ...} where index 0 is wave 1, or None."""
+        data = Enemy._load_monsters()
+        if not data:
+            return None
+        template = _monster_data['by_id'].get(enemy_id)
+        if not template:
+            return None
+        return Enemy._stat_curves_for_template(template, range(1, max_wave + 1), data.get('scaling_notes', {}))
+
+    @staticmethod
+    def _spawn(template, wave, scaling):
+        """Create a scaled Enemy from a template: a row lookup plus slot stores"""
+        name, hp, atk, defense, magic_defense, gold, xp = Enemy._scaled_row(template, wave, scaling)
+        e = Enemy.__new__(Enemy)
+        e.template = template
+        e.name = name
+        e.hp = hp
+        e.max_hp = hp
+        e.atk = atk
+        # Negative modifiers in a template never make a kill cost gold/XP
+        e.gold = max(0, gold)
+        e.xp = max(0, xp)
         e.defense = defense
         e.magic_defense = magic_defense
-        e.penetration = pen_base
-        e.classification = chosen.get('classification', 'normal')
-        e.category = chosen.get('category', chosen.get('classification', 'normal'))
-        e.image = chosen.get('image', None)
+        e.penetration = template.pen_base  # Penetration doesn't scale with wave for enemies
+        e.category = template.category
+        e.effect_handle = None
         return e
     
     @property
     def is_boss(self):
         """Returns True if this enemy is a boss or miniboss"""
-        return self.classification in ('boss', 'miniboss')
+        return self.template.is_boss
 
     @staticmethod
     def _calculate_effective_stat(raw_value, soft_cap, hard_cap):
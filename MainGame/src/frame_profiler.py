@@ -0,0 +1,158 @@
+# src/frame_profiler.py
+"""Per-frame phase timings for the main loop, with an in-game overlay.
+
+The loop calls `begin_frame()` once per frame and `mark(phase)` after each
+phase; the time since the previous mark is charged to that phase. Rolling
+p50/p95 over the last WINDOW frames are drawn as an overlay (F3 or the
+`profiler` console command) with a frame-time sparkline, and every frame
+recorded while the profiler is on can be exported to CSV.
+"""
+import csv
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+import pygame
+
+# Main-loop phases, in loop order. 'other' covers zone checks, saves and
+# the shop modal; 'tick' is the time clock.tick() sleeps to cap the FPS.
+PHASES = ('events', 'battle.update', 'ui.update', 'other', 'sprites', 'ui.draw', 'overlay', 'flip', 'tick')
+# Phases that are not the game's own work (excluded from the frame time)
+IDLE_PHASES = ('tick',)
+WINDOW = 300
+FRAME_BUDGET_MS = 1000.0 / 60
+# Session rows kept for CSV export (about an hour at 60 FPS)
+MAX_SESSION_FRAMES = 216000
+# Overlay stats are recomputed every N frames
+REFRESH_FRAMES = 10
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a sequence (pct in 0..100)"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class FrameProfiler:
+    def __init__(self, window=WINDOW, clock=time.perf_counter):
+        self.clock = clock
+        self.enabled = False
+        self.frame_index = 0
+        self.history = {phase: deque(maxlen=window) for phase in PHASES}
+        self.frame_times = deque(maxlen=window)
+        self.session = deque(maxlen=MAX_SESSION_FRAMES)
+        self.context = {}
+        self._current = None
+        self._last = None
+        self._stats = None
+        self._font = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self._current = None
+        print(f"⏱️ Frame profiler {'ON' if self.enabled else 'OFF'}")
+        return self.enabled
+
+    def begin_frame(self, **context):
+        """Start timing a frame; context (e.g. wave=...) goes into the CSV"""
+        if not self.enabled:
+            return
+        if self._current is not None:
+            self._finish_frame()
+        self.context = context
+        self._current = dict.fromkeys(PHASES, 0.0)
+        self._last = self.clock()
+
+    def mark(self, phase):
+        """Charge the time since the previous mark to phase"""
+        if self._current is None:
+            return
+        now = self.clock()
+        self._current[phase] = self._current.get(phase, 0.0) + (now - self._last) * 1000.0
+        self._last = now
+
+    def _finish_frame(self):
+        current = self._current
+        self._current = None
+        frame_ms = sum(ms for phase, ms in current.items() if phase not in IDLE_PHASES)
+        for phase in PHASES:
+            self.history[phase].append(current[phase])
+        self.frame_times.append(frame_ms)
+        self.session.append((self.frame_index, self.context.get('wave', ''), frame_ms, current))
+        self.frame_index += 1
+        if self.frame_index % REFRESH_FRAMES == 0:
+            self._stats = None
+
+    def stats(self):
+        """{phase: (p50, p95)} over the rolling window, plus 'frame'"""
+        if self._stats is None:
+            stats = {phase: (percentile(values, 50), percentile(values, 95))
+                     for phase, values in self.history.items()}
+            stats['frame'] = (percentile(self.frame_times, 50), percentile(self.frame_times, 95))
+            self._stats = stats
+        return self._stats
+
+    def export_csv(self, path):
+        """Write every recorded frame of the session; returns the row count"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'wave', 'frame_ms'] + [f"{phase}_ms" for phase in PHASES])
+            for frame, wave, frame_ms, phases in self.session:
+                writer.writerow([frame, wave, f"{frame_ms:.3f}"] + [f"{phases[phase]:.3f}" for phase in PHASES])
+        print(f"💾 Frame profile exported: {path} ({len(self.session)} frames)")
+        return len(self.session)
+
+    def default_csv_path(self, directory):
+        return Path(directory) / f"frames_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+
+    def draw(self, screen, pos=(10, 10)):
+        """Phase table and frame-time sparkline in a corner of the screen"""
+        if not self.enabled or not self.frame_times:
+            return
+        if self._font is None:
+            self._font = pygame.font.Font(None, 20)
+        font = self._font
+        stats = self.stats()
+        line_h = 18
+        spark_w, spark_h = 300, 50
+        panel_w = spark_w + 20
+        panel_h = 30 + line_h * (len(PHASES) + 1) + spark_h + 15
+        x, y = pos
+        panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
+        panel.fill((10, 10, 20, 210))
+        screen.blit(panel, (x, y))
+        pygame.draw.rect(screen, (120, 200, 255), (x, y, panel_w, panel_h), 1)
+
+        p50, p95 = stats['frame']
+        color = (255, 100, 100) if p95 > FRAME_BUDGET_MS else (150, 255, 150)
+        screen.blit(font.render(f"Frame  p50 {p50:6.2f}  p95 {p95:6.2f} ms", True, color), (x + 10, y + 8))
+        columns = (x + 10, x + 150, x + 230)
+        for col, label in zip(columns, ('phase', 'p50', 'p95')):
+            screen.blit(font.render(label, True, (180, 180, 180)), (col, y + 8 + line_h))
+        # The phase with the worst p95 is the one to blame for stutter
+        worst = max((phase for phase in PHASES if phase not in IDLE_PHASES), key=lambda phase: stats[phase][1])
+        for row, phase in enumerate(PHASES, start=2):
+            color = (255, 220, 100) if phase == worst else (220, 220, 220)
+            cells = (phase,) + tuple(f"{ms:.2f}" for ms in stats[phase])
+            for col, cell in zip(columns, cells):
+                screen.blit(font.render(cell, True, color), (col, y + 8 + row * line_h))
+
+        # Sparkline of the rolling frame times, scaled to 2x the 60 FPS budget
+        sx = x + 10
+        sy = y + panel_h - spark_h - 8
+        pygame.draw.rect(screen, (30, 30, 45), (sx, sy, spark_w, spark_h))
+        scale = spark_h / (FRAME_BUDGET_MS * 2)
+        budget_y = sy + spark_h - int(FRAME_BUDGET_MS * scale)
+        pygame.draw.line(screen, (255, 100, 100), (sx, budget_y), (sx + spark_w, budget_y))
+        samples = list(self.frame_times)[-spark_w:]
+        if len(samples) > 1:
+            step = spark_w / (len(samples) - 1)
+            points = [(sx + int(i * step), sy + spark_h - min(spark_h, int(ms * scale)))
+                      for i, ms in enumerate(samples)]
+            pygame.draw.lines(screen, (120, 200, 255), False, points)
@@ -0,0 +1,170 @@
+# src/frame_watchdog.py
+"""Frame-budget watchdog: catch slow frames in the field with real stacks.
+
+The main loop calls `begin_frame()` before its work, `mark(phase)` as the
+frame profiler does, and `end_frame()` after the flip (the clock.tick()
+sleep is not work). A helper thread sleeps until the frame's deadline; if
+the frame is still running then, it grabs the main thread's stack on the
+spot. Overrunning frames are logged with their duration, phase, wave, open
+modal and that stack to a rotating file (profiles/slow_frames.log).
+"""
+import logging
+import sys
+import threading
+import time
+import traceback
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+try:
+    from frame_profiler import PHASES
+except Exception:
+    from .frame_profiler import PHASES
+
+DEFAULT_BUDGET_MS = 16.6
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+# At most one stack per this many seconds; other overruns are only counted
+MIN_LOG_INTERVAL = 1.0
+
+
+def _next_phase(done):
+    """Phase that runs after `done` in the main loop"""
+    try:
+        return PHASES[PHASES.index(done) + 1]
+    except (ValueError, IndexError):
+        return f"after {done}"
+
+
+class FrameWatchdog:
+    def __init__(self, budget_ms=DEFAULT_BUDGET_MS, log_path=None, context=None,
+                 max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS, min_interval=MIN_LOG_INTERVAL):
+        """context: callable returning {'wave': ..., 'modal': ...} for the log line"""
+        self.budget = budget_ms / 1000.0
+        self.context = context
+        self.min_interval = min_interval
+        self.overruns = 0
+        self.logged = 0
+        self._skipped = 0
+        self._last_logged = 0.0
+        self._frame_id = 0
+        self._open = False
+        self._start = 0.0
+        self._phase = PHASES[0]
+        self._captured = None
+        self._main_id = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.logger = logging.getLogger(f"vintage.watchdog.{id(self)}")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.WARNING)
+        self.log_path = Path(log_path) if log_path else None
+        self._rotation = (max_bytes, backups)
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        """Watch the calling thread (the game loop)"""
+        if self.running:
+            return
+        self._main_id = threading.get_ident()
+        if self.log_path:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            max_bytes, backups = self._rotation
+            # delay: the file only appears once a frame overruns
+            handler = RotatingFileHandler(self.log_path, maxBytes=max_bytes, backupCount=backups,
+                                          encoding='utf-8', delay=True)
+            handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            self.logger.addHandler(handler)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='frame-watchdog', daemon=True)
+        self._thread.start()
+        print(f"🐕 Frame watchdog on ({self.budget * 1000:.1f} ms budget)")
+
+    def stop(self):
+        if not self.running:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+        for handler in list(self.logger.handlers):
+            handler.close()
+            self.logger.removeHandler(handler)
+
+    # --- main thread ---
+
+    def begin_frame(self, phase=None):
+        if not self.running:
+            return
+        self._captured = None
+        self._phase = phase or PHASES[0]
+        self._start = time.perf_counter()
+        self._frame_id += 1
+        self._open = True
+        self._wake.set()
+
+    def mark(self, phase):
+        """`phase` just finished (same names as FrameProfiler.mark)"""
+        self._phase = _next_phase(phase)
+
+    def end_frame(self):
+        """Close the frame; returns its duration in ms if it overran, else None"""
+        if not self._open:
+            return None
+        self._open = False
+        elapsed = time.perf_counter() - self._start
+        if elapsed <= self.budget:
+            return None
+        self.overruns += 1
+        now = time.monotonic()
+        if now - self._last_logged < self.min_interval:
+            self._skipped += 1
+            return elapsed * 1000.0
+        self._last_logged = now
+        self._log(elapsed * 1000.0)
+        return elapsed * 1000.0
+
+    def _log(self, elapsed_ms):
+        captured = self._captured
+        try:
+            context = self.context() if self.context else {}
+        except Exception:
+            context = {}
+        phase, stack = captured if captured else (self._phase, None)
+        skipped = f" (+{self._skipped} overruns not logged)" if self._skipped else ""
+        self._skipped = 0
+        lines = [f"SLOW FRAME {elapsed_ms:.1f} ms (budget {self.budget * 1000:.1f}) phase={phase} "
+                 f"wave={context.get('wave', '?')} modal={context.get('modal') or 'none'}{skipped}"]
+        if stack:
+            lines.append("Main thread stack at the deadline:")
+            lines.extend(stack)
+        self.logger.warning("\n".join(lines))
+        self.logged += 1
+
+    # --- helper thread ---
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            frame_id = self._frame_id
+            delay = self._start + self.budget - time.perf_counter()
+            if delay > 0 and self._stop.wait(delay):
+                break
+            if self._open and self._frame_id == frame_id:
+                self._capture(frame_id)
+
+    def _capture(self, frame_id):
+        phase = self._phase
+        frame = sys._current_frames().get(self._main_id)
+        if frame is None:
+            return
+        stack = [line.rstrip('\n') for line in traceback.format_stack(frame)]
+        if self._frame_id == frame_id:
+            self._captured = (phase, stack)
@@ -0,0 +1,118 @@
+# src/game_log.py
+"""Leveled logging for the game's subsystems.
+
+Modules log through `get_logger('combat')` etc. with %-style arguments
+(`log.debug("%s hits %s", a, b)`), so a message below its subsystem's
+level is dropped before anything is formatted. `setup_logging()` (called by
+main.py) sets the levels and routes records through a QueueHandler: the
+game loop only enqueues, and a listener thread does the terminal writes.
+
+Levels come from usersettings.json ("logging": {"level": "INFO",
+"combat": "DEBUG"}) and can be overridden with VL_LOG, e.g.
+VL_LOG=DEBUG or VL_LOG=combat=DEBUG,drops=WARNING.
+Per-attack combat chatter is DEBUG; waves, level-ups and unlocks are INFO.
+Without setup_logging() (tests, benchmarks) only warnings are shown.
+"""
+import atexit
+import contextlib
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+ROOT = 'vintage'
+ENV_VAR = 'VL_LOG'
+DEFAULT_LEVEL = 'INFO'
+SUBSYSTEMS = ('combat', 'drops', 'waves', 'enemy', 'player', 'items', 'skills', 'crafting', 'audio')
+
+_listener = None
+
+
+def get_logger(subsystem):
+    """Logger of one subsystem (e.g. 'combat' -> vintage.combat)"""
+    return logging.getLogger(f"{ROOT}.{subsystem}")
+
+
+def _level(name, default=logging.INFO):
+    if isinstance(name, int):
+        return name
+    level = logging.getLevelName(str(name).strip().upper())
+    return level if isinstance(level, int) else default
+
+
+def parse_levels(spec):
+    """'DEBUG' or 'combat=DEBUG,drops=WARNING' -> {'': DEBUG} / {'combat': DEBUG, ...}"""
+    levels = {}
+    for part in (spec or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '=' in part:
+            subsystem, level = part.split('=', 1)
+            levels[subsystem.strip()] = _level(level)
+        else:
+            levels[''] = _level(part)
+    return levels
+
+
+def setup_logging(settings=None, stream=None):
+    """Apply levels and start the queue listener; safe to call again (reconfigures).
+
+    settings: the "logging" dict of usersettings.json ({"level": ..., subsystem: level}).
+    """
+    global _listener
+    settings = dict(settings or {})
+    levels = {'': _level(settings.pop('level', DEFAULT_LEVEL))}
+    levels.update({subsystem: _level(level) for subsystem, level in settings.items()})
+    levels.update(parse_levels(os.environ.get(ENV_VAR)))
+
+    root = logging.getLogger(ROOT)
+    root.setLevel(levels.pop(''))
+    root.propagate = False
+    for subsystem in SUBSYSTEMS:
+        get_logger(subsystem).setLevel(logging.NOTSET)
+    for subsystem, level in levels.items():
+        get_logger(subsystem).setLevel(level)
+
+    shutdown_logging()
+    records = queue.SimpleQueue()
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    _listener = QueueListener(records, handler, respect_handler_level=False)
+    root.addHandler(QueueHandler(records))
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    root = logging.getLogger(ROOT)
+    for handler in [h for h in root.handlers if isinstance(h, QueueHandler)]:
+        root.removeHandler(handler)
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+@contextlib.contextmanager
+def muted(level=logging.INFO):
+    """Drop game records at or below `level` (fast-forward, benchmarks).
+
+    Only the vintage.* loggers are raised, and restored on exit; other
+    libraries' logging and the rest of the process are left alone.
+    """
+    loggers = [logging.getLogger(ROOT)] + [get_logger(subsystem) for subsystem in SUBSYSTEMS]
+    previous = [(logger, logger.level) for logger in loggers]
+    for logger in loggers:
+        if logger.getEffectiveLevel() <= level:
+            logger.setLevel(level + 1)
+    try:
+        yield
+    finally:
+        for logger, logger_level in previous:
+            logger.setLevel(logger_level)
+
+
+atexit.register(shutdown_logging)
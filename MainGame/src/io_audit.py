@@ -0,0 +1,221 @@
+# src/io_audit.py
+"""Opt-in audit of data/asset file I/O (set VL_IO_AUDIT=1).
+
+When enabled, open(), json parsing and pygame image/sound decoding are
+wrapped to count every access with the game code line that caused it,
+bucketed by frame and by turn. A report is printed (and written next to
+the profiles) at exit: after the first STARTUP_FRAMES frames, steady-state
+play should not read the disk at all.
+"""
+import atexit
+import builtins
+import io
+import json
+import os
+import sys
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+
+ENV_VAR = 'VL_IO_AUDIT'
+GAME_DIR = Path(__file__).resolve().parents[1]
+# Frames spent on startup / first draws before "steady state" is checked
+STARTUP_FRAMES = 120
+TOP_N = 25
+
+
+class IOAudit:
+    def __init__(self, roots=None, startup_frames=STARTUP_FRAMES):
+        roots = roots or (GAME_DIR / 'data', GAME_DIR / 'assets', GAME_DIR / 'saves')
+        self.roots = tuple(os.path.normcase(str(Path(root).resolve())) for root in roots)
+        self.startup_frames = startup_frames
+        self.enabled = False
+        self.frame = 0
+        self.turn = 0
+        self._turn_key = None
+        # (kind, path, site) -> count
+        self.events = Counter()
+        self.per_frame = Counter()
+        self.per_turn = Counter()
+        # frame -> [(kind, path, site)] once steady state is reached
+        self.steady = defaultdict(list)
+        self._originals = {}
+        self._active = False
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        """Installed audit when VL_IO_AUDIT is set, otherwise a disabled one"""
+        audit = cls(**kwargs)
+        if os.environ.get(ENV_VAR, '').strip() not in ('', '0'):
+            audit.install()
+        return audit
+
+    # --- hooks ---
+
+    def install(self, report_at_exit=True):
+        if self.enabled:
+            return
+        self.enabled = True
+        audit = self
+        original_open = builtins.open
+
+        def audited_open(file, mode='r', *args, **kwargs):
+            if isinstance(file, (str, bytes, os.PathLike)):
+                audit.record('write' if any(c in mode for c in 'wax+') else 'open', file)
+            return original_open(file, mode, *args, **kwargs)
+
+        self._patch(builtins, 'open', audited_open)
+        self._patch(io, 'open', audited_open)
+        self._wrap(json, 'load', 'parse', lambda args: getattr(args[0], 'name', '<stream>') if args else '')
+        self._wrap(json, 'loads', 'parse', lambda args: '<string>')
+        try:
+            import pygame
+            path_of = lambda args: args[0] if args and isinstance(args[0], (str, os.PathLike)) else '<file>'
+            self._wrap(pygame.image, 'load', 'decode', path_of)
+            self._wrap(pygame.mixer, 'Sound', 'decode', path_of)
+            self._wrap(pygame.mixer.music, 'load', 'decode', path_of)
+        except Exception:
+            pass
+        if report_at_exit:
+            atexit.register(self.report_at_exit)
+        print(f"🔎 Data I/O audit enabled ({ENV_VAR})")
+
+    def uninstall(self):
+        for (owner, name), original in self._originals.items():
+            setattr(owner, name, original)
+        self._originals.clear()
+        self.enabled = False
+
+    def _patch(self, owner, name, replacement):
+        self._originals[(owner, name)] = getattr(owner, name)
+        setattr(owner, name, replacement)
+
+    def _wrap(self, owner, name, kind, path_of):
+        original = getattr(owner, name)
+        audit = self
+
+        def wrapper(*args, **kwargs):
+            if audit._active:
+                return original(*args, **kwargs)
+            audit.record(kind, path_of(args), force=True)
+            # json.load calls json.loads: one parse, not two
+            audit._active = True
+            try:
+                return original(*args, **kwargs)
+            finally:
+                audit._active = False
+        wrapper.__name__ = getattr(original, '__name__', name)
+        self._patch(owner, name, wrapper)
+
+    # --- recording ---
+
+    def record(self, kind, path, force=False):
+        """Count one access; opens are only counted under the data/asset roots"""
+        if self._active:
+            # Nested in an access that is already counted
+            return
+        self._active = True
+        try:
+            path = os.fsdecode(path) if isinstance(path, (bytes, os.PathLike)) else str(path)
+            if not force and not self._is_game_file(path):
+                return
+            site = self._call_site()
+            if site is None:
+                # Not caused by game code (stdlib, pygame internals)
+                return
+            key = (kind, self._short(path), site)
+            self.events[key] += 1
+            self.per_frame[self.frame] += 1
+            self.per_turn[self.turn] += 1
+            # Saves are expected mid-game; steady state is about reads
+            if self.frame > self.startup_frames and kind != 'write':
+                self.steady[self.frame].append(key)
+        finally:
+            self._active = False
+
+    def _is_game_file(self, path):
+        try:
+            full = os.path.normcase(os.path.abspath(path))
+        except Exception:
+            return False
+        return full.startswith(self.roots)
+
+    def _short(self, path):
+        if path.startswith('<'):
+            return path
+        try:
+            return Path(path).resolve().relative_to(GAME_DIR).as_posix()
+        except Exception:
+            return path
+
+    def _call_site(self):
+        """`file.py:line (function)` of the innermost game frame outside this module"""
+        frame = sys._getframe(2)
+        game_dir = str(GAME_DIR)
+        this_file = os.path.abspath(__file__)
+        while frame is not None:
+            filename = os.path.abspath(frame.f_code.co_filename)
+            if filename.startswith(game_dir) and filename != this_file:
+                return f"{os.path.basename(filename)}:{frame.f_lineno} ({frame.f_code.co_name})"
+            frame = frame.f_back
+        return None
+
+    def begin_frame(self, turn_key=None):
+        """Called once per main-loop frame; a new turn_key starts a new turn"""
+        if not self.enabled:
+            return
+        self.frame += 1
+        if turn_key != self._turn_key:
+            self._turn_key = turn_key
+            self.turn += 1
+
+    # --- report ---
+
+    def steady_state_reads(self):
+        """Reads (opens, parses, decodes) recorded after the startup frames"""
+        return sum(len(keys) for keys in self.steady.values())
+
+    def report(self):
+        lines = [f"📊 Data I/O audit: {self.frame} frames, {self.turn} turns"]
+        totals = Counter()
+        for (kind, _, _), count in self.events.items():
+            totals[kind] += count
+        lines.append("Totals: " + (", ".join(f"{kind} {count}" for kind, count in sorted(totals.items())) or "none"))
+        frames_with_io = [frame for frame in self.per_frame if frame > 0]
+        if frames_with_io:
+            worst = max(frames_with_io, key=lambda frame: self.per_frame[frame])
+            lines.append(f"Frames with I/O: {len(frames_with_io)} (worst: frame {worst}, {self.per_frame[worst]} accesses)")
+        turns_with_io = [turn for turn in self.per_turn if turn > 0]
+        if turns_with_io:
+            worst = max(turns_with_io, key=lambda turn: self.per_turn[turn])
+            lines.append(f"Turns with I/O: {len(turns_with_io)} (worst: turn {worst}, {self.per_turn[worst]} accesses)")
+
+        steady = self.steady_state_reads()
+        if steady:
+            lines.append(f"❌ Steady state (after frame {self.startup_frames}): {steady} reads in {len(self.steady)} frames")
+            steady_sites = Counter(key for keys in self.steady.values() for key in keys)
+            for (kind, path, site), count in steady_sites.most_common(TOP_N):
+                lines.append(f"  {count:6d}  {kind:<6} {path:<40} {site}")
+        else:
+            lines.append(f"✅ Steady state (after frame {self.startup_frames}): no data file reads")
+
+        lines.append("")
+        lines.append(f"All accesses (top {TOP_N}):")
+        for (kind, path, site), count in self.events.most_common(TOP_N):
+            lines.append(f"  {count:6d}  {kind:<6} {path:<40} {site}")
+        return "\n".join(lines) + "\n"
+
+    def report_at_exit(self, directory=None):
+        """Print the report and write it to profiles/io_audit_<time>.txt"""
+        text = self.report()
+        print(text)
+        directory = Path(directory or GAME_DIR / 'profiles')
+        path = directory / f"io_audit_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            print(f"💾 I/O audit written: {path}")
+        except Exception as e:
+            print(f"I/O audit write failed: {e}")
+        return path
@@ -1,19 +1,13 @@
 # src/main.py
-import pygame
-import threading
 import time
+# Origin of the startup timeline (--startup-profile), taken before the heavy imports
+_STARTUP_T0 = time.perf_counter()
+import pygame
 import sys
 import json
 import random
 from pathlib import Path
 
-try:
-    import tkinter as tk
-    from tkinter import ttk
-except Exception:
-    tk = None
-    ttk = None
-
 # Internal imports: try package-style (src.*) first, then fall back to direct module imports
 try:
     from src.player import Player
@@ -23,6 +17,17 @@ try:
     from src.save_manager import SaveManager
     from src.shop import Shop
     from src.crafting_system import CraftingSystem
+    from src.zones import select_zone, resolve_zone_for_wave
+    from src.shop_screens import (CHALLENGE_FILTERS, shop_layout, draw_shop,
+                                  challenge_shop_layout, draw_challenge_shop)
+    from src.frame_profiler import FrameProfiler
+    from src.sampling_profiler import SamplingProfiler
+    from src.io_audit import IOAudit
+    from src.frame_watchdog import FrameWatchdog
+    from src.game_log import setup_logging, shutdown_logging
+    from src.startup_profile import StartupTimeline, DeferredTasks
+    from src.audio_bank import get_audio_bank
+    from src.zone_music import ZoneMusic
 except Exception:
     from player import Player
     from enemy import Enemy
@@ -31,12 +36,31 @@ except Exception:
     from save_manager import SaveManager
     from shop import Shop
     from crafting_system import CraftingSystem
+    from zones import select_zone, resolve_zone_for_wave
+    from shop_screens import (CHALLENGE_FILTERS, shop_layout, draw_shop,
+                              challenge_shop_layout, draw_challenge_shop)
+    from frame_profiler import FrameProfiler
+    from sampling_profiler import SamplingProfiler
+    from io_audit import IOAudit
+    from frame_watchdog import FrameWatchdog
+    from game_log import setup_logging, shutdown_logging
+    from startup_profile import StartupTimeline, DeferredTasks
+    from audio_bank import get_audio_bank
+    from zone_music import ZoneMusic
 
 # --- CONFIGURATION DE BASE ---
 BASE_PATH = Path(__file__).resolve().parent.parent
 ASSETS_PATH = BASE_PATH / "assets"
 DATA_PATH = BASE_PATH / "data"
 SAVE_PATH = BASE_PATH / "saves"
+PROFILE_PATH = BASE_PATH / "profiles"
+CACHE_PATH = BASE_PATH / "cache"
+# Startup timeline (printed with --startup-profile) and loads deferred past the first frame
+startup = StartupTimeline.from_argv(sys.argv, start=_STARTUP_T0)
+startup.mark('imports')
+deferred = DeferredTasks(startup)
+# Data-file I/O audit (VL_IO_AUDIT=1): installed before anything is loaded, report at exit
+io_audit = IOAudit.from_env()
 # --- CHARGEMENT DES PARAMÈTRES ---
 def load_json(file_name, default=None):
     """Charge un fichier JSON en toute sécurité"""
@@ -65,69 +89,6 @@ def load_zones():
         print(f"Error loading zones: {e}")
         return []
 
-def select_zone(wave, zones, current_zone=None):
-    """Select a zone based on wave number and spawn chances"""
-    if not zones:
-        return None
-    
-    # Filter zones by minimum wave
-    available_zones = [z for z in zones if z.get('min_wave', 1) <= wave]
-    if not available_zones:
-        return None
-    
-    # For wave 1, always select a starting zone
-    if wave == 1:
-        import random
-        # Prefer zones with min_wave=1
-        starting_zones = [z for z in available_zones if z.get('min_wave', 1) == 1]
-        if starting_zones:
-            total_chance = sum(z.get('spawn_chance', 1) for z in starting_zones)
-            if total_chance > 0:
-                roll = random.random() * total_chance
-                current = 0
-                for zone in starting_zones:
-                    current += zone.get('spawn_chance', 1)
-                    if roll <= current:
-                        return zone
-            return random.choice(starting_zones)
-        return random.choice(available_zones)
-    
-    # Only consider zone changes every 25 waves (not random)
-    if wave % 25 != 0:
-        return current_zone  # Keep current zone
-    
-    # At wave 25, 50, 75, etc., roll for zone change based on spawn_chance
-    import random
-    
-    # Roll for each zone: random() * spawn_chance, pick highest
-    zone_rolls = []
-    for zone in available_zones:
-        spawn_chance = zone.get('spawn_chance', 1)
-        roll = random.random() * spawn_chance
-        zone_rolls.append((roll, zone))
-    
-    # Sort by roll value (highest first)
-    zone_rolls.sort(key=lambda x: x[0], reverse=True)
-    
-    # Get the highest roll
-    highest_roll = zone_rolls[0][0]
-    
-    # Find all zones with the same highest roll (ties)
-    tied_zones = [zone for roll, zone in zone_rolls if roll == highest_roll]
-    
-    # If multiple zones tied, pick randomly between them
-    return random.choice(tied_zones)
-
-def resolve_zone_for_wave(wave, zones):
-    """Resolve a stable zone for the current wave when no saved zone is available."""
-    if not zones:
-        return None
-    eligible = [z for z in zones if z.get('min_wave', 1) <= wave]
-    if not eligible:
-        return None
-    # Pick the zone with the highest min_wave to represent the last unlocked zone.
-    return max(eligible, key=lambda z: z.get('min_wave', 1))
-
 def load_background_for_zone(zone, screen):
     """Load background image for a specific zone"""
     if not zone:
@@ -163,6 +124,8 @@ def load_background_for_zone(zone, screen):
 
 game_settings = load_json("gamesettings.json", {"width": 1280, "height": 720, "title": "MainGame"})
 user_settings = load_json("usersettings.json", {"volume": 0.8, "language": "fr"})
+# Subsystem log levels (usersettings "logging", VL_LOG overrides); output goes through a queue thread
+setup_logging(user_settings.get("logging") if isinstance(user_settings.get("logging"), dict) else None)
 
 # Validate and sanitize settings
 try:
@@ -174,6 +137,7 @@ except (ValueError, TypeError):
     width, height = 1280, 720
 
 title = str(game_settings.get("title", "Vintage Legends"))
+startup.mark('settings')
 
 # --- INITIALISATION PYGAME ---
 pygame.init()
@@ -184,166 +148,48 @@ try:
     pygame.mixer.set_num_channels(16)
 except Exception:
     pass
+# Combat sound effects: decoded once per process, PCM cached on disk (gamesettings: audio_pcm_cache)
+audio_bank = get_audio_bank()
+_game_prefs = user_settings.get("gamesettings", {}) if isinstance(user_settings.get("gamesettings"), dict) else {}
+if _game_prefs.get("audio_pcm_cache", True):
+    audio_bank.cache_dir = CACHE_PATH / "audio"
+# Effects keep their own 0.3/0.6 levels (effects volume multiplier stays 1.0)
+_volumes = user_settings.get("volume", {})
 # Initialize clock early so it's available for character selection
 clock = pygame.time.Clock()
 # Utilisation des paramètres validés
 screen = pygame.display.set_mode((width, height))
 pygame.display.set_caption(title)
-
-def start_music_controller(music_dir, volume=0.2):
-    """Launch a small playlist controller window for background music."""
-    if tk is None:
-        return
-
-    try:
-        volume = float(volume)
-    except Exception:
-        volume = 0.2
-    volume = 0.2
-
-    def run():
-        root = tk.Tk()
-        root.title("Music")
-        root.resizable(False, False)
-        
-        def on_close():
-            pygame.mixer.music.stop()
-            root.destroy()
-        
-        root.protocol("WM_DELETE_WINDOW", on_close)
-
-        try:
-            sw = root.winfo_screenwidth()
-            sh = root.winfo_screenheight()
-            x = max(0, sw - 280)
-            y = max(0, sh // 3)
-            root.geometry(f"260x240+{x}+{y}")
-        except Exception:
-            root.geometry("260x240")
-
-        # Build playlist
-        tracks = []
-        try:
-            if music_dir.exists():
-                for p in sorted(music_dir.iterdir()):
-                    if p.is_file() and p.suffix.lower() in (".ogg", ".mp3", ".wav", ".flac"):
-                        tracks.append(p)
-        except Exception:
-            tracks = []
-
-        current_index = 0
-        paused = False
-
-        def set_status(text):
-            status_var.set(text)
-
-        def load_track(index):
-            nonlocal current_index, paused
-            if not tracks:
-                set_status("No tracks found")
-                return
-            current_index = index % len(tracks)
-            try:
-                if pygame.mixer.get_init() is None:
-                    try:
-                        pygame.mixer.init()
-                    except Exception as e:
-                        set_status(f"Mixer init failed: {e}")
-                        return
-                pygame.mixer.music.load(str(tracks[current_index]))
-                pygame.mixer.music.set_volume(volume)
-                pygame.mixer.music.play()
-                paused = False
-                set_status(f"Playing: {tracks[current_index].stem}")
-                playlist.selection_clear(0, tk.END)
-                playlist.selection_set(current_index)
-                playlist.see(current_index)
-            except Exception as e:
-                set_status(f"Failed to play: {e}")
-
-        def play_pause():
-            nonlocal paused
-            if not tracks:
-                set_status("No tracks found")
-                return
-            if pygame.mixer.get_init() is None:
-                try:
-                    pygame.mixer.init()
-                except Exception as e:
-                    set_status(f"Mixer init failed: {e}")
-                    return
-            if pygame.mixer.music.get_busy() and not paused:
-                pygame.mixer.music.pause()
-                paused = True
-                set_status("Paused")
-            else:
-                if paused:
-                    pygame.mixer.music.unpause()
-                    paused = False
-                    set_status(f"Playing: {tracks[current_index].stem}")
-                else:
-                    load_track(current_index)
-
-        def stop():
-            pygame.mixer.music.stop()
-            set_status("Stopped")
-
-        def next_track():
-            if tracks:
-                load_track(current_index + 1)
-
-        def prev_track():
-            if tracks:
-                load_track(current_index - 1)
-
-        def on_double_click(event):
-            sel = playlist.curselection()
-            if sel:
-                load_track(sel[0])
-
-        title_lbl = ttk.Label(root, text="Music Player", font=("Arial", 10, "bold"))
-        title_lbl.pack(pady=(6, 2))
-
-        status_var = tk.StringVar(value="Ready")
-        status_lbl = ttk.Label(root, textvariable=status_var, font=("Arial", 8))
-        status_lbl.pack(pady=(0, 6))
-
-        playlist = tk.Listbox(root, height=6, width=32)
-        playlist.pack(padx=8, pady=4)
-        for t in tracks:
-            playlist.insert(tk.END, t.stem)
-        playlist.bind("<Double-Button-1>", on_double_click)
-
-        btn_frame = ttk.Frame(root)
-        btn_frame.pack(pady=6)
-
-        ttk.Button(btn_frame, text="Prev", command=prev_track, width=6).grid(row=0, column=0, padx=2)
-        ttk.Button(btn_frame, text="Play/Pause", command=play_pause, width=10).grid(row=0, column=1, padx=2)
-        ttk.Button(btn_frame, text="Next", command=next_track, width=6).grid(row=0, column=2, padx=2)
-        ttk.Button(btn_frame, text="Stop", command=stop, width=6).grid(row=0, column=3, padx=2)
-
-        if not tracks:
-            set_status("No tracks found")
-
-        root.mainloop()
-
-    thread = threading.Thread(target=run, daemon=True)
-    thread.start()
+startup.mark('pygame + display')
 
 # --- ZONES SYSTEM ---
 zones = load_zones()
 current_zone = None
 
 # --- CHARGEMENT DES RESSOURCES ---
-# Prefer an explicit 'flowerfield.png' background if present, otherwise fall back to default_bg.png
-background = load_background_for_zone(None, screen)
+# The first frame needs the zone's background; the default one is only
+# decoded when no zone background replaces it (character select, zoneless saves)
+background = None
+startup.mark('zones')
+
+# Zone music: streamed per-zone tracks ("music" in zones.json), crossfaded on zone change
+try:
+    _music_volume = float(_volumes.get("music", 0.8) if isinstance(_volumes, dict) else _volumes)
+except (ValueError, TypeError):
+    _music_volume = 0.8
+zone_music = ZoneMusic(ASSETS_PATH / "sounds" / "music", volume=_music_volume)
+
+# Exemple de personnage (decoded after the first frame; drawn once loaded)
+player_sprite = None
+
 
-# Music controller removed - zone themes now configured in zones.json
-# start_music_controller(ASSETS_PATH / "sounds" / "music", volume=user_settings.get("volume", 0.8))
+def load_player_sprite():
+    global player_sprite
+    mage_path = ASSETS_PATH / "images" / "characters" / "mage.png"
+    player_sprite = pygame.image.load(mage_path).convert_alpha() if mage_path.exists() else None
 
-# Exemple de personnage
-mage_path = ASSETS_PATH / "images" / "characters" / "mage.png"
-player_sprite = pygame.image.load(mage_path).convert_alpha() if mage_path.exists() else None
+
+deferred.add('player sprite', load_player_sprite)
 
 # --- CHARACTER SELECTION ---
 def choose_character(screen, background, data_path, assets_path):
@@ -480,6 +326,7 @@ def choose_character(screen, background, data_path, assets_path):
 # --- INITIALISATION DU JEU : load save or show chooser ---
 save_manager = SaveManager(SAVE_PATH)
 saved = save_manager.load()
+startup.mark('save load')
 
 if saved:
     # Reconstruct a player from saved data and restore persistent fields
@@ -641,7 +488,10 @@ if saved:
             pass
 else:
     # No save — show chooser and create a fresh player
+    # Prefer an explicit 'flowerfield.png' background if present, otherwise fall back to default_bg.png
+    background = load_background_for_zone(None, screen)
     player_template = choose_character(screen, background, DATA_PATH, ASSETS_PATH)
+    startup.mark('character select (waits for the player)')
     # map chosen template back to an id if possible
     try:
         chs = load_json('characters.json', {}).get('characters', [])
@@ -683,16 +533,64 @@ else:
             background = load_background_for_zone(starting_zone, screen)
             print(f"🗺️ Starting in zone: {starting_zone.get('name', 'Unknown')}")
 
-# Create shared instances
-shop = Shop(DATA_PATH)
-crafting_system = CraftingSystem(DATA_PATH)
+if background is None:
+    background = load_background_for_zone(None, screen)
+startup.mark('player + battle + background')
+
+# Shared instances, loaded after the first frame (or on first use)
+shop = None
+crafting_system = None
+
+
+def get_shop():
+    global shop
+    if shop is None:
+        shop = Shop(DATA_PATH)
+    return shop
+
+
+def get_crafting_system():
+    global crafting_system
+    if crafting_system is None:
+        crafting_system = CraftingSystem(DATA_PATH)
+    return crafting_system
+
 
+deferred.add('shop', get_shop)
 # Attach crafting system to battle so UI can access it
-battle.crafting_system = crafting_system
+deferred.add('crafting', lambda: setattr(battle, 'crafting_system', get_crafting_system()))
+
+# Frame-phase profiler overlay (F3 or the `profiler` console command)
+frame_profiler = FrameProfiler()
+# Stack sampler for live sessions (`prof start [interval_ms]` / `prof stop`)
+sampling_profiler = SamplingProfiler()
 
 # Create UI after battle is set up
 ui = UIManager(screen, assets_path=ASSETS_PATH, data_path=DATA_PATH)
 ui.set_actions(battle)
+startup.mark('ui')
+# Combat sound effects are decoded after the first frame (or on first use)
+deferred.add('sound effects', lambda: battle.sounds is None and battle.load_sounds())
+
+# Slow-frame watchdog: logs overrunning frames with the main thread's stack
+# to profiles/slow_frames.log (usersettings: frame_watchdog, frame_budget_ms)
+_perf_settings = user_settings.get("gamesettings", {}) if isinstance(user_settings.get("gamesettings"), dict) else {}
+try:
+    _frame_budget_ms = max(1.0, float(_perf_settings.get("frame_budget_ms", 16.6)))
+except (ValueError, TypeError):
+    _frame_budget_ms = 16.6
+frame_watchdog = FrameWatchdog(
+    _frame_budget_ms,
+    log_path=PROFILE_PATH / "slow_frames.log",
+    context=lambda: {'wave': getattr(battle, 'wave', 0),
+                     'modal': 'shop' if getattr(battle, 'in_shop', False) else ui.open_modal()},
+)
+
+
+def mark_phase(phase):
+    """End of a main-loop phase, for the profiler overlay and the watchdog"""
+    frame_profiler.mark(phase)
+    frame_watchdog.mark(phase)
 
 # --- BOUCLE PRINCIPALE ---
 def main():
@@ -704,13 +602,24 @@ def main():
     console_text = ""
     # Auto-save tracking
     last_autosave_wave = 0
+    # Journal tracking (cheap delta save after each wave between autosaves)
+    last_journal_wave = getattr(battle, 'wave', 0)
     # Zone change tracking
     last_zone_check_wave = 0
+    if _perf_settings.get("frame_watchdog", True):
+        frame_watchdog.start()
     while running:
+        frame_profiler.begin_frame(wave=getattr(battle, 'wave', 0))
+        frame_watchdog.begin_frame()
+        io_audit.begin_frame((getattr(battle, 'wave', 0), getattr(battle, 'turn', None)))
         # --- ÉVÉNEMENTS ---
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            # Toggle the frame profiler overlay with F3
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                frame_profiler.toggle()
+                continue
             # Toggle developer console with backquote (`)
             if event.type == pygame.KEYDOWN and event.key == pygame.K_BACKQUOTE:
                 console_open = not console_open
@@ -753,6 +662,46 @@ def main():
                                     pass
                             except Exception as e:
                                 print('reset_challenges failed', e)
+                        elif cmd.split()[:1] in (['ff'], ['fast_forward']) and not battle.in_shop:
+                            # Auto-resolve waves (default 100), only the summary reaches the UI
+                            try:
+                                parts = cmd.split()
+                                waves = int(parts[1]) if len(parts) > 1 else 100
+                                old_zone = battle.current_zone
+                                summary = battle.fast_forward(waves, zones=zones, shop=get_shop())
+                                if battle.current_zone is not old_zone:
+                                    background = load_background_for_zone(battle.current_zone, screen)
+                                # Zone rolls for the skipped waves already happened
+                                last_zone_check_wave = battle.wave
+                                print(f"⏩ {summary['waves_cleared']} vagues en {summary['elapsed'] * 1000:.0f} ms "
+                                      f"(+{summary['gold']} or, +{summary['xp']} XP, +{summary['levels']} niveaux)")
+                            except Exception as e:
+                                print('fast_forward failed', e)
+                        elif cmd.split()[:1] == ['profiler']:
+                            # `profiler` toggles the overlay, `profiler csv [path]` exports the session
+                            parts = cmd.split()
+                            if len(parts) > 1 and parts[1] == 'csv':
+                                try:
+                                    path = parts[2] if len(parts) > 2 else frame_profiler.default_csv_path(PROFILE_PATH)
+                                    frame_profiler.export_csv(path)
+                                except Exception as e:
+                                    print('profiler export failed', e)
+                            else:
+                                frame_profiler.toggle()
+                        elif cmd.split()[:1] == ['prof']:
+                            # `prof start [interval_ms]` samples the game loop, `prof stop` writes
+                            # profiles/profile_<time>.folded (flamegraph) and .txt (top functions)
+                            parts = cmd.split()
+                            try:
+                                if parts[1:2] == ['start']:
+                                    interval = float(parts[2]) / 1000.0 if len(parts) > 2 else None
+                                    sampling_profiler.start(interval)
+                                elif parts[1:2] == ['stop'] and sampling_profiler.running:
+                                    sampling_profiler.stop()
+                                    sampling_profiler.write(PROFILE_PATH)
+                                    battle.damage_events.append({'type': 'note', 'msg': 'Profile saved', 'time': time.time()})
+                            except Exception as e:
+                                print('prof failed', e)
                         # close console after executing
                         console_open = False
                         console_text = ""
@@ -767,10 +716,13 @@ def main():
                 continue
 
             ui.handle_event(event)
+        mark_phase('events')
 
         # --- MISE À JOUR ---
         battle.update()
+        mark_phase('battle.update')
         ui.update(player, battle)
+        mark_phase('ui.update')
         
         # Check for zone changes every 25 waves (only once when wave changes)
         try:
@@ -797,6 +749,11 @@ def main():
                 last_zone_check_wave = current_wave
         except Exception as e:
             print(f"Zone change error: {e}")
+        # Follow the zone with its music (fades are stepped here, never blocking)
+        try:
+            zone_music.update(battle.current_zone)
+        except Exception as e:
+            print(f"Zone music error: {e}")
         
         # Auto-save every 10 waves (on wave completion, not during combat)
         try:
@@ -813,9 +770,18 @@ def main():
         except Exception as e:
             print(f"Auto-save error: {e}")
 
+        # Journal gold/xp/loot deltas once per wave so a crash loses at most one wave
+        try:
+            current_wave = getattr(battle, 'wave', 0)
+            if current_wave != last_journal_wave:
+                save_manager.append_journal(player, battle=battle)
+                last_journal_wave = current_wave
+        except Exception as e:
+            print(f"Journal error: {e}")
+
         # If battle indicates a shop wave, open shop modal before spawning next enemy
         if getattr(battle, 'in_shop', False):
-            offers = shop.get_offers_for_wave(
+            offers = get_shop().get_offers_for_wave(
                 battle.wave,
                 player_seed=getattr(player, 'game_seed', None),
                 cumulative_increase=getattr(player, 'cumulative_price_increase', 0.0),
@@ -825,25 +791,21 @@ def main():
             shop_open = True
             shop_page = 0
             shop_tab = "items"  # "items" or "stats"
-            items_per_page = 4
+            shop_ui = shop_layout(width, height)
+            items_per_page = shop_ui['items_per_page']
             total_pages = max(1, (len(offers) + items_per_page - 1) // items_per_page)
-            title_font = pygame.font.Font(None, 48)
-            sf = pygame.font.Font(None, 32)
-            small_font = pygame.font.Font(None, 26)
-            # Larger panel layout centered
-            panel_w, panel_h = 700, 520
-            panel_x = (width - panel_w) // 2
-            panel_y = (height - panel_h) // 2
-            close_rect = pygame.Rect(panel_x + panel_w - 90, panel_y + 10, 80, 40)
+            panel_x, panel_y, panel_w = shop_ui['panel_x'], shop_ui['panel_y'], shop_ui['panel_w']
+            close_rect = shop_ui['close_rect']
             # Tab buttons
-            items_tab_rect = pygame.Rect(panel_x + 20, panel_y + 70, 120, 35)
-            stats_tab_rect = pygame.Rect(panel_x + 150, panel_y + 70, 120, 35)
-            prev_page_rect = pygame.Rect(panel_x + 30, panel_y + panel_h - 60, 120, 45)
-            next_page_rect = pygame.Rect(panel_x + panel_w - 150, panel_y + panel_h - 60, 120, 45)
+            items_tab_rect = shop_ui['items_tab_rect']
+            stats_tab_rect = shop_ui['stats_tab_rect']
+            prev_page_rect = shop_ui['prev_page_rect']
+            next_page_rect = shop_ui['next_page_rect']
             # Track mouse position for hover tooltips
             hover_item = None
 
             while shop_open:
+                frame_watchdog.begin_frame('shop')
                 # Get mouse position for hover detection
                 mx, my = pygame.mouse.get_pos()
                 hover_item = None
@@ -877,17 +839,8 @@ def main():
                                 item_y = panel_y + 120 + page_idx * 95
                                 buy_rect = pygame.Rect(panel_x + panel_w - 140, item_y + 30, 110, 50)
                                 if buy_rect.collidepoint((mx, my)):
-                                    cost = item.get('_final_cost', item.get('cost', 0))
-                                    if player.gold >= cost:
-                                        player.gold -= cost
-                                        # Track shop statistics
-                                        player.total_gold_spent = getattr(player, 'total_gold_spent', 0) + cost
-                                        player.total_items_bought = getattr(player, 'total_items_bought', 0) + 1
-                                        # remove _final_cost before adding to inventory
-                                        itm = {k: v for k, v in item.items() if not k.startswith('_')}
-                                        # Purchases should go to inventory only and NOT auto-equip to avoid duplication
-                                        player.add_item(itm, auto_equip=False)
-                                    else:
+                                    # Purchases go to inventory only and do NOT auto-equip to avoid duplication
+                                    if not player.buy_item(item):
                                         print("Not enough gold")
                     if ev.type == pygame.KEYDOWN and ev.key == pygame.K_ESCAPE:
                         shop_open = False
@@ -895,226 +848,9 @@ def main():
                 screen.blit(background, (0, 0))
                 ui.draw(player, battle)
 
-                # Draw shop panel with border and shadow effect
-                shadow_offset = 5
-                pygame.draw.rect(screen, (10, 10, 15), (panel_x + shadow_offset, panel_y + shadow_offset, panel_w, panel_h), border_radius=10)
-                pygame.draw.rect(screen, (35, 35, 50), (panel_x, panel_y, panel_w, panel_h), border_radius=10)
-                pygame.draw.rect(screen, (80, 80, 120), (panel_x, panel_y, panel_w, panel_h), width=3, border_radius=10)
-                
-                # Title with background
-                title_bg = pygame.Rect(panel_x, panel_y, panel_w, 65)
-                pygame.draw.rect(screen, (50, 50, 70), title_bg, border_top_left_radius=10, border_top_right_radius=10)
-                title = title_font.render(f"Shop - Wave {battle.wave}", True, (255, 255, 100))
-                screen.blit(title, (panel_x + 20, panel_y + 15))
-                
-                # Close button
-                pygame.draw.rect(screen, (220, 80, 80), close_rect, border_radius=8)
-                pygame.draw.rect(screen, (255, 120, 120), close_rect, width=2, border_radius=8)
-                cr = sf.render("Close", True, (255, 255, 255))
-                screen.blit(cr, cr.get_rect(center=close_rect.center))
-                
-                # Tab buttons
-                items_tab_color = (70, 120, 180) if shop_tab == "items" else (50, 50, 70)
-                stats_tab_color = (70, 120, 180) if shop_tab == "stats" else (50, 50, 70)
-                pygame.draw.rect(screen, items_tab_color, items_tab_rect, border_radius=6)
-                pygame.draw.rect(screen, stats_tab_color, stats_tab_rect, border_radius=6)
-                if shop_tab == "items":
-                    pygame.draw.rect(screen, (100, 160, 220), items_tab_rect, width=2, border_radius=6)
-                else:
-                    pygame.draw.rect(screen, (100, 160, 220), stats_tab_rect, width=2, border_radius=6)
-                items_text = small_font.render("Items", True, (255, 255, 255))
-                stats_text = small_font.render("Shop Stats", True, (255, 255, 255))
-                screen.blit(items_text, items_text.get_rect(center=items_tab_rect.center))
-                screen.blit(stats_text, stats_text.get_rect(center=stats_tab_rect.center))
-                
-                # Conditional rendering based on active tab
-                if shop_tab == "items":
-                    # Player gold display
-                    gold_bg = pygame.Rect(panel_x + panel_w - 200, panel_y + 70, 180, 35)
-                    pygame.draw.rect(screen, (40, 40, 55), gold_bg, border_radius=6)
-                    pygame.draw.rect(screen, (255, 215, 0), gold_bg, width=2, border_radius=6)
-                    gold_text = small_font.render(f"Gold: {player.gold}g", True, (255, 215, 0))
-                    screen.blit(gold_text, (panel_x + panel_w - 190, panel_y + 77))
-
-                    # Display current page items
-                    start_idx = shop_page * items_per_page
-                    end_idx = min(start_idx + items_per_page, len(offers))
-                    page_offers = offers[start_idx:end_idx]
-                    
-                    for idx, item in enumerate(page_offers):
-                        item_y = panel_y + 120 + idx * 95
-                        item_h = 85
-                        item_rect = pygame.Rect(panel_x + 20, item_y, panel_w - 40, item_h)
-                        
-                        # Check if mouse is hovering over this item (but not over pagination buttons)
-                        is_hovering = item_rect.collidepoint((mx, my))
-                        # Don't show tooltip if hovering over pagination buttons
-                        if prev_page_rect.collidepoint((mx, my)) or next_page_rect.collidepoint((mx, my)):
-                            is_hovering = False
-                        if is_hovering:
-                            hover_item = item
-                        
-                        # Item background with hover effect
-                        bg_color = (60, 70, 90) if is_hovering else (45, 50, 65)
-                        pygame.draw.rect(screen, bg_color, item_rect, border_radius=8)
-                        pygame.draw.rect(screen, (100, 110, 140), item_rect, width=2, border_radius=8)
-                        
-                        # Icon with larger size
-                        icon_size = 64
-                        icon_rect = pygame.Rect(panel_x + 30, item_y + 10, icon_size, icon_size)
-                        icon_path = ASSETS_PATH / 'images' / 'items' / f"{item.get('id')}.png"
-                        if icon_path.exists():
-                            try:
-                                ico = pygame.image.load(str(icon_path)).convert_alpha()
-                                ico = pygame.transform.smoothscale(ico, (icon_size, icon_size))
-                                screen.blit(ico, icon_rect)
-                            except:
-                                # Draw placeholder if image fails to load
-                                pygame.draw.rect(screen, (80, 80, 100), icon_rect, border_radius=4)
-                        else:
-                            # Draw placeholder box for missing icon
-                            pygame.draw.rect(screen, (80, 80, 100), icon_rect, border_radius=4)
-                        
-                        # Item name (full, no truncation)
-                        name = item.get('name', item.get('id'))
-                        name_surf = sf.render(name, True, (255, 255, 255))
-                        screen.blit(name_surf, (panel_x + 110, item_y + 12))
-                        
-                        # Item type/description on second line
-                        item_type = item.get('type', '').capitalize()
-                        desc = item.get('desc', '')
-                        if item_type:
-                            type_surf = small_font.render(f"[{item_type}]", True, (150, 200, 255))
-                            screen.blit(type_surf, (panel_x + 110, item_y + 42))
-                        
-                        # Price with larger font
-                        price = item.get('_final_cost', item.get('cost', 0))
-                        price_color = (100, 255, 100) if player.gold >= price else (255, 100, 100)
-                        price_surf = sf.render(f"{price}g", True, price_color)
-                        price_x = panel_x + panel_w - 270
-                        screen.blit(price_surf, (price_x, item_y + 25))
-                        
-                        # Buy button with better styling
-                        buy_rect = pygame.Rect(panel_x + panel_w - 140, item_y + 17, 110, 50)
-                        can_afford = player.gold >= price
-                        button_color = (80, 180, 80) if can_afford else (100, 100, 100)
-                        pygame.draw.rect(screen, button_color, buy_rect, border_radius=8)
-                        if can_afford:
-                            pygame.draw.rect(screen, (120, 220, 120), buy_rect, width=2, border_radius=8)
-                        bt = sf.render("Buy", True, (255, 255, 255) if can_afford else (150, 150, 150))
-                        screen.blit(bt, bt.get_rect(center=buy_rect.center))
-                    
-                    # Draw hover tooltip if hovering over an item
-                    if hover_item:
-                        tooltip_w, tooltip_h = 350, 200
-                        tooltip_x = min(mx + 20, width - tooltip_w - 10)
-                        tooltip_y = min(my + 20, height - tooltip_h - 10)
-                        
-                        # Tooltip background with shadow
-                        pygame.draw.rect(screen, (10, 10, 15), (tooltip_x + 3, tooltip_y + 3, tooltip_w, tooltip_h), border_radius=8)
-                        pygame.draw.rect(screen, (25, 25, 40), (tooltip_x, tooltip_y, tooltip_w, tooltip_h), border_radius=8)
-                        pygame.draw.rect(screen, (120, 120, 180), (tooltip_x, tooltip_y, tooltip_w, tooltip_h), width=2, border_radius=8)
-                        
-                        # Tooltip content
-                        ty = tooltip_y + 10
-                        tip_name = small_font.render(hover_item.get('name', ''), True, (255, 255, 100))
-                        screen.blit(tip_name, (tooltip_x + 10, ty))
-                        ty += 30
-                        
-                        # Description
-                        desc = hover_item.get('desc', 'No description')
-                        # Word wrap description
-                        words = desc.split()
-                        lines = []
-                        current_line = ""
-                        for word in words:
-                            test_line = current_line + (" " if current_line else "") + word
-                            if small_font.size(test_line)[0] < tooltip_w - 20:
-                                current_line = test_line
-                            else:
-                                if current_line:
-                                    lines.append(current_line)
-                                current_line = word
-                        if current_line:
-                            lines.append(current_line)
-                        
-                        for line in lines[:3]:  # Max 3 lines
-                            desc_surf = small_font.render(line, True, (200, 200, 200))
-                            screen.blit(desc_surf, (tooltip_x + 10, ty))
-                            ty += 25
-                        
-                        ty += 5
-                        # Stats display
-                        stats = []
-                        if hover_item.get('attack'): stats.append(f"Attack: +{hover_item['attack']}")
-                        if hover_item.get('defense'): stats.append(f"Defense: +{hover_item['defense']}")
-                        if hover_item.get('hp'): stats.append(f"HP: +{hover_item['hp']}")
-                        if hover_item.get('max_hp'): stats.append(f"Max HP: +{hover_item['max_hp']}")
-                        if hover_item.get('critchance'): stats.append(f"Crit: +{int(hover_item['critchance']*100)}%")
-                        if hover_item.get('critdamage'): stats.append(f"Crit Dmg: +{hover_item['critdamage']}x")
-                        if hover_item.get('penetration'): stats.append(f"Pen: +{hover_item['penetration']}")
-                        
-                        # Magic stats
-                        if hover_item.get('magic_power'): stats.append(f"Magic Power: +{hover_item['magic_power']}")
-                        if hover_item.get('magic_penetration'): stats.append(f"Magic Pen: +{hover_item['magic_penetration']}")
-                        if hover_item.get('max_mana'): stats.append(f"Max Mana: +{hover_item['max_mana']}")
-                        if hover_item.get('mana_regen'): stats.append(f"Mana Regen: +{hover_item['mana_regen']}")
-                        
-                        for stat_text in stats:
-                            stat_surf = small_font.render(stat_text, True, (150, 255, 150))
-                            screen.blit(stat_surf, (tooltip_x + 10, ty))
-                            ty += 25
-                    
-                    # Pagination buttons at bottom (only for items tab)
-                    if shop_page > 0:
-                        pygame.draw.rect(screen, (80, 120, 200), prev_page_rect, border_radius=8)
-                    else:
-                        pygame.draw.rect(screen, (50, 50, 70), prev_page_rect, border_radius=8)
-                    prev_text = sf.render("< Prev", True, (255, 255, 255) if shop_page > 0 else (120, 120, 120))
-                    screen.blit(prev_text, prev_text.get_rect(center=prev_page_rect.center))
-
-                    if shop_page < total_pages - 1:
-                        pygame.draw.rect(screen, (80, 120, 200), next_page_rect, border_radius=8)
-                    else:
-                        pygame.draw.rect(screen, (50, 50, 70), next_page_rect, border_radius=8)
-                    next_text = sf.render("Next >", True, (255, 255, 255) if shop_page < total_pages - 1 else (120, 120, 120))
-                    screen.blit(next_text, next_text.get_rect(center=next_page_rect.center))
-
-                    # Page indicator
-                    page_text = sf.render(f"Page {shop_page + 1}/{total_pages}", True, (200, 200, 220))
-                    screen.blit(page_text, page_text.get_rect(center=(panel_x + panel_w // 2, panel_y + panel_h - 35)))
-                
-                elif shop_tab == "stats":
-                    # Shop Stats Tab - display shop statistics
-                    stats_y = panel_y + 130
-                    line_height = 40
-                    
-                    # Display various shop statistics
-                    stats_data = [
-                        ("Game Seed:", str(getattr(player, 'game_seed', 'N/A'))),
-                        ("Total Items Bought:", str(getattr(player, 'total_items_bought', 0))),
-                        ("Total Gold Spent:", f"{getattr(player, 'total_gold_spent', 0)}g"),
-                        ("Current Gold:", f"{player.gold}g"),
-                        ("Price Increase:", f"+{getattr(player, 'cumulative_price_increase', 0.0) * 100:.1f}%"),
-                        ("Current Wave:", str(battle.wave)),
-                        ("Highest Wave:", str(getattr(player, 'highest_wave', 0))),
-                    ]
-                    
-                    for label, value in stats_data:
-                        # Label
-                        label_surf = sf.render(label, True, (180, 180, 200))
-                        screen.blit(label_surf, (panel_x + 50, stats_y))
-                        # Value
-                        value_surf = sf.render(value, True, (255, 255, 100))
-                        screen.blit(value_surf, (panel_x + 350, stats_y))
-                        stats_y += line_height
-                    
-                    # Additional info
-                    info_y = stats_y + 20
-                    info_text = small_font.render("Prices increase by 1-15% per wave (seeded)", True, (150, 150, 170))
-                    screen.blit(info_text, (panel_x + 50, info_y))
-
+                hover_item = draw_shop(screen, player, battle, offers, shop_tab, shop_page, (mx, my), shop_ui)
                 pygame.display.flip()
+                frame_watchdog.end_frame()
                 clock.tick(30)
 
             # After shop closed, spawn next enemy for the new wave
@@ -1128,6 +864,8 @@ def main():
             battle.enemy_hit_time = 0
             battle.turn = 'player'
 
+        mark_phase('other')
+
         # --- AFFICHAGE ---
         screen.blit(background, (0, 0))
         
@@ -1245,10 +983,24 @@ def main():
                 screen.blit(mana_shadow, (mana_text_rect.x + 1, mana_text_rect.y + 1))
                 screen.blit(mana_text, mana_text_rect)
         
+        mark_phase('sprites')
+        # Crafting panel opened before its deferred load: load the recipes now
+        if ui.crafting_ui_open and getattr(battle, 'crafting_system', None) is None:
+            battle.crafting_system = get_crafting_system()
         ui.draw(player, battle)
+        mark_phase('ui.draw')
+        frame_profiler.draw(screen)
+        mark_phase('overlay')
         pygame.display.flip()
+        mark_phase('flip')
+        frame_watchdog.end_frame()
+        startup.first_frame()
 
         clock.tick(60)  # Limite à 60 FPS
+        mark_phase('tick')
+        # Non-critical loads, one per frame once the game is on screen
+        if not deferred.run_next():
+            startup.finish(PROFILE_PATH)
         # Vérification de la condition de mort
         if player.is_dead():
             # Interactive Game Over modal: show highest wave and Retry/Quit
@@ -1281,22 +1033,14 @@ def main():
                             # load upgrades
                             up_defs = load_json('upgrades.json', {'upgrades': []}).get('upgrades', [])
                             # modal geometry
-                            mw, mh = 560, 420
-                            mx0 = width//2 - mw//2
-                            my0 = height//2 - mh//2
-                            # precompute static rects for buttons
-                            close_c_rect = pygame.Rect(mx0 + mw - 90, my0 + mh - 44, 80, 32)
+                            challenge_ui = challenge_shop_layout(width, height)
+                            mw, mx0, my0 = challenge_ui['mw'], challenge_ui['mx0'], challenge_ui['my0']
+                            close_c_rect = challenge_ui['close_rect']
                             # filter + scroll state
                             challenge_filter = 'all'
                             scroll_offset = 0
-                            visible_count = 5
-                            filter_buttons = [
-                                ('all', 'ALL'),
-                                ('offense', 'OFFENSE'),
-                                ('defense', 'DEFENSE'),
-                                ('magic', 'MAGIC'),
-                                ('utility', 'UTILITY'),
-                            ]
+                            visible_count = challenge_ui['visible_count']
+                            filter_buttons = CHALLENGE_FILTERS
                             # enter modal loop
                             while open_challenge_shop:
                                 for ce in pygame.event.get():
@@ -1363,72 +1107,7 @@ def main():
                                 # draw challenge shop
                                 screen.blit(background, (0,0))
                                 ui.draw(player, battle)
-                                pygame.draw.rect(screen, (30,30,40), (mx0, my0, mw, mh))
-                                title = pygame.font.Font(None, 40).render('Challenge Shop', True, (255,255,255))
-                                screen.blit(title, (mx0 + 16, my0 + 12))
-                                # coin count
-                                coin_t = pygame.font.Font(None, 28).render(f'Coins: {player.challenge_coins}', True, (255,215,0))
-                                screen.blit(coin_t, (mx0 + 16, my0 + 56))
-                                # filter buttons
-                                fbx = mx0 + 16
-                                fby = my0 + 86
-                                fbw = 90
-                                fbh = 26
-                                fbgap = 8
-                                for i, (fkey, flabel) in enumerate(filter_buttons):
-                                    frect = pygame.Rect(fbx + i * (fbw + fbgap), fby, fbw, fbh)
-                                    active = (challenge_filter == fkey)
-                                    fcolor = (90, 120, 180) if active else (60, 60, 80)
-                                    pygame.draw.rect(screen, fcolor, frect, border_radius=6)
-                                    pygame.draw.rect(screen, (160, 160, 200), frect, 2, border_radius=6)
-                                    ftext = pygame.font.Font(None, 20).render(flabel, True, (255,255,255))
-                                    screen.blit(ftext, ftext.get_rect(center=frect.center))
-
-                                # list upgrades (filtered + paged)
-                                if challenge_filter == 'all':
-                                    filtered_defs = up_defs
-                                else:
-                                    filtered_defs = [u for u in up_defs if u.get('category') == challenge_filter]
-                                max_scroll = max(0, len(filtered_defs) - visible_count)
-                                scroll_offset = max(0, min(scroll_offset, max_scroll))
-                                visible_defs = filtered_defs[scroll_offset:scroll_offset + visible_count]
-
-                                for i, u in enumerate(visible_defs):
-                                    uy = my0 + 120 + i * 56
-                                    name = u.get('name')
-                                    desc = u.get('desc', '')
-                                    cur = player.permanent_upgrades.get(u.get('id'), 0)
-                                    lvl = pygame.font.Font(None, 26).render(f"{name} (Lv {cur})", True, (220,220,220))
-                                    screen.blit(lvl, (mx0 + 16, uy))
-                                    if desc:
-                                        desc_text = pygame.font.Font(None, 20).render(desc[:38], True, (160,160,180))
-                                        screen.blit(desc_text, (mx0 + 16, uy + 24))
-                                    # cost and buy - dynamic cost based on current level
-                                    base_cost = int(u.get('cost', 1))
-                                    dynamic_cost = base_cost * (cur + 1)
-                                    cost_t = pygame.font.Font(None, 24).render(f"{dynamic_cost}c", True, (255,215,0))
-                                    screen.blit(cost_t, (mx0 + 360, uy))
-                                    buy_rect = pygame.Rect(mx0 + 420, uy, 100, 40)
-                                    # Gray out button if can't afford or at max level
-                                    can_buy = player.challenge_coins >= dynamic_cost and cur < int(u.get('max_level', 99))
-                                    btn_color = (80,160,80) if can_buy else (100,100,100)
-                                    pygame.draw.rect(screen, btn_color, buy_rect, border_radius=6)
-                                    bt = pygame.font.Font(None, 28).render('Buy', True, (255,255,255) if can_buy else (150,150,150))
-                                    screen.blit(bt, bt.get_rect(center=buy_rect.center))
-
-                                # scroll buttons
-                                up_rect = pygame.Rect(mx0 + mw - 50, my0 + 100, 30, 30)
-                                down_rect = pygame.Rect(mx0 + mw - 50, my0 + 100 + (visible_count * 56) - 10, 30, 30)
-                                pygame.draw.rect(screen, (80, 80, 100), up_rect, border_radius=4)
-                                pygame.draw.rect(screen, (80, 80, 100), down_rect, border_radius=4)
-                                up_t = pygame.font.Font(None, 26).render('^', True, (255,255,255))
-                                down_t = pygame.font.Font(None, 26).render('v', True, (255,255,255))
-                                screen.blit(up_t, up_t.get_rect(center=up_rect.center))
-                                screen.blit(down_t, down_t.get_rect(center=down_rect.center))
-                                # close button
-                                pygame.draw.rect(screen, (200,80,80), close_c_rect, border_radius=6)
-                                ct = pygame.font.Font(None, 28).render('Close', True, (0,0,0))
-                                screen.blit(ct, ct.get_rect(center=close_c_rect.center))
+                                scroll_offset = draw_challenge_shop(screen, player, up_defs, challenge_filter, scroll_offset, challenge_ui)
                                 pygame.display.flip()
                                 clock.tick(30)
                             # end challenge shop
@@ -1470,8 +1149,14 @@ def main():
                             else:
                                 battle.current_zone = None
                                 background = load_background_for_zone(None, screen)
-                            battle.crafting_system = crafting_system  # Attach crafting system
+                            battle.crafting_system = get_crafting_system()  # Attach crafting system
                             ui.set_actions(battle)
+                            # New run gets its own snapshot so journal deltas apply to it
+                            try:
+                                save_manager.save(player, battle=battle)
+                            except Exception:
+                                pass
+                            last_journal_wave = battle.wave
                             game_over = False
                             break
                         if quit_rect.collidepoint((mx, my)):
@@ -1564,7 +1249,15 @@ def main():
             # After retry, continue main loop with new player/battle
             continue
 
+    frame_watchdog.stop()
     pygame.quit()
+    # Don't lose a profile that is still running when the window closes
+    if sampling_profiler.running:
+        try:
+            sampling_profiler.stop()
+            sampling_profiler.write(PROFILE_PATH)
+        except Exception as e:
+            print(f"Profile write failed: {e}")
     try:
         # Only save if player has reasonable HP (not dead or nearly dead)
         if player.hp > 0 and player.max_hp > 0:
@@ -1577,6 +1270,7 @@ def main():
     except Exception:
         pass
     print("👋 Jeu fermé proprement.")
+    shutdown_logging()
     sys.exit()
 
 
@@ -1,7 +1,89 @@
 # src/player.py
 from pathlib import Path
+from bisect import bisect_right
 import json
 
+try:
+    from effects import get_item_templates
+    from elements import bonus_vector
+    from skill_index import get_skill_index, skills_for_levels, skills_for_item
+    from game_log import get_logger
+except Exception:
+    from .effects import get_item_templates
+    from .elements import bonus_vector
+    from .skill_index import get_skill_index, skills_for_levels, skills_for_item
+    from .game_log import get_logger
+
+log = get_logger('player')
+item_log = get_logger('items')
+skill_log = get_logger('skills')
+
+# Log labels for consumable stat boosts
+BOOST_LABELS = {'atk': 'Attack', 'def': 'Defense', 'magic_power': 'Magic power'}
+
+
+def xp_required_for(level):
+    """XP needed to go from `level` to `level + 1` (level^1.5 * 100)"""
+    return int((level ** 1.5) * 100)
+
+
+# _xp_cumulative[i] = total XP needed to go from level 1 to level i + 1 (grown on demand)
+_xp_cumulative = [0]
+
+
+def _grow_xp_table(levels=0, total_xp=-1):
+    """Extend the cumulative table to at least `levels` entries and past total_xp"""
+    table = _xp_cumulative
+    while len(table) < levels or table[-1] <= total_xp:
+        table.append(table[-1] + xp_required_for(len(table)))
+    return table
+
+
+def total_xp_for_level(level):
+    """Total XP needed to reach `level` from level 1"""
+    return _grow_xp_table(levels=level)[level - 1]
+
+
+def level_for_total_xp(total_xp):
+    """(level, xp into that level) for a total XP amount earned since level 1"""
+    table = _grow_xp_table(total_xp=total_xp)
+    level = bisect_right(table, total_xp)
+    return level, total_xp - table[level - 1]
+
+
+# Parsed items.json indexed by id, reloaded only if the file changes on disk
+_item_data = {'mtime': None, 'by_id': {}}
+
+
+def _items_by_id():
+    """item id -> item dict (first definition wins, like a linear scan)"""
+    try:
+        items_path = Path(__file__).resolve().parents[1] / 'data' / 'items.json'
+        mtime = items_path.stat().st_mtime
+        if _item_data['mtime'] != mtime:
+            with open(items_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            by_id = {}
+            for it in data.get('items', []):
+                by_id.setdefault(it.get('id'), it)
+            _item_data['by_id'] = by_id
+            _item_data['mtime'] = mtime
+    except Exception:
+        return {}
+    return _item_data['by_id']
+
+
+def _roll_hits(chance, trials, rng):
+    """How many of `trials` independent rolls succeed (binomial draw)"""
+    if trials <= 0 or chance <= 0:
+        return 0
+    if chance >= 1:
+        return trials
+    binomial = getattr(rng, 'binomialvariate', None)  # Python 3.12+
+    if binomial is not None:
+        return binomial(trials, chance)
+    return sum(1 for _ in range(trials) if rng.random() < chance)
+
 
 class Player:
     def __init__(self, data):
@@ -107,6 +189,10 @@ class Player:
         if not isinstance(self.skills, list):
             self.skills = []
         
+        # Skills from skills.json the player doesn't know yet (see get_unowned_skills)
+        self._unowned_skills = None
+        self._unowned_key = None
+        
         # Track skill levels (skill_id -> level)
         self.skill_levels = data.get('skill_levels', {})
         if not isinstance(self.skill_levels, dict):
@@ -204,6 +290,11 @@ class Player:
         # Exp and gold gain modifiers (from upgrades/items)
         self.exp_modifier = 1.0  # Multiplier for XP gains
         self.gold_modifier = 1.0  # Multiplier for gold gains
+        # Stable key for EffectManager (assigned on first effect)
+        self.effect_handle = None
+        # Equipment damage_type_bonuses by element index (see get_element_bonus_vector)
+        self._element_bonus_key = None
+        self._element_bonus_vector = []
         
         # Apply stat bonuses and equipment on initialization
         self._apply_agility_bonuses()
@@ -293,7 +384,14 @@ class Player:
         return False
     
     def use_item(self, item_id, effect_manager=None):
-        """Use a consumable item from inventory
+        """Use one consumable item from inventory (see use_items)
+        
+        Returns True if item was used successfully
+        """
+        return self.use_items(item_id, 1, effect_manager) == 1
+
+    def use_items(self, item_id, count=1, effect_manager=None):
+        """Use up to `count` units of a consumable in one transaction
         
         Handles:
         - Fixed healing (heal: int)
@@ -303,107 +401,68 @@ class Player:
         - Temporary stat buffs (atk_boost, def_boost, etc. with duration)
         - Full restore effects (full_heal, full_mana)
         
+        The item is validated once, restores are summed and capped once (same
+        result as using the units one by one, since every restore is capped
+        at the max), buffs are applied per unit, and the inventory is updated
+        once.
+        
         Args:
             item_id: ID of the item to use
+            count: How many to use (clamped to the quantity held)
             effect_manager: Optional EffectManager for applying temporary buffs
         
-        Returns True if item was used successfully
+        Returns the number of items used (0 if none)
         """
         item = self._load_item_by_id(item_id)
         if not item:
-            return False
+            return 0
         
         if item.get('type') != 'consumable':
-            return False
+            return 0
         
-        if not self.has_item(item_id):
-            return False
+        count = min(int(count), self.inventory.get(item_id, 0))
+        if count <= 0:
+            return 0
         
         # Apply effects
         effect = item.get('effect', {})
+        suffix = f" (x{count})" if count > 1 else ""
         
-        # Fixed healing
-        if 'heal' in effect:
-            heal_amount = effect['heal']
-            old_hp = self.hp
-            self.hp = min(self.max_hp, self.hp + heal_amount)
-            print(f"Healed {self.hp - old_hp} HP")
-        
-        # Percentage healing
-        if 'heal_percent' in effect:
-            heal_percent = effect['heal_percent']
-            heal_amount = int(self.max_hp * heal_percent)
-            old_hp = self.hp
-            self.hp = min(self.max_hp, self.hp + heal_amount)
-            print(f"Healed {self.hp - old_hp} HP ({int(heal_percent * 100)}%)")
-        
-        # Full heal
+        # Healing: fixed + percentage per unit, full heal caps at max anyway
+        heal_amount = effect.get('heal', 0) + int(self.max_hp * effect.get('heal_percent', 0))
         if effect.get('full_heal'):
+            heal_amount = self.max_hp
+        if heal_amount or 'heal' in effect or 'heal_percent' in effect:
             old_hp = self.hp
-            self.hp = self.max_hp
-            print(f"Fully healed! (+{self.hp - old_hp} HP)")
-        
-        # Fixed mana restoration (support both 'restore_mana' and 'mana_restore')
-        mana_amount = effect.get('restore_mana') or effect.get('mana_restore')
-        if mana_amount:
-            old_mana = self.current_mana
-            self.current_mana = min(self.max_mana, self.current_mana + mana_amount)
-            print(f"Restored {self.current_mana - old_mana} mana")
-        
-        # Percentage mana restoration
-        if 'mana_percent' in effect:
-            mana_percent = effect['mana_percent']
-            mana_amount = int(self.max_mana * mana_percent)
-            old_mana = self.current_mana
-            self.current_mana = min(self.max_mana, self.current_mana + mana_amount)
-            print(f"Restored {self.current_mana - old_mana} mana ({int(mana_percent * 100)}%)")
+            self.hp = min(self.max_hp, self.hp + heal_amount * count)
+            if effect.get('full_heal'):
+                item_log.debug("Fully healed! (+%s HP)%s", self.hp - old_hp, suffix)
+            else:
+                item_log.debug("Healed %s HP%s", self.hp - old_hp, suffix)
         
-        # Full mana restore
+        # Mana: fixed (support both 'restore_mana' and 'mana_restore') + percentage
+        mana_amount = (effect.get('restore_mana') or effect.get('mana_restore') or 0) \
+            + int(self.max_mana * effect.get('mana_percent', 0))
         if effect.get('full_mana'):
+            mana_amount = self.max_mana
+        if mana_amount:
             old_mana = self.current_mana
-            self.current_mana = self.max_mana
-            print(f"Fully restored mana! (+{self.current_mana - old_mana})")
+            self.current_mana = min(self.max_mana, self.current_mana + mana_amount * count)
+            if effect.get('full_mana'):
+                item_log.debug("Fully restored mana! (+%s)%s", self.current_mana - old_mana, suffix)
+            else:
+                item_log.debug("Restored %s mana%s", self.current_mana - old_mana, suffix)
         
-        # Temporary stat buffs (requires effect_manager)
+        # Temporary stat buffs (requires effect_manager); each unit stacks its own buff
         if effect_manager:
-            duration = effect.get('duration', 0)
-            
-            # Attack boost
-            if 'atk_boost' in effect:
-                effect_manager.add_effect(self, {
-                    'type': 'buff',
-                    'stat': 'atk',
-                    'value': effect['atk_boost'],
-                    'duration': duration,
-                    'source': item.get('name', item_id)
-                })
-                print(f"Attack boosted by {effect['atk_boost']} for {duration} turns!")
-            
-            # Defense boost
-            if 'def_boost' in effect:
-                effect_manager.add_effect(self, {
-                    'type': 'buff',
-                    'stat': 'def',
-                    'value': effect['def_boost'],
-                    'duration': duration,
-                    'source': item.get('name', item_id)
-                })
-                print(f"Defense boosted by {effect['def_boost']} for {duration} turns!")
-            
-            # Magic power boost
-            if 'magic_power_boost' in effect:
-                effect_manager.add_effect(self, {
-                    'type': 'buff',
-                    'stat': 'magic_power',
-                    'value': effect['magic_power_boost'],
-                    'duration': duration,
-                    'source': item.get('name', item_id)
-                })
-                print(f"Magic power boosted by {effect['magic_power_boost']} for {duration} turns!")
+            for template in get_item_templates(item_id, item):
+                for _ in range(count):
+                    effect_manager.add_effect(self, template)
+                item_log.debug("%s boosted by %s for %s turns!%s", BOOST_LABELS.get(template.stat, template.stat), template.value, template.duration, suffix)
         
-        # Remove item from inventory
-        self.remove_item(item_id, 1)
-        return True
+        # Remove items from inventory
+        self.remove_item(item_id, count)
+        return count
 
     def _apply_agility_bonuses(self):
         """Apply bonuses from agility stat: crit chance and dodge chance with soft/hard caps."""
@@ -447,48 +506,60 @@ class Player:
         self.xp += modified_amount
         # Supporte plusieurs niveaux d'un coup
         # Exponential scaling: level^1.5 * 100 (more XP needed each level)
-        xp_required = int((self.level ** 1.5) * 100)
-        while self.xp >= xp_required:
-            self.xp -= xp_required
-            self.level_up()
-            xp_required = int((self.level ** 1.5) * 100)
+        if self.xp < xp_required_for(self.level):
+            return
+        # Binary search the final level in the cumulative XP table, then
+        # apply every level gained in one batch
+        new_level, self.xp = level_for_total_xp(total_xp_for_level(self.level) + self.xp)
+        self.level_up(new_level - self.level)
 
-    def level_up(self):
-        self.level += 1
-        # Accorde un boost de vie de base et soigne le joueur partiellement
-        # increase the canonical base max hp so recalculation is deterministic
-        self.base_max_hp = getattr(self, 'base_max_hp', self.max_hp) + 10
-        self.max_hp = self.base_max_hp
-        # Heal 50% of max HP + 100 flat HP instead of full heal
-        heal_amount = int(self.max_hp * 0.5) + 100
-        self.hp = min(self.hp + heal_amount, self.max_hp)
-        # Accord de points de compétence à dépenser manuellement (via l'UI)
-        self.unspent_points += 3
-        
-        # Every 3 levels, grant +1 to all stats automatically
-        if self.level % 3 == 0:
-            self.base_atk += 1
-            self.base_defense += 1
-            self.base_max_hp += 5
+    def level_up(self, levels=1):
+        """Gain `levels` levels. Per-level HP/point/milestone gains are applied
+        for each level; skill unlocks and stat recalculation run once."""
+        milestones = 0
+        for _ in range(levels):
+            self.level += 1
+            # Accorde un boost de vie de base et soigne le joueur partiellement
+            # increase the canonical base max hp so recalculation is deterministic
+            self.base_max_hp = getattr(self, 'base_max_hp', self.max_hp) + 10
             self.max_hp = self.base_max_hp
-            # Heal on milestone too (50% + 100)
+            # Heal 50% of max HP + 100 flat HP instead of full heal
             heal_amount = int(self.max_hp * 0.5) + 100
             self.hp = min(self.hp + heal_amount, self.max_hp)
-            self.base_agility = getattr(self, 'base_agility', 0) + 1
-            # Increase HP regen very slightly when gaining HP through level up (+0.02 per HP point gained)
-            hp_gained = 5
-            self.base_hp_regen = getattr(self, 'base_hp_regen', 0.0) + (hp_gained * 0.02)
-            print(f"🎉 Milestone! Level {self.level}: +1 to all stats!")
-        
-        # Auto-unlock skills that require this level
-        self._check_level_unlocks()
-        
+            # Accord de points de compétence à dépenser manuellement (via l'UI)
+            self.unspent_points += 3
+
+            # Every 3 levels, grant +1 to all stats automatically
+            if self.level % 3 == 0:
+                milestones += 1
+                self.base_atk += 1
+                self.base_defense += 1
+                self.base_max_hp += 5
+                self.max_hp = self.base_max_hp
+                # Heal on milestone too (50% + 100)
+                heal_amount = int(self.max_hp * 0.5) + 100
+                self.hp = min(self.hp + heal_amount, self.max_hp)
+                self.base_agility = getattr(self, 'base_agility', 0) + 1
+                # Increase HP regen very slightly when gaining HP through level up (+0.02 per HP point gained)
+                hp_gained = 5
+                self.base_hp_regen = getattr(self, 'base_hp_regen', 0.0) + (hp_gained * 0.02)
+        if milestones == 1:
+            log.info("🎉 Milestone! Level %s: +1 to all stats!", self.level - self.level % 3)
+        elif milestones > 1:
+            log.info("🎉 %s milestones! +%s to all stats!", milestones, milestones)
+
+        # Auto-unlock skills that require the new level (once for the whole range)
+        self._check_level_unlocks(levels)
+
         # Recalculate derived stats (equipment, permanent upgrades) so level HP stacks with them
         try:
             self._recalc_stats()
         except Exception:
             pass
-        print(f"{self.name} est maintenant niveau {self.level} ! (+3 points non dépensés)")
+        if levels == 1:
+            log.info("%s est maintenant niveau %s ! (+3 points non dépensés)", self.name, self.level)
+        else:
+            log.info("%s est maintenant niveau %s ! (+%s niveaux, +%s points non dépensés)", self.name, self.level, levels, 3 * levels)
 
     def spend_point(self, stat: str) -> bool:
         """Dépense un point sur une statistique: 'atk', 'def', 'hp', 'agi', 'mag'. Retourne True si succès."""
@@ -513,7 +584,7 @@ class Player:
             return False
 
         self.unspent_points -= 1
-        print(f"{self.name} dépense 1 point sur {stat}. Points restants: {self.unspent_points}")
+        log.debug("%s dépense 1 point sur %s. Points restants: %s", self.name, stat, self.unspent_points)
         
         # For HP and MAG stats, preserve current HP/mana to avoid healing/restoring
         if stat == "hp":
@@ -592,6 +663,22 @@ class Player:
         # Fallback: non-equip items or items without stats -> go to inventory
         self.inventory[item_id] = self.inventory.get(item_id, 0) + 1
 
+    def buy_item(self, offer: dict) -> bool:
+        """Buy a shop offer at its final cost and count it in the shop statistics.
+
+        The item goes to the inventory without auto-equipping. Returns False
+        (nothing changes) when the player can't afford it.
+        """
+        cost = offer.get('_final_cost', offer.get('cost', 0))
+        if self.gold < cost:
+            return False
+        self.gold -= cost
+        self.total_gold_spent = getattr(self, 'total_gold_spent', 0) + cost
+        self.total_items_bought = getattr(self, 'total_items_bought', 0) + 1
+        # Offer keys like _final_cost are not part of the item
+        self.add_item({k: v for k, v in offer.items() if not k.startswith('_')}, auto_equip=False)
+        return True
+
     def equip_item_by_id(self, item_id: str) -> bool:
         """Equip an item by id from the item's definitions without changing inventory counts."""
         item = self._load_item_by_id(item_id)
@@ -641,19 +728,22 @@ class Player:
         return False
 
     def _load_item_by_id(self, item_id: str):
-        """Load item definition from data/items.json by id. Returns dict or None."""
-        try:
-            base = Path(__file__).resolve().parents[1]
-            items_path = base / 'data' / 'items.json'
-            if items_path.exists():
-                with open(items_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for it in data.get('items', []):
-                        if it.get('id') == item_id:
-                            return it
-        except Exception:
-            return None
-        return None
+        """Item definition from data/items.json by id. Returns dict or None."""
+        return _items_by_id().get(item_id)
+
+    def get_element_bonus_vector(self):
+        """Equipment damage type bonuses as a list indexed by element.
+        Rebuilt only when the equipped items change."""
+        key = tuple(self.equipment.items())
+        if key != self._element_bonus_key:
+            bonuses = []
+            for item_id in self.equipment.values():
+                item = self._load_item_by_id(item_id) if item_id else None
+                if item:
+                    bonuses.append(item.get('damage_type_bonuses'))
+            self._element_bonus_vector = bonus_vector(bonuses)
+            self._element_bonus_key = key
+        return self._element_bonus_vector
 
     def has_item(self, item_id: str) -> bool:
         return self.inventory.get(item_id, 0) > 0
@@ -927,99 +1017,127 @@ class Player:
         
         if skill_id not in self.skills:
             # New skill unlock
+            unowned_valid = self._unowned_key == (id(self.skills), len(self.skills))
             self.skills.append(skill_id)
+            if unowned_valid:
+                self._unowned_skills.discard(skill_id)
+                self._unowned_key = (id(self.skills), len(self.skills))
             self.skill_levels[skill_id] = 1
-            print(f"✨ New skill unlocked: {skill_id}")
+            skill_log.info("✨ New skill unlocked: %s", skill_id)
             return ('new', 1)
         else:
             # Skill already known - level it up!
             current_level = self.skill_levels.get(skill_id, 1)
             new_level = current_level + 1
             self.skill_levels[skill_id] = new_level
-            print(f"⬆️ Skill leveled up: {skill_id} -> Level {new_level}")
+            skill_log.info("⬆️ Skill leveled up: %s -> Level %s", skill_id, new_level)
             return ('levelup', new_level)
     
-    def _check_level_unlocks(self):
-        """Check all skills and unlock any that require current level or lower"""
-        import json
-        import os
-        try:
-            skills_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'skills.json')
-            with open(skills_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Handle both dict and array formats
-            if isinstance(data, dict) and 'skills' in data:
-                all_skills = data['skills']
-            elif isinstance(data, list):
-                all_skills = data
-            else:
-                all_skills = data  # Assume it's already in the right format
-            
-            for skill_data in all_skills:
-                skill_id = skill_data.get('id')
-                unlock_req = skill_data.get('unlock_requirements', {})
-                required_level = unlock_req.get('level')
-                if required_level and self.level >= required_level and skill_id:
-                    self.unlock_skill(skill_id)
-        except Exception as e:
-            print(f"Warning: Failed to check level unlocks: {e}")
+    def get_unowned_skills(self):
+        """Set of skill ids from skills.json the player hasn't unlocked.
+        Maintained by unlock_skill; rebuilt if the skills list was replaced."""
+        key = (id(self.skills), len(self.skills))
+        if self._unowned_key != key:
+            owned = set(self.skills)
+            self._unowned_skills = {skill_id for skill_id in get_skill_index().ids if skill_id not in owned}
+            self._unowned_key = key
+        return self._unowned_skills
+
+    def _check_level_unlocks(self, levels_gained=1):
+        """Unlock (or level up) every skill that requires current level or lower.
+        Covers the last `levels_gained` level-ups: a skill counts once per
+        level-up at or above its required level (same as checking each level).
+        Only owned skills and the requirements reached in the range are visited."""
+        old_level = self.level - levels_gained
+        index = get_skill_index()
+        if not hasattr(self, 'skill_levels'):
+            self.skill_levels = {}
+        # Owned skills unlocked before this range level up once per level gained
+        for skill_id in dict.fromkeys(getattr(self, 'skills', [])):
+            required_level = index.required_levels.get(skill_id)
+            if required_level and required_level <= old_level:
+                self.skill_levels[skill_id] = self.skill_levels.get(skill_id, 1) + levels_gained
+                skill_log.info("⬆️ Skill leveled up: %s -> Level %s", skill_id, self.skill_levels[skill_id])
+        # Requirements reached in (old_level, level], in file order like the skills.json scan
+        for skill_id in sorted(skills_for_levels(old_level, self.level), key=index.order.get):
+            times = self.level - max(old_level + 1, index.required_levels[skill_id]) + 1
+            self.unlock_skill(skill_id)
+            if times > 1:
+                # Remaining level-ups of the range level the skill up in one step
+                self.skill_levels[skill_id] = self.skill_levels.get(skill_id, 1) + times - 1
+                skill_log.info("⬆️ Skill leveled up: %s -> Level %s", skill_id, self.skill_levels[skill_id])
     
     def _check_item_unlocks(self, item_id):
-        """Check all skills and unlock any that require this specific item to be equipped"""
-        import json
-        import os
-        try:
-            skills_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'skills.json')
-            with open(skills_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Handle both dict and array formats
-            if isinstance(data, dict) and 'skills' in data:
-                all_skills = data['skills']
-            elif isinstance(data, list):
-                all_skills = data
-            else:
-                all_skills = data  # Assume it's already in the right format
-            
-            for skill_data in all_skills:
-                skill_id = skill_data.get('id')
-                unlock_req = skill_data.get('unlock_requirements', {})
-                required_item = unlock_req.get('item_equipped')
-                if required_item == item_id and skill_id:
-                    self.unlock_skill(skill_id)
-        except Exception as e:
-            print(f"Warning: Failed to check item unlocks: {e}")
-    
+        """Unlock skills that require this specific item to be equipped"""
+        for skill_id in skills_for_item(item_id):
+            self.unlock_skill(skill_id)
+
     def open_container(self, container_item):
         """Open a container item and grant loot from its loot pool
         
+        The container itself is not removed (see open_containers).
         Returns list of granted items
         """
-        loot_pool = container_item.get('loot_pool', [])
-        granted_items = []
+        return self._grant_container_loot(container_item, 1)[1]
+
+    def open_containers(self, container_id, count=1, rng=None):
+        """Open up to `count` held containers in one transaction
+        
+        Loot is rolled per loot_pool entry for the whole batch (one binomial
+        draw instead of one roll per container), item grants are summed and
+        the inventory is updated once.
+        
+        Returns (opened, granted) where granted is a list of
+        ('item', item_id, total_qty) and ('skill', skill_id, upgrades, level)
+        """
+        container_item = self._load_item_by_id(container_id)
+        if not container_item or container_item.get('type') != 'container':
+            return 0, []
+        count = min(int(count), self.inventory.get(container_id, 0))
+        if count <= 0:
+            return 0, []
+        self.remove_item(container_id, count)
+        return count, self._grant_container_loot(container_item, count, rng)[0]
+
+    def _grant_container_loot(self, container_item, count, rng=None):
+        """Roll and grant the loot of `count` containers.
         
+        Returns (aggregated grants, per-entry grants)
+        """
         import random
-        for loot_entry in loot_pool:
-            chance = loot_entry.get('chance', 0.0)
-            if random.random() < chance:
-                item_id = loot_entry.get('item_id')
-                skill_id = loot_entry.get('skill_id')
-                qty = loot_entry.get('qty', 1)
-                
-                if item_id:
-                    # Grant item
-                    item_def = self._load_item_by_id(item_id)
-                    if item_def:
-                        for _ in range(qty):
-                            self.add_item(item_def, auto_equip=False)
-                        granted_items.append(('item', item_id, qty))
-                        print(f"📦 Container grants: {item_def.get('name', item_id)} x{qty}")
-                
-                if skill_id:
-                    # Grant skill (or level it up)
-                    result, level = self.unlock_skill(skill_id)
-                    if result in ('new', 'levelup'):
-                        granted_items.append(('skill', skill_id, level))
+        rng = rng or random
+        item_totals = {}
+        skill_totals = {}
+        per_entry = []
+        for loot_entry in container_item.get('loot_pool', []):
+            hits = _roll_hits(loot_entry.get('chance', 0.0), count, rng)
+            if not hits:
+                continue
+            item_id = loot_entry.get('item_id')
+            skill_id = loot_entry.get('skill_id')
+            qty = loot_entry.get('qty', 1)
+            
+            if item_id and self._load_item_by_id(item_id):
+                item_totals[item_id] = item_totals.get(item_id, 0) + qty * hits
+                per_entry.append(('item', item_id, qty * hits))
+            
+            if skill_id:
+                # Grant skill (or level it up), then one more level per extra hit
+                result, level = self.unlock_skill(skill_id)
+                if result in ('new', 'levelup'):
+                    if hits > 1:
+                        level = self.skill_levels[skill_id] = level + hits - 1
+                        skill_log.info("⬆️ Skill leveled up: %s -> Level %s", skill_id, level)
+                    upgrades, _ = skill_totals.get(skill_id, (0, level))
+                    skill_totals[skill_id] = (upgrades + hits, level)
+                    per_entry.append(('skill', skill_id, level))
+        
+        # Commit item grants in one inventory update
+        for item_id, total in item_totals.items():
+            self.inventory[item_id] = self.inventory.get(item_id, 0) + total
+            item_def = self._load_item_by_id(item_id)
+            item_log.info("📦 Container grants: %s x%s", item_def.get('name', item_id), total)
         
-        return granted_items
+        granted = [('item', item_id, total) for item_id, total in item_totals.items()]
+        granted.extend(('skill', skill_id, upgrades, level) for skill_id, (upgrades, level) in skill_totals.items())
+        return granted, per_entry
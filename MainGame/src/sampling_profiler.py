@@ -0,0 +1,123 @@
+# src/sampling_profiler.py
+"""Stack-sampling profiler for live play sessions (`prof start` / `prof stop`).
+
+A daemon timer thread wakes every `interval` seconds and records the main
+thread's stack from sys._current_frames(); nothing is hooked into the
+profiled code, so the game runs at full speed between samples. Results are
+written as collapsed stacks (`a;b;c count`, the input of flamegraph.pl,
+speedscope and inferno) plus a top-N summary of self and total samples.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_INTERVAL = 0.005
+TOP_N = 30
+
+
+def frame_label(code):
+    """Flamegraph-safe `file.py:function:line` label of a code object"""
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}".replace(';', ',')
+
+
+class SamplingProfiler:
+    def __init__(self, interval=DEFAULT_INTERVAL, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id
+        self.stacks = Counter()
+        self.samples = 0
+        self.started = None
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self, interval=None):
+        """Start sampling (the calling thread unless thread_id was given)"""
+        if self.running:
+            return False
+        if interval:
+            self.interval = interval
+        target = self.thread_id or threading.get_ident()
+        self.stacks.clear()
+        self.samples = 0
+        self._stop.clear()
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, args=(target,), name='sampling-profiler', daemon=True)
+        self._thread.start()
+        print(f"🔬 Sampling profiler started ({self.interval * 1000:.1f} ms interval)")
+        return True
+
+    def stop(self):
+        """Stop sampling; returns the number of samples taken"""
+        if not self.running:
+            return 0
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.elapsed = time.perf_counter() - self.started
+        print(f"🔬 Sampling profiler stopped: {self.samples} samples in {self.elapsed:.1f}s")
+        return self.samples
+
+    def _run(self, target):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(target)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            # Root first, as flamegraph tools expect
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        """Collapsed-stack lines: `root;...;leaf count`, heaviest first"""
+        labels = {}
+        folded = Counter()
+        for stack, count in self.stacks.items():
+            key = ';'.join(labels.get(code) or labels.setdefault(code, frame_label(code)) for code in stack)
+            folded[key] += count
+        return [f"{key} {count}" for key, count in folded.most_common()]
+
+    def top(self, n=TOP_N):
+        """[(label, self samples, total samples)] sorted by self samples"""
+        own = Counter()
+        total = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            # Recursion counts a function once per sample
+            for code in set(stack):
+                total[code] += count
+        return [(frame_label(code), count, total[code]) for code, count in own.most_common(n)]
+
+    def summary(self, n=TOP_N):
+        lines = [f"Sampling profile: {self.samples} samples, {self.elapsed:.1f}s, "
+                 f"{self.interval * 1000:.1f} ms interval", "",
+                 f"{'self%':>7} {'total%':>7} {'self':>7}  function"]
+        samples = max(1, self.samples)
+        for label, own, total in self.top(n):
+            lines.append(f"{own * 100.0 / samples:6.1f}% {total * 100.0 / samples:6.1f}% {own:7d}  {label}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory, n=TOP_N):
+        """Write <name>.folded (flamegraph input) and <name>.txt (top-N). Returns both paths"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        base = directory / f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        folded_path = base.with_suffix('.folded')
+        summary_path = base.with_suffix('.txt')
+        with open(folded_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(self.collapsed()) + "\n")
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(self.summary(n))
+        print(f"💾 Profile written: {folded_path} / {summary_path.name}")
+        return folded_path, summary_path
@@ -1,12 +1,62 @@
 # src/save_manager.py
 import json
 import base64
+import os
+import threading
 from pathlib import Path
 
+# Fields tracked by the append-only journal (see append_journal)
+# (level-up/stat-point gains and shop counters included, so a replayed level keeps its gains)
+JOURNAL_SCALARS = ('wave', 'highest_wave', 'current_zone_id', 'gold', 'xp', 'level',
+                   'unspent_points', 'max_hp', 'base_max_hp', 'base_atk', 'base_defense',
+                   'base_agility', 'base_hp_regen',
+                   'total_gold_spent', 'total_items_bought', 'cumulative_price_increase')
+JOURNAL_DICTS = ('inventory', 'equipment', 'skill_levels')
+
+
 class SaveManager:
-    def __init__(self, save_dir):
+    def __init__(self, save_dir, journal_compact_bytes=64 * 1024):
         self.save_dir = Path(save_dir)
         self.save_dir.mkdir(exist_ok=True)
+        self.save_path = self.save_dir / "save.save"
+        # Append-only journal of small deltas written between full snapshots
+        self.journal_path = self.save_dir / "save.journal"
+        # Journal being folded into a new snapshot by the background compactor
+        self.compacting_path = self.save_dir / "save.journal.compacting"
+        self.journal_compact_bytes = journal_compact_bytes
+        # Last journaled values, used to compute deltas (None until first save/load)
+        self._journal_state = None
+        # Guards snapshot writes and journal rotation against the compactor thread
+        self._lock = threading.Lock()
+        self._compact_thread = None
+        # Bumped on every full save so a stale compaction never overwrites it
+        self._snapshot_generation = 0
+
+    @staticmethod
+    def _encode(data):
+        json_str = json.dumps(data, indent=4)
+        return base64.b64encode(json_str.encode('utf-8'))
+
+    @staticmethod
+    def _decode(encoded_data):
+        decoded_data = base64.b64decode(encoded_data)
+        return json.loads(decoded_data.decode('utf-8'))
+
+    def _write_snapshot(self, data):
+        """Atomically replace save.save with the encoded data."""
+        tmp_path = self.save_path.with_suffix('.tmp')
+        with open(tmp_path, "wb") as f:
+            f.write(self._encode(data))
+        os.replace(tmp_path, self.save_path)
+
+    @staticmethod
+    def _journal_fields(data):
+        """Extract the journaled subset of a save dict (deep-copied for dicts)."""
+        state = {key: data.get(key) for key in JOURNAL_SCALARS}
+        for key in JOURNAL_DICTS:
+            state[key] = dict(data.get(key) or {})
+        state['skills'] = list(data.get('skills') or [])
+        return state
 
     def save(self, player, battle=None):
         data = {
@@ -72,26 +122,189 @@ class SaveManager:
                     data['enemy_id'] = getattr(battle.enemy, 'id', None)
         except Exception:
             pass
-        # Encode save data with base64
-        json_str = json.dumps(data, indent=4)
-        encoded_data = base64.b64encode(json_str.encode('utf-8'))
-        with open(self.save_dir / "save.save", "wb") as f:
-            f.write(encoded_data)
+        # Encode save data with base64; a full snapshot supersedes the journal
+        with self._lock:
+            self._write_snapshot(data)
+            self._snapshot_generation += 1
+            for path in (self.journal_path, self.compacting_path):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            self._journal_state = self._journal_fields(data)
         print("💾 Sauvegarde réussie.")
 
+    def append_journal(self, player, battle=None):
+        """Append the fields that changed since the last save/journal entry.
+
+        Much cheaper than save(): only one short line is appended to save.journal.
+        Values are absolute (not increments) so replaying an entry twice is harmless.
+        Returns True if an entry was written.
+        """
+        if self._journal_state is None:
+            # No baseline snapshot yet (fresh game): write one to journal against
+            self.save(player, battle=battle)
+            return True
+        current = self._journal_fields({
+            'wave': getattr(battle, 'wave', None) if battle else None,
+            'highest_wave': max(getattr(player, 'highest_wave', 0), getattr(battle, 'wave', 0) if battle else 0),
+            'current_zone_id': (getattr(battle, 'current_zone', None) or {}).get('id') if battle else None,
+            'gold': player.gold,
+            'xp': player.xp,
+            'level': player.level,
+            'unspent_points': getattr(player, 'unspent_points', 0),
+            'max_hp': player.max_hp,
+            'base_max_hp': getattr(player, 'base_max_hp', player.max_hp),
+            'base_atk': getattr(player, 'base_atk', getattr(player, 'atk', 0)),
+            'base_defense': getattr(player, 'base_defense', getattr(player, 'defense', 0)),
+            'base_agility': getattr(player, 'base_agility', getattr(player, 'agility', 0)),
+            'base_hp_regen': getattr(player, 'base_hp_regen', getattr(player, 'hp_regen', 0.0)),
+            'total_gold_spent': getattr(player, 'total_gold_spent', 0),
+            'total_items_bought': getattr(player, 'total_items_bought', 0),
+            'cumulative_price_increase': getattr(player, 'cumulative_price_increase', 0.0),
+            'inventory': player.inventory,
+            'equipment': player.equipment,
+            'skill_levels': getattr(player, 'skill_levels', {}),
+            'skills': getattr(player, 'skills', []),
+        })
+        previous = self._journal_state
+        entry = {}
+        for key in JOURNAL_SCALARS:
+            if current[key] is not None and current[key] != previous.get(key):
+                entry[key] = current[key]
+        for key in JOURNAL_DICTS:
+            old, new = previous.get(key) or {}, current[key]
+            changes = {k: v for k, v in new.items() if old.get(k) != v}
+            if key == 'inventory':
+                # removed stacks are recorded as 0 so replay can delete them
+                changes.update({k: 0 for k in old if k not in new})
+            else:
+                changes.update({k: None for k in old if k not in new})
+            if changes:
+                entry[key] = changes
+        if current['skills'] != previous.get('skills'):
+            entry['skills'] = current['skills']
+        if not entry:
+            return False
+
+        line = base64.b64encode(json.dumps(entry, separators=(',', ':')).encode('utf-8'))
+        with self._lock:
+            with open(self.journal_path, "ab") as f:
+                f.write(line + b"\n")
+            self._journal_state = current
+            try:
+                journal_size = self.journal_path.stat().st_size
+            except OSError:
+                journal_size = 0
+        if journal_size >= self.journal_compact_bytes:
+            self.compact_journal()
+        return True
+
+    @staticmethod
+    def _apply_journal_entry(data, entry):
+        """Apply one decoded journal entry on top of a save dict."""
+        if 'wave' in entry and entry['wave'] != data.get('wave'):
+            # the saved enemy belongs to an older wave
+            data.pop('enemy_hp', None)
+            data.pop('enemy_id', None)
+        for key in JOURNAL_SCALARS:
+            if key in entry:
+                data[key] = entry[key]
+        for key in JOURNAL_DICTS:
+            if key not in entry:
+                continue
+            target = data.get(key)
+            if not isinstance(target, dict):
+                target = data[key] = {}
+            for k, v in entry[key].items():
+                if key == 'inventory' and not v:
+                    target.pop(k, None)
+                elif key == 'skill_levels' and v is None:
+                    target.pop(k, None)
+                else:
+                    target[k] = v
+        if 'skills' in entry:
+            data['skills'] = entry['skills']
+
+    def _replay_journal(self, data, path):
+        """Replay every intact line of a journal file. Returns the number of entries applied."""
+        applied = 0
+        try:
+            with open(path, "rb") as f:
+                for raw in f:
+                    raw = raw.strip()
+                    if not raw:
+                        continue
+                    try:
+                        entry = json.loads(base64.b64decode(raw).decode('utf-8'))
+                    except Exception:
+                        # a torn last line from a crash mid-write: stop here
+                        break
+                    if isinstance(entry, dict):
+                        self._apply_journal_entry(data, entry)
+                        applied += 1
+        except FileNotFoundError:
+            pass
+        return applied
+
+    def compact_journal(self, background=True):
+        """Fold the journal into a fresh snapshot.
+
+        The journal is rotated under the lock (so appends continue in a new file),
+        then merged with the snapshot on a daemon thread unless background is False.
+        A rotated journal left by a failed or interrupted compaction is retried,
+        with the newer journal appended to it first.
+        """
+        with self._lock:
+            if self._compact_thread is not None and self._compact_thread.is_alive():
+                return
+            if self.compacting_path.exists():
+                if self.journal_path.exists():
+                    with open(self.compacting_path, "ab") as out, open(self.journal_path, "rb") as f:
+                        out.write(f.read())
+                    self.journal_path.unlink()
+            elif self.journal_path.exists():
+                os.replace(self.journal_path, self.compacting_path)
+            else:
+                return
+            generation = self._snapshot_generation
+
+        def run():
+            try:
+                with open(self.save_path, "rb") as f:
+                    data = self._decode(f.read())
+                self._replay_journal(data, self.compacting_path)
+                with self._lock:
+                    # a full save() since rotation already contains everything
+                    if generation == self._snapshot_generation:
+                        self._write_snapshot(data)
+                        self.compacting_path.unlink()
+            except Exception as e:
+                print(f"⚠️ Journal compaction failed: {e}")
+
+        if background:
+            self._compact_thread = threading.Thread(target=run, daemon=True)
+            self._compact_thread.start()
+        else:
+            run()
+
     def load(self):
-        path = self.save_dir / "save.save"
+        path = self.save_path
         if path.exists():
             try:
                 with open(path, "rb") as f:
                     encoded_data = f.read()
-                    decoded_data = base64.b64decode(encoded_data)
-                    data = json.loads(decoded_data.decode('utf-8'))
+                    data = self._decode(encoded_data)
                     print("📂 Sauvegarde chargée.")
                     # Validate critical fields
                     if not isinstance(data, dict):
                         print("⚠️ Invalid save format, starting fresh")
                         return None
+                    # Replay deltas written since the snapshot (an interrupted compaction first)
+                    replayed = self._replay_journal(data, self.compacting_path)
+                    replayed += self._replay_journal(data, self.journal_path)
+                    if replayed:
+                        print(f"📂 Replayed {replayed} journal entries.")
                     # Ensure critical numeric fields are valid
                     try:
                         data['hp'] = max(1, int(data.get('hp', 100)))
@@ -113,6 +326,8 @@ class SaveManager:
                     except (ValueError, TypeError):
                         print("⚠️ Corrupted save data, starting fresh")
                         return None
+                    # Further journal entries are deltas against this state
+                    self._journal_state = self._journal_fields(data)
                     return data
             except json.JSONDecodeError:
                 print("⚠️ Save file corrupted, starting fresh")
@@ -121,4 +336,3 @@ class SaveManager:
                 print(f"⚠️ Error loading save: {e}, starting fresh")
                 return None
         return None
-
@@ -1,10 +1,59 @@
 import json
+import random
+from collections import OrderedDict
+from collections.abc import Mapping
 from pathlib import Path
 
+# Max number of memoized (seed, wave, zone, price increase) offer lists
+OFFER_CACHE_SIZE = 128
+
+
+class ShopOffer(Mapping):
+    """Read-only view of an offered item with its final price.
+
+    Behaves like the old `{**item, '_final_cost': cost}` dict
+    (offer.get('name'), offer['_final_cost'], offer.items()...) without
+    copying the item.
+    """
+    __slots__ = ('item', 'final_cost')
+
+    def __init__(self, item, final_cost):
+        self.item = item
+        self.final_cost = final_cost
+
+    def __getitem__(self, key):
+        if key == '_final_cost':
+            return self.final_cost
+        return self.item[key]
+
+    def __iter__(self):
+        yield from self.item
+        yield '_final_cost'
+
+    def __len__(self):
+        return len(self.item) + 1
+
+    def __contains__(self, key):
+        return key == '_final_cost' or key in self.item
+
+    def get(self, key, default=None):
+        if key == '_final_cost':
+            return self.final_cost
+        return self.item.get(key, default)
+
+    def __repr__(self):
+        return f"ShopOffer({self.item.get('id')!r}, {self.final_cost})"
+
+
 class Shop:
     def __init__(self, data_path):
         self.data_path = Path(data_path)
         self.items = []
+        # item id -> item dict (first definition wins, like a linear scan)
+        self.items_by_id = {}
+        # (zone id, zone filter) -> pre-filtered list of (item, cost, shop chance, gold variation)
+        self._catalogs = {}
+        self._offer_cache = OrderedDict()
         self.load_items()
 
     def load_items(self):
@@ -14,60 +63,74 @@ class Shop:
                 self.items = data.get('items', [])
         except Exception:
             self.items = []
+        self.items_by_id = {}
+        for item in self.items:
+            self.items_by_id.setdefault(item.get('id'), item)
+        self._catalogs = {}
+        self._offer_cache.clear()
+
+    def _catalog(self, zone_id, zone_filter=True):
+        """Items that can be offered in a zone, with their price inputs parsed once"""
+        catalog = self._catalogs.get((zone_id, zone_filter))
+        if catalog is None:
+            catalog = []
+            for i in self.items:
+                cost = i.get('cost')
+                if cost is None:
+                    continue
+                # Filter by zone if item has shop_zones restriction
+                shop_zones = i.get('shop_zones', [])
+                if shop_zones and zone_filter and zone_id not in shop_zones:
+                    continue
+                # gold variation: a range like [-0.05, 3.0] or single percentage
+                gv = i.get('goldvariation')
+                if gv is not None:
+                    gv = (float(gv[0]), float(gv[1])) if isinstance(gv, list) and len(gv) >= 2 else float(gv)
+                catalog.append((i, cost, float(i.get('shopchance', 1.0)), gv))
+            self._catalogs[(zone_id, zone_filter)] = catalog
+        return catalog
 
     def get_offers_for_wave(self, wave=1, player_seed=None, cumulative_increase=0.0, current_zone=None):
-        import random
-        # Use player seed to create deterministic RNG for this wave's shop
+        """List of ShopOffer for a wave. Seeded results are memoized per
+        (seed, wave, zone, cumulative_increase)."""
+        zone_id = current_zone.get('id') if isinstance(current_zone, dict) else current_zone
+        key = None
         if player_seed is not None:
+            key = (player_seed, wave, zone_id, bool(current_zone), cumulative_increase)
+            cached = self._offer_cache.get(key)
+            if cached is not None:
+                self._offer_cache.move_to_end(key)
+                return list(cached)
             # Create a wave-specific seed from player seed and wave number
             wave_seed = (player_seed + wave * 7919) % 1000000007
             rng = random.Random(wave_seed)
         else:
             rng = random
-        
+
+        # Apply cumulative price increase from waves (scales all prices)
+        # After wave 50, double the price increase every 5 waves
+        adjusted_increase = cumulative_increase
+        if wave > 50 and wave % 5 == 0:
+            adjusted_increase = cumulative_increase * 2
+
         offers = []
-        for i in self.items:
-            cost = i.get('cost')
-            if cost is None:
-                continue
-            
-            # Filter by zone if item has shop_zones restriction
-            shop_zones = i.get('shop_zones', [])
-            if shop_zones and current_zone:
-                zone_id = current_zone.get('id') if isinstance(current_zone, dict) else current_zone
-                if zone_id not in shop_zones:
-                    continue
-            
+        for item, cost, sch, gv in self._catalog(zone_id, bool(current_zone)):
             # per-item shop chance (default 1.0)
-            sch = float(i.get('shopchance', 1.0))
             if rng.random() > sch:
                 continue
-            # gold variation: a range like [-0.05, 3.0] or single percentage expressed as -0.05 to 3.0
-            gv = i.get('goldvariation')
             final_cost = cost
             if gv is not None:
-                # gv can be a single value or a list [min, max]
-                if isinstance(gv, list) and len(gv) >= 2:
-                    low, high = float(gv[0]), float(gv[1])
-                    factor = rng.uniform(low, high)
-                else:
-                    factor = float(gv)
                 # factor interpreted as percentage multiplier (e.g., -0.05 -> reduce by 5%, 0.2 -> increase by 20%)
+                factor = rng.uniform(gv[0], gv[1]) if isinstance(gv, tuple) else gv
                 final_cost = max(1, int(cost * (1.0 + factor)))
-            
-            # Apply cumulative price increase from waves (scales all prices)
-            # After wave 50, double the price increase every 5 waves
-            adjusted_increase = cumulative_increase
-            if wave > 50 and wave % 5 == 0:
-                adjusted_increase = cumulative_increase * 2
             final_cost = max(1, int(final_cost * (1.0 + adjusted_increase)))
+            offers.append(ShopOffer(item, final_cost))
 
-            offers.append({**i, '_final_cost': final_cost})
-
+        if key is not None:
+            self._offer_cache[key] = tuple(offers)
+            while len(self._offer_cache) > OFFER_CACHE_SIZE:
+                self._offer_cache.popitem(last=False)
         return offers
 
     def find_item(self, item_id):
-        for i in self.items:
-            if i.get('id') == item_id:
-                return i
-        return None
+        return self.items_by_id.get(item_id)
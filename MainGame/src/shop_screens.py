@@ -0,0 +1,372 @@
+# src/shop_screens.py
+"""Drawing for the wave shop and the challenge shop modals.
+
+main.py runs the modal loops (events, purchases); these functions draw one
+frame of each so the same code can be rendered headless by the UI
+benchmark.
+"""
+from pathlib import Path
+
+import pygame
+
+ASSETS_PATH = Path(__file__).resolve().parents[1] / "assets"
+
+# (category, label) filter tabs of the challenge shop
+CHALLENGE_FILTERS = [
+    ('all', 'ALL'),
+    ('offense', 'OFFENSE'),
+    ('defense', 'DEFENSE'),
+    ('magic', 'MAGIC'),
+    ('utility', 'UTILITY'),
+]
+
+
+def shop_layout(width, height):
+    """Fonts and rects of the wave shop panel (larger panel layout centered)"""
+    panel_w, panel_h = 700, 520
+    panel_x = (width - panel_w) // 2
+    panel_y = (height - panel_h) // 2
+    return {
+        'width': width,
+        'height': height,
+        'items_per_page': 4,
+        'title_font': pygame.font.Font(None, 48),
+        'sf': pygame.font.Font(None, 32),
+        'small_font': pygame.font.Font(None, 26),
+        'panel_x': panel_x,
+        'panel_y': panel_y,
+        'panel_w': panel_w,
+        'panel_h': panel_h,
+        'close_rect': pygame.Rect(panel_x + panel_w - 90, panel_y + 10, 80, 40),
+        'items_tab_rect': pygame.Rect(panel_x + 20, panel_y + 70, 120, 35),
+        'stats_tab_rect': pygame.Rect(panel_x + 150, panel_y + 70, 120, 35),
+        'prev_page_rect': pygame.Rect(panel_x + 30, panel_y + panel_h - 60, 120, 45),
+        'next_page_rect': pygame.Rect(panel_x + panel_w - 150, panel_y + panel_h - 60, 120, 45),
+    }
+
+
+def draw_shop(screen, player, battle, offers, shop_tab, shop_page, mouse_pos, layout):
+    """Draw the shop panel over the current frame. Returns the hovered offer (or None)"""
+    width, height = layout['width'], layout['height']
+    title_font, sf, small_font = layout['title_font'], layout['sf'], layout['small_font']
+    panel_x, panel_y = layout['panel_x'], layout['panel_y']
+    panel_w, panel_h = layout['panel_w'], layout['panel_h']
+    close_rect = layout['close_rect']
+    items_tab_rect, stats_tab_rect = layout['items_tab_rect'], layout['stats_tab_rect']
+    prev_page_rect, next_page_rect = layout['prev_page_rect'], layout['next_page_rect']
+    items_per_page = layout['items_per_page']
+    total_pages = max(1, (len(offers) + items_per_page - 1) // items_per_page)
+    mx, my = mouse_pos
+    hover_item = None
+
+    # Draw shop panel with border and shadow effect
+    shadow_offset = 5
+    pygame.draw.rect(screen, (10, 10, 15), (panel_x + shadow_offset, panel_y + shadow_offset, panel_w, panel_h), border_radius=10)
+    pygame.draw.rect(screen, (35, 35, 50), (panel_x, panel_y, panel_w, panel_h), border_radius=10)
+    pygame.draw.rect(screen, (80, 80, 120), (panel_x, panel_y, panel_w, panel_h), width=3, border_radius=10)
+
+    # Title with background
+    title_bg = pygame.Rect(panel_x, panel_y, panel_w, 65)
+    pygame.draw.rect(screen, (50, 50, 70), title_bg, border_top_left_radius=10, border_top_right_radius=10)
+    title = title_font.render(f"Shop - Wave {battle.wave}", True, (255, 255, 100))
+    screen.blit(title, (panel_x + 20, panel_y + 15))
+
+    # Close button
+    pygame.draw.rect(screen, (220, 80, 80), close_rect, border_radius=8)
+    pygame.draw.rect(screen, (255, 120, 120), close_rect, width=2, border_radius=8)
+    cr = sf.render("Close", True, (255, 255, 255))
+    screen.blit(cr, cr.get_rect(center=close_rect.center))
+
+    # Tab buttons
+    items_tab_color = (70, 120, 180) if shop_tab == "items" else (50, 50, 70)
+    stats_tab_color = (70, 120, 180) if shop_tab == "stats" else (50, 50, 70)
+    pygame.draw.rect(screen, items_tab_color, items_tab_rect, border_radius=6)
+    pygame.draw.rect(screen, stats_tab_color, stats_tab_rect, border_radius=6)
+    if shop_tab == "items":
+        pygame.draw.rect(screen, (100, 160, 220), items_tab_rect, width=2, border_radius=6)
+    else:
+        pygame.draw.rect(screen, (100, 160, 220), stats_tab_rect, width=2, border_radius=6)
+    items_text = small_font.render("Items", True, (255, 255, 255))
+    stats_text = small_font.render("Shop Stats", True, (255, 255, 255))
+    screen.blit(items_text, items_text.get_rect(center=items_tab_rect.center))
+    screen.blit(stats_text, stats_text.get_rect(center=stats_tab_rect.center))
+
+    # Conditional rendering based on active tab
+    if shop_tab == "items":
+        # Player gold display
+        gold_bg = pygame.Rect(panel_x + panel_w - 200, panel_y + 70, 180, 35)
+        pygame.draw.rect(screen, (40, 40, 55), gold_bg, border_radius=6)
+        pygame.draw.rect(screen, (255, 215, 0), gold_bg, width=2, border_radius=6)
+        gold_text = small_font.render(f"Gold: {player.gold}g", True, (255, 215, 0))
+        screen.blit(gold_text, (panel_x + panel_w - 190, panel_y + 77))
+
+        # Display current page items
+        start_idx = shop_page * items_per_page
+        end_idx = min(start_idx + items_per_page, len(offers))
+        page_offers = offers[start_idx:end_idx]
+
+        for idx, item in enumerate(page_offers):
+            item_y = panel_y + 120 + idx * 95
+            item_h = 85
+            item_rect = pygame.Rect(panel_x + 20, item_y, panel_w - 40, item_h)
+
+            # Check if mouse is hovering over this item (but not over pagination buttons)
+            is_hovering = item_rect.collidepoint((mx, my))
+            # Don't show tooltip if hovering over pagination buttons
+            if prev_page_rect.collidepoint((mx, my)) or next_page_rect.collidepoint((mx, my)):
+                is_hovering = False
+            if is_hovering:
+                hover_item = item
+
+            # Item background with hover effect
+            bg_color = (60, 70, 90) if is_hovering else (45, 50, 65)
+            pygame.draw.rect(screen, bg_color, item_rect, border_radius=8)
+            pygame.draw.rect(screen, (100, 110, 140), item_rect, width=2, border_radius=8)
+
+            # Icon with larger size
+            icon_size = 64
+            icon_rect = pygame.Rect(panel_x + 30, item_y + 10, icon_size, icon_size)
+            icon_path = ASSETS_PATH / 'images' / 'items' / f"{item.get('id')}.png"
+            if icon_path.exists():
+                try:
+                    ico = pygame.image.load(str(icon_path)).convert_alpha()
+                    ico = pygame.transform.smoothscale(ico, (icon_size, icon_size))
+                    screen.blit(ico, icon_rect)
+                except:
+                    # Draw placeholder if image fails to load
+                    pygame.draw.rect(screen, (80, 80, 100), icon_rect, border_radius=4)
+            else:
+                # Draw placeholder box for missing icon
+                pygame.draw.rect(screen, (80, 80, 100), icon_rect, border_radius=4)
+
+            # Item name (full, no truncation)
+            name = item.get('name', item.get('id'))
+            name_surf = sf.render(name, True, (255, 255, 255))
+            screen.blit(name_surf, (panel_x + 110, item_y + 12))
+
+            # Item type/description on second line
+            item_type = item.get('type', '').capitalize()
+            desc = item.get('desc', '')
+            if item_type:
+                type_surf = small_font.render(f"[{item_type}]", True, (150, 200, 255))
+                screen.blit(type_surf, (panel_x + 110, item_y + 42))
+
+            # Price with larger font
+            price = item.get('_final_cost', item.get('cost', 0))
+            price_color = (100, 255, 100) if player.gold >= price else (255, 100, 100)
+            price_surf = sf.render(f"{price}g", True, price_color)
+            price_x = panel_x + panel_w - 270
+            screen.blit(price_surf, (price_x, item_y + 25))
+
+            # Buy button with better styling
+            buy_rect = pygame.Rect(panel_x + panel_w - 140, item_y + 17, 110, 50)
+            can_afford = player.gold >= price
+            button_color = (80, 180, 80) if can_afford else (100, 100, 100)
+            pygame.draw.rect(screen, button_color, buy_rect, border_radius=8)
+            if can_afford:
+                pygame.draw.rect(screen, (120, 220, 120), buy_rect, width=2, border_radius=8)
+            bt = sf.render("Buy", True, (255, 255, 255) if can_afford else (150, 150, 150))
+            screen.blit(bt, bt.get_rect(center=buy_rect.center))
+
+        # Draw hover tooltip if hovering over an item
+        if hover_item:
+            tooltip_w, tooltip_h = 350, 200
+            tooltip_x = min(mx + 20, width - tooltip_w - 10)
+            tooltip_y = min(my + 20, height - tooltip_h - 10)
+
+            # Tooltip background with shadow
+            pygame.draw.rect(screen, (10, 10, 15), (tooltip_x + 3, tooltip_y + 3, tooltip_w, tooltip_h), border_radius=8)
+            pygame.draw.rect(screen, (25, 25, 40), (tooltip_x, tooltip_y, tooltip_w, tooltip_h), border_radius=8)
+            pygame.draw.rect(screen, (120, 120, 180), (tooltip_x, tooltip_y, tooltip_w, tooltip_h), width=2, border_radius=8)
+
+            # Tooltip content
+            ty = tooltip_y + 10
+            tip_name = small_font.render(hover_item.get('name', ''), True, (255, 255, 100))
+            screen.blit(tip_name, (tooltip_x + 10, ty))
+            ty += 30
+
+            # Description
+            desc = hover_item.get('desc', 'No description')
+            # Word wrap description
+            words = desc.split()
+            lines = []
+            current_line = ""
+            for word in words:
+                test_line = current_line + (" " if current_line else "") + word
+                if small_font.size(test_line)[0] < tooltip_w - 20:
+                    current_line = test_line
+                else:
+                    if current_line:
+                        lines.append(current_line)
+                    current_line = word
+            if current_line:
+                lines.append(current_line)
+
+            for line in lines[:3]:  # Max 3 lines
+                desc_surf = small_font.render(line, True, (200, 200, 200))
+                screen.blit(desc_surf, (tooltip_x + 10, ty))
+                ty += 25
+
+            ty += 5
+            # Stats display
+            stats = []
+            if hover_item.get('attack'): stats.append(f"Attack: +{hover_item['attack']}")
+            if hover_item.get('defense'): stats.append(f"Defense: +{hover_item['defense']}")
+            if hover_item.get('hp'): stats.append(f"HP: +{hover_item['hp']}")
+            if hover_item.get('max_hp'): stats.append(f"Max HP: +{hover_item['max_hp']}")
+            if hover_item.get('critchance'): stats.append(f"Crit: +{int(hover_item['critchance']*100)}%")
+            if hover_item.get('critdamage'): stats.append(f"Crit Dmg: +{hover_item['critdamage']}x")
+            if hover_item.get('penetration'): stats.append(f"Pen: +{hover_item['penetration']}")
+
+            # Magic stats
+            if hover_item.get('magic_power'): stats.append(f"Magic Power: +{hover_item['magic_power']}")
+            if hover_item.get('magic_penetration'): stats.append(f"Magic Pen: +{hover_item['magic_penetration']}")
+            if hover_item.get('max_mana'): stats.append(f"Max Mana: +{hover_item['max_mana']}")
+            if hover_item.get('mana_regen'): stats.append(f"Mana Regen: +{hover_item['mana_regen']}")
+
+            for stat_text in stats:
+                stat_surf = small_font.render(stat_text, True, (150, 255, 150))
+                screen.blit(stat_surf, (tooltip_x + 10, ty))
+                ty += 25
+
+        # Pagination buttons at bottom (only for items tab)
+        if shop_page > 0:
+            pygame.draw.rect(screen, (80, 120, 200), prev_page_rect, border_radius=8)
+        else:
+            pygame.draw.rect(screen, (50, 50, 70), prev_page_rect, border_radius=8)
+        prev_text = sf.render("< Prev", True, (255, 255, 255) if shop_page > 0 else (120, 120, 120))
+        screen.blit(prev_text, prev_text.get_rect(center=prev_page_rect.center))
+
+        if shop_page < total_pages - 1:
+            pygame.draw.rect(screen, (80, 120, 200), next_page_rect, border_radius=8)
+        else:
+            pygame.draw.rect(screen, (50, 50, 70), next_page_rect, border_radius=8)
+        next_text = sf.render("Next >", True, (255, 255, 255) if shop_page < total_pages - 1 else (120, 120, 120))
+        screen.blit(next_text, next_text.get_rect(center=next_page_rect.center))
+
+        # Page indicator
+        page_text = sf.render(f"Page {shop_page + 1}/{total_pages}", True, (200, 200, 220))
+        screen.blit(page_text, page_text.get_rect(center=(panel_x + panel_w // 2, panel_y + panel_h - 35)))
+
+    elif shop_tab == "stats":
+        # Shop Stats Tab - display shop statistics
+        stats_y = panel_y + 130
+        line_height = 40
+
+        # Display various shop statistics
+        stats_data = [
+            ("Game Seed:", str(getattr(player, 'game_seed', 'N/A'))),
+            ("Total Items Bought:", str(getattr(player, 'total_items_bought', 0))),
+            ("Total Gold Spent:", f"{getattr(player, 'total_gold_spent', 0)}g"),
+            ("Current Gold:", f"{player.gold}g"),
+            ("Price Increase:", f"+{getattr(player, 'cumulative_price_increase', 0.0) * 100:.1f}%"),
+            ("Current Wave:", str(battle.wave)),
+            ("Highest Wave:", str(getattr(player, 'highest_wave', 0))),
+        ]
+
+        for label, value in stats_data:
+            # Label
+            label_surf = sf.render(label, True, (180, 180, 200))
+            screen.blit(label_surf, (panel_x + 50, stats_y))
+            # Value
+            value_surf = sf.render(value, True, (255, 255, 100))
+            screen.blit(value_surf, (panel_x + 350, stats_y))
+            stats_y += line_height
+
+        # Additional info
+        info_y = stats_y + 20
+        info_text = small_font.render("Prices increase by 1-15% per wave (seeded)", True, (150, 150, 170))
+        screen.blit(info_text, (panel_x + 50, info_y))
+    return hover_item
+
+
+def challenge_shop_layout(width, height):
+    """Geometry of the challenge shop modal"""
+    mw, mh = 560, 420
+    mx0 = width//2 - mw//2
+    my0 = height//2 - mh//2
+    return {
+        'mw': mw,
+        'mh': mh,
+        'mx0': mx0,
+        'my0': my0,
+        'visible_count': 5,
+        # precompute static rects for buttons
+        'close_rect': pygame.Rect(mx0 + mw - 90, my0 + mh - 44, 80, 32),
+    }
+
+
+def draw_challenge_shop(screen, player, up_defs, challenge_filter, scroll_offset, layout):
+    """Draw the challenge shop modal. Returns the scroll offset clamped to the list"""
+    mw, mh, mx0, my0 = layout['mw'], layout['mh'], layout['mx0'], layout['my0']
+    visible_count = layout['visible_count']
+    close_c_rect = layout['close_rect']
+    filter_buttons = CHALLENGE_FILTERS
+
+    pygame.draw.rect(screen, (30,30,40), (mx0, my0, mw, mh))
+    title = pygame.font.Font(None, 40).render('Challenge Shop', True, (255,255,255))
+    screen.blit(title, (mx0 + 16, my0 + 12))
+    # coin count
+    coin_t = pygame.font.Font(None, 28).render(f'Coins: {player.challenge_coins}', True, (255,215,0))
+    screen.blit(coin_t, (mx0 + 16, my0 + 56))
+    # filter buttons
+    fbx = mx0 + 16
+    fby = my0 + 86
+    fbw = 90
+    fbh = 26
+    fbgap = 8
+    for i, (fkey, flabel) in enumerate(filter_buttons):
+        frect = pygame.Rect(fbx + i * (fbw + fbgap), fby, fbw, fbh)
+        active = (challenge_filter == fkey)
+        fcolor = (90, 120, 180) if active else (60, 60, 80)
+        pygame.draw.rect(screen, fcolor, frect, border_radius=6)
+        pygame.draw.rect(screen, (160, 160, 200), frect, 2, border_radius=6)
+        ftext = pygame.font.Font(None, 20).render(flabel, True, (255,255,255))
+        screen.blit(ftext, ftext.get_rect(center=frect.center))
+
+    # list upgrades (filtered + paged)
+    if challenge_filter == 'all':
+        filtered_defs = up_defs
+    else:
+        filtered_defs = [u for u in up_defs if u.get('category') == challenge_filter]
+    max_scroll = max(0, len(filtered_defs) - visible_count)
+    scroll_offset = max(0, min(scroll_offset, max_scroll))
+    visible_defs = filtered_defs[scroll_offset:scroll_offset + visible_count]
+
+    for i, u in enumerate(visible_defs):
+        uy = my0 + 120 + i * 56
+        name = u.get('name')
+        desc = u.get('desc', '')
+        cur = player.permanent_upgrades.get(u.get('id'), 0)
+        lvl = pygame.font.Font(None, 26).render(f"{name} (Lv {cur})", True, (220,220,220))
+        screen.blit(lvl, (mx0 + 16, uy))
+        if desc:
+            desc_text = pygame.font.Font(None, 20).render(desc[:38], True, (160,160,180))
+            screen.blit(desc_text, (mx0 + 16, uy + 24))
+        # cost and buy - dynamic cost based on current level
+        base_cost = int(u.get('cost', 1))
+        dynamic_cost = base_cost * (cur + 1)
+        cost_t = pygame.font.Font(None, 24).render(f"{dynamic_cost}c", True, (255,215,0))
+        screen.blit(cost_t, (mx0 + 360, uy))
+        buy_rect = pygame.Rect(mx0 + 420, uy, 100, 40)
+        # Gray out button if can't afford or at max level
+        can_buy = player.challenge_coins >= dynamic_cost and cur < int(u.get('max_level', 99))
+        btn_color = (80,160,80) if can_buy else (100,100,100)
+        pygame.draw.rect(screen, btn_color, buy_rect, border_radius=6)
+        bt = pygame.font.Font(None, 28).render('Buy', True, (255,255,255) if can_buy else (150,150,150))
+        screen.blit(bt, bt.get_rect(center=buy_rect.center))
+
+    # scroll buttons
+    up_rect = pygame.Rect(mx0 + mw - 50, my0 + 100, 30, 30)
+    down_rect = pygame.Rect(mx0 + mw - 50, my0 + 100 + (visible_count * 56) - 10, 30, 30)
+    pygame.draw.rect(screen, (80, 80, 100), up_rect, border_radius=4)
+    pygame.draw.rect(screen, (80, 80, 100), down_rect, border_radius=4)
+    up_t = pygame.font.Font(None, 26).render('^', True, (255,255,255))
+    down_t = pygame.font.Font(None, 26).render('v', True, (255,255,255))
+    screen.blit(up_t, up_t.get_rect(center=up_rect.center))
+    screen.blit(down_t, down_t.get_rect(center=down_rect.center))
+    # close button
+    pygame.draw.rect(screen, (200,80,80), close_c_rect, border_radius=6)
+    ct = pygame.font.Font(None, 28).render('Close', True, (0,0,0))
+    screen.blit(ct, ct.get_rect(center=close_c_rect.center))
+    return scroll_offset
@@ -0,0 +1,99 @@
+# src/skill_index.py
+"""Lookup indexes over data/skills.json for skill unlocks.
+
+Built once per file version (mtime-checked) instead of rereading and
+scanning skills.json on every level-up, equip and boss kill:
+- a level table sorted by `unlock_requirements.level` (bisected),
+- item id -> skills unlocked by equipping it,
+- skill id -> display name, file order and required level.
+"""
+import json
+from bisect import bisect_right
+from collections import namedtuple
+from pathlib import Path
+
+try:
+    from game_log import get_logger
+except Exception:
+    from .game_log import get_logger
+
+log = get_logger('skills')
+
+SkillIndex = namedtuple('SkillIndex', (
+    'ids',            # skill ids in file order
+    'order',          # skill id -> position in file
+    'names',          # skill id -> display name
+    'unlock_levels',  # sorted required levels (parallel to level_skills)
+    'level_skills',   # skill ids sorted by required level
+    'required_levels',  # skill id -> required level (skills with a level requirement)
+    'item_unlocks',   # item id -> [skill ids]
+))
+
+_EMPTY = SkillIndex((), {}, {}, [], [], {}, {})
+_cache = {'mtime': None, 'index': _EMPTY}
+
+
+def _build(all_skills):
+    ids = []
+    names = {}
+    by_level = []
+    item_unlocks = {}
+    for skill in all_skills:
+        skill_id = skill.get('id')
+        if not skill_id:
+            continue
+        ids.append(skill_id)
+        names[skill_id] = skill.get('name', skill_id)
+        unlock_req = skill.get('unlock_requirements') or {}
+        if unlock_req.get('level'):
+            by_level.append((unlock_req['level'], len(ids) - 1, skill_id))
+        required_item = unlock_req.get('item_equipped')
+        if required_item:
+            item_unlocks.setdefault(required_item, []).append(skill_id)
+    # Stable: same level -> file order, like the old linear scan
+    by_level.sort()
+    return SkillIndex(
+        ids=tuple(ids),
+        order={skill_id: i for i, skill_id in enumerate(ids)},
+        names=names,
+        unlock_levels=[level for level, _, _ in by_level],
+        level_skills=[skill_id for _, _, skill_id in by_level],
+        required_levels={skill_id: level for level, _, skill_id in reversed(by_level)},
+        item_unlocks=item_unlocks,
+    )
+
+
+def get_skill_index():
+    """Current SkillIndex (rebuilt when skills.json changes)"""
+    try:
+        path = Path(__file__).resolve().parents[1] / 'data' / 'skills.json'
+        mtime = path.stat().st_mtime
+        if _cache['mtime'] != mtime:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # Handle both dict and array formats
+            if isinstance(data, dict) and 'skills' in data:
+                all_skills = data['skills']
+            elif isinstance(data, list):
+                all_skills = data
+            else:
+                all_skills = []
+            _cache['index'] = _build(all_skills)
+            _cache['mtime'] = mtime
+    except Exception as e:
+        log.warning("Failed to index skills.json: %s", e)
+    return _cache['index']
+
+
+def skills_for_levels(low, high):
+    """Skill ids whose required level is in (low, high]"""
+    index = get_skill_index()
+    start = bisect_right(index.unlock_levels, low)
+    end = bisect_right(index.unlock_levels, high)
+    return index.level_skills[start:end]
+
+
+def skills_for_item(item_id):
+    """Skill ids unlocked by equipping item_id"""
+    return get_skill_index().item_unlocks.get(item_id, ())
+
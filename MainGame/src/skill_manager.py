@@ -1,7 +1,19 @@
 # src/skill_manager.py
 import json
 from pathlib import Path
-import random
+
+try:
+    from effects import BUFF, DEBUFF, DOT, COUNTER, build_skill_templates
+    from combat_resolver import CombatResolver, combo_event, penetration_percent
+    from elements import element_index, bonus_vector
+    from game_log import get_logger
+except Exception:
+    from .effects import BUFF, DEBUFF, DOT, COUNTER, build_skill_templates
+    from .combat_resolver import CombatResolver, combo_event, penetration_percent
+    from .elements import element_index, bonus_vector
+    from .game_log import get_logger
+
+log = get_logger('skills')
 
 
 class SkillManager:
@@ -10,6 +22,16 @@ class SkillManager:
     def __init__(self, data_path=None):
         self.data_path = data_path or Path(__file__).resolve().parents[1] / 'data'
         self.skills = {}
+        # Skill id -> prebuilt effect templates (cloned onto targets when cast)
+        self.effect_templates = {}
+        # Shared damage pipeline (effect manager is passed per call)
+        self.combat = CombatResolver()
+        # Effectiveness matrix: skill id -> row of multipliers indexed by
+        # monster category (column 0 = category no skill cares about)
+        self.category_index = {}
+        self.effectiveness_rows = {}
+        # Skill id -> element index (for equipment damage type bonuses)
+        self.skill_element_index = {}
         self.load_skills()
     
     def load_skills(self):
@@ -21,11 +43,42 @@ class SkillManager:
                     data = json.load(f)
                     for skill in data.get('skills', []):
                         self.skills[skill['id']] = skill
+                        self.effect_templates[skill['id']] = build_skill_templates(skill)
+                self._build_effectiveness_matrix()
             else:
-                print(f"Warning: skills.json not found at {skills_path}")
+                log.warning("skills.json not found at %s", skills_path)
         except Exception as e:
-            print(f"Error loading skills: {e}")
+            log.error("Error loading skills: %s", e)
             self.skills = {}
+            self.effect_templates = {}
+    
+    def _build_effectiveness_matrix(self):
+        """Precompile strong_vs/weak_vs lists into per-skill multiplier rows"""
+        categories = [None]
+        for skill in self.skills.values():
+            effectiveness = skill.get('effectiveness') or {}
+            for category in list(effectiveness.get('strong_vs', [])) + list(effectiveness.get('weak_vs', [])):
+                if category not in categories:
+                    categories.append(category)
+        self.category_index = {category: i for i, category in enumerate(categories) if category is not None}
+        self.effectiveness_rows = {}
+        self.skill_element_index = {}
+        for skill_id, skill in self.skills.items():
+            self.effectiveness_rows[skill_id] = self._effectiveness_row(skill)
+            self.skill_element_index[skill_id] = element_index(skill.get('element', 'physical'))
+    
+    def _effectiveness_row(self, skill):
+        """Multiplier per category column: 1.5 strong, 0.5 weak, 1.0 otherwise"""
+        row = [1.0] * (len(self.category_index) + 1)
+        effectiveness = skill.get('effectiveness') or {}
+        for category in effectiveness.get('weak_vs', []):
+            if category in self.category_index:
+                row[self.category_index[category]] = 0.5  # 50% reduced damage
+        # strong_vs wins if a category is listed in both (same as the old if/elif)
+        for category in effectiveness.get('strong_vs', []):
+            if category in self.category_index:
+                row[self.category_index[category]] = 1.5  # 50% bonus damage
+        return row
     
     def get_skill(self, skill_id):
         """Get skill definition by ID"""
@@ -59,34 +112,49 @@ class SkillManager:
         
         return True, "OK"
     
-    def calculate_skill_damage(self, skill, caster, target, effect_manager=None):
-        """Calculate damage for a damage skill"""
+    def calculate_skill_damage(self, skill, caster, target, effect_manager=None, attacker=None, defender=None):
+        """Calculate damage for a damage skill
+        
+        attacker/defender are CombatResolver snapshots; they are built here
+        when not supplied by the caller.
+        """
         skill_type = skill.get('type')
         if skill_type not in ['damage']:
             return 0
         
-        base_power = skill.get('power', 0)
+        if attacker is None:
+            attacker = self.combat.snapshot_attacker(caster, effect_manager)
+        if defender is None:
+            defender = self.combat.snapshot_defender(target, effect_manager)
+        
+        raw_damage = self._skill_raw_damage(skill, caster, target, attacker)
+        
+        # Check for critical hit (caster's crit chance with overcrit mechanic)
+        is_crit, _, crit_mult = self.combat.roll_crit(attacker)
+        if is_crit:
+            raw_damage = int(raw_damage * crit_mult)
+        
+        # Calculate damage reduction (same formula as regular combat)
+        is_magic = skill.get('scaling_stat', 'atk') == 'magic_power'
+        pen_percent = self._skill_pen_percent(skill, attacker, is_magic)
+        dmg_dealt = self.combat.mitigate(defender, raw_damage, pen_percent, magic=is_magic)
+        
+        return dmg_dealt, is_crit
+    
+    def _skill_raw_damage(self, skill, caster, target, attacker, power=None):
+        """Pre-crit, pre-defense skill damage (power overrides skill['power'])"""
+        base_power = skill.get('power', 0) if power is None else power
         scaling_stat = skill.get('scaling_stat', 'atk')
         
         # Get skill level and apply damage bonus (25% per level)
-        skill_id = skill.get('id')
-        skill_level = self.get_skill_level(caster, skill_id)
+        skill_level = self.get_skill_level(caster, skill.get('id'))
         level_multiplier = 1 + (skill_level - 1) * 0.25
         
-        # Apply active effect modifiers to caster stats
-        stat_modifiers = {}
-        if effect_manager:
-            stat_modifiers = effect_manager.apply_active_effects(caster)
-        
-        # Get scaling stat value from caster with buffs applied
+        # Scaling stat value from the snapshot (buffs already applied)
+        stat_value = attacker.stat(scaling_stat)
         if scaling_stat == 'magic_power':
-            stat_value = getattr(caster, 'magic_power', 0) + stat_modifiers.get('magic_power', 0)
             # Magic skills scale 1.5x better with magic_power
             stat_value = int(stat_value * 1.5)
-        elif scaling_stat == 'atk':
-            stat_value = getattr(caster, 'atk', 0) + stat_modifiers.get('atk', 0)
-        else:
-            stat_value = getattr(caster, scaling_stat, 0) + stat_modifiers.get(scaling_stat, 0)
         
         # Base damage calculation: (base_power + stat_value) * level_multiplier
         raw_damage = int((base_power + stat_value) * level_multiplier)
@@ -96,98 +164,44 @@ class SkillManager:
         raw_damage = int(raw_damage * multiplier)
         
         # Apply damage type bonus from equipment
-        skill_element = skill.get('element', 'physical')
-        damage_type_bonus = self.get_damage_type_bonus(caster, skill_element)
+        skill_id = skill.get('id')
+        element = self.skill_element_index.get(skill_id) if self.skills.get(skill_id) is skill else None
+        if element is None:
+            # Skill dict not in the precomputed index (ad-hoc or added later)
+            element = element_index(skill.get('element', 'physical'))
+        damage_type_bonus = self._element_bonus(caster, element)
         if damage_type_bonus > 0:
             raw_damage = int(raw_damage * (1 + damage_type_bonus / 100.0))
-        
-        # Check for critical hit (caster's crit chance with overcrit mechanic)
-        is_crit = False
-        is_overcrit = False
-        try:
-            crit_chance = getattr(caster, 'critchance', 0.0)
-            base_crit_damage = getattr(caster, 'critdamage', 1.5)
-            
-            # Overcrit mechanic: crit chance >100%
-            if crit_chance > 1.0:
-                overcrit_amount = crit_chance - 1.0
-                # 1% crit damage per 1% overcrit
-                bonus_crit_damage = overcrit_amount
-                # 0.5% chance to deal 3x total crit damage
-                overcrit_chance = overcrit_amount * 0.5
-                effective_crit_chance = 1.0  # Always crit when >100%
-                effective_crit_damage = base_crit_damage + bonus_crit_damage
-                is_overcrit = random.random() < overcrit_chance
-            else:
-                effective_crit_chance = crit_chance
-                effective_crit_damage = base_crit_damage
-            
-            if random.random() < effective_crit_chance:
-                is_crit = True
-                crit_mult = effective_crit_damage * (3.0 if is_overcrit else 1.0)
-                raw_damage = int(raw_damage * crit_mult)
-        except Exception:
-            pass
-        
-        # Apply penetration and target defense
-        penetration = skill.get('penetration', 0.0)
-        if scaling_stat == 'magic_power':
-            # Magic skill - use magic penetration and magic defense
-            caster_pen = getattr(caster, 'magic_penetration', 0) + penetration
-            target_def = getattr(target, 'magic_defense', 0)
-        else:
-            # Physical skill - use physical penetration and defense
-            caster_pen = getattr(caster, 'penetration', 0) + penetration
-            target_def = getattr(target, 'defense', 0)
-        
-        # Calculate damage reduction (same formula as regular combat)
-        dmg_dealt = self._apply_defense(raw_damage, target_def, caster_pen)
-        
-        return dmg_dealt, is_crit
+        return raw_damage
     
-    def _apply_defense(self, dmg, defense, penetration):
-        """Apply defense reduction to damage (same as player/enemy take_damage)"""
-        # Calculate effective defense percentage (0-75%)
-        def calc_effective_stat(raw_value, soft_cap, hard_cap):
-            if raw_value <= soft_cap:
-                return raw_value
-            elif raw_value <= hard_cap:
-                excess = raw_value - soft_cap
-                return soft_cap + (excess * 0.5)
-            else:
-                excess = hard_cap - soft_cap
-                return soft_cap + (excess * 0.5)
-        
-        defense_percent = calc_effective_stat(defense, 30, 75)
-        pen_percent = calc_effective_stat(penetration, 50, 75) if penetration > 0 else 0
-        
-        # Penetration reduces defense effectiveness
-        effective_defense = defense_percent * (1.0 - (pen_percent / 100.0))
-        
-        # Apply damage reduction
-        damage_multiplier = 1.0 - (effective_defense / 100.0)
-        dmg_taken = max(1, int(dmg * damage_multiplier))
-        
-        return dmg_taken
+    @staticmethod
+    def _skill_pen_percent(skill, attacker, is_magic):
+        """Magic skills use magic penetration, physical skills physical penetration"""
+        penetration = skill.get('penetration', 0.0)
+        if penetration:
+            base_pen = attacker.magic_penetration if is_magic else attacker.penetration
+            return penetration_percent(base_pen + penetration)
+        return attacker.magic_pen_percent if is_magic else attacker.pen_percent
     
     def get_effectiveness_multiplier(self, skill, target):
         """Get effectiveness multiplier based on skill element vs target category"""
-        effectiveness = skill.get('effectiveness', {})
-        strong_vs = effectiveness.get('strong_vs', [])
-        weak_vs = effectiveness.get('weak_vs', [])
-        
-        target_category = getattr(target, 'category', None)
-        
-        if target_category in strong_vs:
-            return 1.5  # 50% bonus damage
-        elif target_category in weak_vs:
-            return 0.5  # 50% reduced damage
-        else:
+        row = self.effectiveness_rows.get(skill.get('id'))
+        if row is None or skill is not self.skills.get(skill.get('id')):
+            # Ad-hoc skill dict (not from skills.json): check its own lists
+            effectiveness = skill.get('effectiveness', {})
+            target_category = getattr(target, 'category', None)
+            if target_category in effectiveness.get('strong_vs', []):
+                return 1.5  # 50% bonus damage
+            if target_category in effectiveness.get('weak_vs', []):
+                return 0.5  # 50% reduced damage
             return 1.0  # Normal damage
+        return row[self.category_index.get(getattr(target, 'category', None), 0)]
     
     def apply_skill_effects(self, skill, caster, target, effect_manager):
         """Apply skill effects (buffs, debuffs, counters, heal, DoT)"""
-        effects = skill.get('effects', [])
+        templates = self.effect_templates.get(skill.get('id'))
+        if templates is None:
+            templates = build_skill_templates(skill)
         skill_type = skill.get('type')
         
         results = []
@@ -200,62 +214,29 @@ class SkillManager:
             actual_heal = caster.hp - old_hp
             results.append(('heal', actual_heal, caster))
         
-        # Apply all effects
-        for effect in effects:
-            effect_type = effect.get('type')
+        # Apply all effects (templates are cloned by add_effect)
+        for template in templates:
+            kind = template.kind
             
-            if effect_type == 'buff':
-                # Apply buff to caster (or target if specified)
-                buff_target = caster  # Skills typically buff caster
-                effect_manager.add_effect(buff_target, {
-                    'type': 'buff',
-                    'stat': effect.get('stat'),
-                    'value': effect.get('value'),
-                    'duration': effect.get('duration'),
-                    'source': skill.get('name', skill.get('id'))
-                })
-                results.append(('buff', effect.get('stat'), effect.get('value'), buff_target))
+            if kind == BUFF:
+                # Skills typically buff caster
+                effect_manager.add_effect(caster, template)
+                results.append(('buff', template.stat, template.value, caster))
             
-            elif effect_type == 'debuff':
+            elif kind == DEBUFF:
                 # Apply debuff to target
-                effect_manager.add_effect(target, {
-                    'type': 'debuff',
-                    'stat': effect.get('stat'),
-                    'value': effect.get('value'),
-                    'duration': effect.get('duration'),
-                    'source': skill.get('name', skill.get('id'))
-                })
-                results.append(('debuff', effect.get('stat'), effect.get('value'), target))
+                effect_manager.add_effect(target, template)
+                results.append(('debuff', template.stat, template.value, target))
             
-            elif effect_type == 'counter':
+            elif kind == COUNTER:
                 # Apply counter stance to caster - stores the skill info for turn 2
-                effect_manager.add_effect(caster, {
-                    'type': 'counter',
-                    'damage_percent': effect.get('damage_percent', 1.0),  # 100% of damage taken added to counter
-                    'duration': 2,  # Always 2 turns
-                    'source': skill.get('name', skill.get('id')),
-                    'skill_id': skill.get('id'),
-                    'skill_power': skill.get('power', 0),
-                    'skill_scaling_stat': skill.get('scaling_stat', 'atk'),
-                    'damage_stored': 0,  # Will store damage taken during counter stance
-                    'turn_count': 0  # Track which turn of counter we're on
-                })
-                results.append(('counter', effect.get('damage_percent'), caster))
+                effect_manager.add_effect(caster, template)
+                results.append(('counter', template.damage_percent, caster))
             
-            elif effect_type == 'dot':
-                # Apply damage over time to target
-                # Determine damage type based on skill element
-                skill_element = skill.get('element', 'physical')
-                damage_type = 'magic' if skill_element in ['fire', 'ice', 'arcane', 'light', 'dark'] else 'physical'
-                
-                effect_manager.add_effect(target, {
-                    'type': 'dot',
-                    'damage': effect.get('damage'),
-                    'damage_type': damage_type,
-                    'duration': effect.get('duration'),
-                    'source': skill.get('name', skill.get('id'))
-                }, caster=caster)
-                results.append(('dot', effect.get('damage'), target))
+            elif kind == DOT:
+                # Apply damage over time to target (damage type comes from skill element)
+                effect_manager.add_effect(target, template, caster=caster)
+                results.append(('dot', template.damage, target))
         
         return results
     
@@ -314,48 +295,33 @@ class SkillManager:
         return result, "Success"
     
     def _execute_multi_hit_skill(self, skill, caster, target, effect_manager, skill_level, damage_events=None):
-        """Execute a multi-hit skill with separate damage calculations per hit"""
-        import time
-        
+        """Execute a multi-hit skill (all hits resolved in one batched pass)"""
         multi_hit_data = skill.get('multi_hit', {})
         num_hits = multi_hit_data.get('hits', 3)
         damage_per_hit = multi_hit_data.get('damage_per_hit', 0.4)
         
-        total_damage = 0
-        crit_count = 0
-        hit_count = 0
-        
-        # Create a copy of the skill to modify power temporarily
-        skill_copy = skill.copy()
-        original_power = skill.get('power', 0)
-        
-        # Execute each hit
-        for hit_num in range(num_hits):
-            if target.hp <= 0:
-                break
-            
-            # Calculate damage for this hit (with reduced power)
-            skill_copy['power'] = int(original_power * damage_per_hit)
-            
-            hit_damage, is_crit = self.calculate_skill_damage(skill_copy, caster, target, effect_manager)
-            target.hp = max(0, target.hp - hit_damage)
-            
-            total_damage += hit_damage
-            if is_crit:
-                crit_count += 1
-            hit_count += 1
-            
-            # Register damage event for UI if available
-            if damage_events is not None:
-                try:
-                    damage_events.append({
-                        'target': 'enemy',
-                        'amount': int(hit_damage),
-                        'time': time.time(),
-                        'is_crit': bool(is_crit),
-                    })
-                except Exception:
-                    pass
+        # Stats captured once; raw per-hit damage computed once (reduced power)
+        attacker = self.combat.snapshot_attacker(caster, effect_manager)
+        defender = self.combat.snapshot_defender(target, effect_manager)
+        raw_per_hit = self._skill_raw_damage(skill, caster, target, attacker,
+                                             power=int(skill.get('power', 0) * damage_per_hit))
+        is_magic = skill.get('scaling_stat', 'atk') == 'magic_power'
+        
+        # Resolve all hits in one batched pass (stops at the overkill point);
+        # crit damage truncates like calculate_skill_damage
+        combo = self.combat.resolve_multi_hit(attacker, defender, raw_per_hit, num_hits,
+                                              pen_percent=self._skill_pen_percent(skill, attacker, is_magic),
+                                              magic=is_magic, crit_round=int)
+        total_damage = combo.total
+        crit_count = combo.crit_count
+        hit_count = len(combo.hits)
+        
+        # Register one aggregated damage event for UI if available
+        if damage_events is not None and combo.hits:
+            try:
+                damage_events.append(combo_event(combo))
+            except Exception:
+                pass
         
         # Apply effects only once after all hits
         effect_results = self.apply_skill_effects(skill, caster, target, effect_manager)
@@ -398,40 +364,26 @@ class SkillManager:
         Returns:
             Total bonus percentage (e.g., 20 for +20%)
         """
-        total_bonus = 0.0
-        
+        return self._element_bonus(caster, element_index(element))
+    
+    def _element_bonus(self, caster, index):
+        """Bonus percentage for an element index: two list lookups for a Player"""
         if not hasattr(caster, 'equipment'):
-            return total_bonus
+            return 0.0
         
-        # Load item data helper
-        def load_item_data(item_id):
-            if not item_id:
-                return None
-            try:
-                import json
-                from pathlib import Path
-                base = Path(__file__).resolve().parents[1]
-                items_path = base / 'data' / 'items.json'
-                with open(items_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for item in data.get('items', []):
-                        if item.get('id') == item_id:
-                            return item
-            except Exception:
-                pass
-            return None
-        
-        # Check all equipment slots
-        for slot_name, item_id in caster.equipment.items():
-            if not item_id:
-                continue
-            item_data = load_item_data(item_id)
-            if not item_data:
-                continue
-            
-            # Get damage type bonuses from this item
-            damage_bonuses = item_data.get('damage_type_bonuses', {})
-            if element in damage_bonuses:
-                total_bonus += float(damage_bonuses[element])
-        
-        return total_bonus
+        # Per-player vector, rebuilt only when equipment changes
+        get_vector = getattr(caster, 'get_element_bonus_vector', None)
+        if get_vector is not None:
+            vector = get_vector()
+        else:
+            vector = bonus_vector(self._equipment_bonuses(caster))
+        return vector[index] if index < len(vector) else 0.0
+    
+    @staticmethod
+    def _equipment_bonuses(caster):
+        """damage_type_bonuses dicts of a non-Player caster's equipment"""
+        loader = getattr(caster, '_load_item_by_id', None)
+        if loader is None:
+            return []
+        items = (loader(item_id) for item_id in caster.equipment.values() if item_id)
+        return [item.get('damage_type_bonuses') for item in items if item]
@@ -0,0 +1,107 @@
+# src/startup_profile.py
+"""Startup timeline and post-first-frame deferred loading.
+
+main.py marks each startup step on a StartupTimeline; with
+`--startup-profile` the timeline (offset from main.py start and duration
+of every step, including time-to-first-frame) is printed and written to
+profiles/startup_<time>.txt once the deferred work is done.
+
+DeferredTasks holds non-critical loads (sprites, sound effects) that run
+after the first frame is on screen, one per frame, so the window shows up
+before they are decoded.
+"""
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+FLAG = '--startup-profile'
+
+
+class StartupTimeline:
+    def __init__(self, enabled=False, start=None, clock=time.perf_counter):
+        self.enabled = enabled
+        self.clock = clock
+        self.start = clock() if start is None else start
+        self._last = self.start
+        self.steps = []
+        self.reported = False
+        self._first_frame = False
+
+    @classmethod
+    def from_argv(cls, argv, start=None):
+        return cls(FLAG in argv, start=start)
+
+    def mark(self, label):
+        """Close the step that ends now"""
+        now = self.clock()
+        self.steps.append((label, (now - self.start) * 1000.0, (now - self._last) * 1000.0))
+        self._last = now
+
+    def first_frame(self):
+        """Mark 'first frame' the first time it is called"""
+        if not self._first_frame:
+            self._first_frame = True
+            self.mark('first frame')
+
+    def elapsed(self, label):
+        """Offset (ms) at which step `label` ended, or None"""
+        for step, at, _ in self.steps:
+            if step == label:
+                return at
+        return None
+
+    def report(self):
+        lines = ["🚀 Startup timeline (ms since main.py started)",
+                 f"{'at':>9} {'step':>9}  phase"]
+        for label, at, step in self.steps:
+            lines.append(f"{at:9.1f} {step:9.1f}  {label}")
+        first_frame = self.elapsed('first frame')
+        if first_frame is not None:
+            lines.append(f"Time to first frame: {first_frame:.1f} ms")
+        return "\n".join(lines) + "\n"
+
+    def finish(self, directory=None):
+        """Print and save the report once (no-op unless --startup-profile)"""
+        if not self.enabled or self.reported:
+            return None
+        self.reported = True
+        text = self.report()
+        print(text)
+        if directory is None:
+            return None
+        path = Path(directory) / f"startup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        except Exception as e:
+            print(f"Startup profile write failed: {e}")
+        return path
+
+
+class DeferredTasks:
+    """(label, fn) loads run after the first frame, one per call to run_next()"""
+
+    def __init__(self, timeline=None):
+        self.timeline = timeline
+        self.pending = deque()
+
+    def add(self, label, fn):
+        self.pending.append((label, fn))
+
+    def __len__(self):
+        return len(self.pending)
+
+    def run_next(self):
+        """Run one pending task; returns False once nothing is left"""
+        if not self.pending:
+            return False
+        label, fn = self.pending.popleft()
+        try:
+            fn()
+        except Exception as e:
+            print(f"Deferred load failed ({label}): {e}")
+        if self.timeline:
+            self.timeline.mark(f"deferred: {label}")
+        return True
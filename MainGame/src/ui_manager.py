@@ -109,24 +109,32 @@ class UIManager:
         # Skill images cache: {skill_id: pygame.Surface}
         self.skill_images = {}
         self.skill_image_load_attempted = set()
-        # Player character image
-        self.player_image = None
-        try:
-            if self.assets_path:
-                player_path = self.assets_path / "images" / "characters" / "mage.png"
-                if player_path.exists():
-                    loaded_img = pygame.image.load(str(player_path)).convert_alpha()
-                    # Scale to reasonable size (max 200x200 for player)
-                    orig_w, orig_h = loaded_img.get_size()
-                    max_size = 200
-                    if orig_w > max_size or orig_h > max_size:
-                        scale = min(max_size / orig_w, max_size / orig_h)
-                        new_w = int(orig_w * scale)
-                        new_h = int(orig_h * scale)
-                        loaded_img = pygame.transform.smoothscale(loaded_img, (new_w, new_h))
-                    self.player_image = loaded_img
-        except Exception:
-            self.player_image = None
+        # Player character image (decoded on first use, see player_image)
+        self._player_image = None
+        self._player_image_loaded = False
+
+    @property
+    def player_image(self):
+        """Player portrait scaled to at most 200x200, loaded on first access"""
+        if not self._player_image_loaded:
+            self._player_image_loaded = True
+            try:
+                if self.assets_path:
+                    player_path = self.assets_path / "images" / "characters" / "mage.png"
+                    if player_path.exists():
+                        loaded_img = pygame.image.load(str(player_path)).convert_alpha()
+                        # Scale to reasonable size (max 200x200 for player)
+                        orig_w, orig_h = loaded_img.get_size()
+                        max_size = 200
+                        if orig_w > max_size or orig_h > max_size:
+                            scale = min(max_size / orig_w, max_size / orig_h)
+                            new_w = int(orig_w * scale)
+                            new_h = int(orig_h * scale)
+                            loaded_img = pygame.transform.smoothscale(loaded_img, (new_w, new_h))
+                        self._player_image = loaded_img
+            except Exception:
+                self._player_image = None
+        return self._player_image
 
     def _blit_text_outlined(self, surface, font, text, pos, fg=(255,255,255), outline=(0,0,0), outline_width=2, center=False):
         """Render text with a simple outline by drawing the outline color around the text.
@@ -177,6 +185,14 @@ class UIManager:
             surface.blit(s, r)
             return r
 
+    def open_modal(self):
+        """Name of the open full-screen panel, or None"""
+        for name, is_open in (('character_sheet', self.character_sheet_open), ('skills', self.skills_ui_open),
+                              ('crafting', self.crafting_ui_open), ('allocation', self.allocation_open)):
+            if is_open:
+                return name
+        return None
+
     def set_actions(self, battle):
         screen_width, screen_height = self.screen.get_size()
         # Bouton d'attaque (stocke la référence à la méthode du battle)
@@ -405,6 +421,10 @@ class UIManager:
                     else:
                         # Damage counter
                         text = f"-{ev.get('amount', 0)}"
+                        # Batched multi-hit: one float with the hit count
+                        hits = ev.get('hits')
+                        if hits and len(hits) > 1:
+                            text += f" x{len(hits)}"
                         if ev.get('is_crit'):
                             color = (255, 60, 60)
                         else:
@@ -1552,15 +1572,10 @@ class UIManager:
                         
                         def make_use(iid=sel['item_id'], qty=actual_amount):
                             def act():
-                                # Use multiple items
+                                # Use multiple items in one transaction
                                 effect_mgr = getattr(battle, 'effect_manager', None) if battle else None
                                 old_hp = getattr(player, 'hp', 0)
-                                used_count = 0
-                                for _ in range(qty):
-                                    if player.use_item(iid, effect_mgr):
-                                        used_count += 1
-                                    else:
-                                        break
+                                used_count = player.use_items(iid, qty, effect_mgr)
                                 
                                 new_hp = getattr(player, 'hp', 0)
                                 heal_amount = new_hp - old_hp
@@ -1615,35 +1630,19 @@ class UIManager:
                         open_text = self.small_font.render(label, True, (255, 255, 255))
                         self.screen.blit(open_text, open_text.get_rect(center=open_rect.center))
                         
-                        def make_open(iid=sel['item_id'], idef=sel.get('def'), qty=actual_amount):
+                        def make_open(iid=sel['item_id'], qty=actual_amount):
                             def act():
-                                # Open multiple containers
-                                all_granted = []
-                                for _ in range(qty):
-                                    if player.has_item(iid):
-                                        granted = player.open_container(idef)
-                                        player.remove_item(iid, 1)
-                                        all_granted.extend(granted)
-                                    else:
-                                        break
+                                # Open multiple containers in one transaction (aggregated grants)
+                                opened, granted = player.open_containers(iid, qty)
                                 
                                 # Add combat log messages if battle exists
-                                if battle and hasattr(battle, 'add_log') and all_granted:
-                                    # Aggregate results
-                                    skill_upgrades = {}
-                                    item_counts = {}
-                                    for grant_type, grant_id, qty_or_level in all_granted:
-                                        if grant_type == 'skill':
-                                            if grant_id not in skill_upgrades:
-                                                skill_upgrades[grant_id] = []
-                                            skill_upgrades[grant_id].append(qty_or_level)
-                                        elif grant_type == 'item':
-                                            item_counts[grant_id] = item_counts.get(grant_id, 0) + qty_or_level
-                                    
-                                    for skill_id, levels in skill_upgrades.items():
-                                        battle.add_log(f"Skill: {skill_id} (x{len(levels)} upgrades)!", 'buff')
-                                    for item_id, total_qty in item_counts.items():
-                                        battle.add_log(f"Received: {item_id} x{total_qty}!", 'info')
+                                if battle and hasattr(battle, 'add_log') and granted:
+                                    battle.add_log(f"Opened {sel['def'].get('name', iid)} x{opened}", 'info')
+                                    for grant in granted:
+                                        if grant[0] == 'skill':
+                                            battle.add_log(f"Skill: {grant[1]} (x{grant[2]} upgrades)!", 'buff')
+                                        else:
+                                            battle.add_log(f"Received: {grant[1]} x{grant[2]}!", 'info')
                                 
                                 self.inventory_selected = None
                             return act
@@ -2063,14 +2062,14 @@ class UIManager:
         if not crafting_system:
             # No crafting system available
             error_text = "Crafting system not available"
-            self._blit_text_outlined(self.screen, self.title_font, error_text, (modal_x + modal_w // 2, modal_y + modal_h // 2), fg=(255,100,100), outline=(0,0,0), outline_width=2, center=True)
+            self._blit_text_outlined(self.screen, self.title_font, error_text, (modal_x + modal_w // 2, content_y + content_h // 2), fg=(255,100,100), outline=(0,0,0), outline_width=2, center=True)
             return
         
         recipes = crafting_system.get_all_recipes()
         if not recipes:
             # No recipes available
             error_text = "No recipes available"
-            self._blit_text_outlined(self.screen, self.title_font, error_text, (modal_x + modal_w // 2, modal_y + modal_h // 2), fg=(255,100,100), outline=(0,0,0), outline_width=2, center=True)
+            self._blit_text_outlined(self.screen, self.title_font, error_text, (modal_x + modal_w // 2, content_y + content_h // 2), fg=(255,100,100), outline=(0,0,0), outline_width=2, center=True)
             return
         
         # Get player's inventory
@@ -2108,6 +2107,10 @@ class UIManager:
         entry_h = 70
         entry_pad = 5
         
+        # Max craftable counts (sub-recipes included) for the visible page only
+        max_counts = crafting_system.get_max_craftable(player_inventory, player_level,
+                                                       [r.get('id') for r in page_recipes])
+        
         for recipe in page_recipes:
             recipe_id = recipe.get('id')
             recipe_name = recipe.get('name', recipe_id)
@@ -2148,8 +2151,17 @@ class UIManager:
             self._blit_text_outlined(self.screen, self.small_font, cat_text, (entry_rect.x + 8, entry_rect.y + 28), fg=cat_color, outline=(0,0,0), outline_width=1)
             
             # Craftable status
-            status_text = "✓ Can Craft" if can_craft else f"✗ {reason}"
-            status_color = (100, 255, 100) if can_craft else (255, 100, 100)
+            max_count = max_counts.get(recipe_id, 0)
+            if can_craft:
+                status_text = f"✓ Can Craft (x{max_count})"
+                status_color = (100, 255, 100)
+            elif max_count > 0:
+                # Missing ingredients can be crafted from what the player has
+                status_text = f"⚒ Via sub-recipes (x{max_count})"
+                status_color = (255, 220, 100)
+            else:
+                status_text = f"✗ {reason}"
+                status_color = (255, 100, 100)
             self._blit_text_outlined(self.screen, self.small_font, status_text[:25], (entry_rect.x + 8, entry_rect.y + 48), fg=status_color, outline=(0,0,0), outline_width=1)
             
             # Click to select
@@ -2259,42 +2271,58 @@ class UIManager:
                     self._blit_text_outlined(self.screen, self.small_font, level_text, (detail_x + 15, dy), fg=level_color, outline=(0,0,0), outline_width=1)
                     dy += 30
                 
-                # Craft button
-                can_craft, reason = crafting_system.can_craft(self.crafting_selected_recipe, player_inventory, player_level)
+                # Craft buttons (x1 / x5 / x10 / Max), each one transaction
+                selected_id = self.crafting_selected_recipe
+                can_craft, reason = crafting_system.can_craft(selected_id, player_inventory, player_level)
+                max_count = crafting_system.get_max_craftable(player_inventory, player_level, [selected_id]).get(selected_id, 0)
+                # Amounts above what the inventory covers directly craft missing intermediates first
+                direct_count = crafting_system.get_direct_craftable(selected_id, player_inventory, player_level)
                 
                 craft_btn_w = 200
                 craft_btn_h = 50
                 craft_btn_x = detail_x + (detail_w - craft_btn_w) // 2
                 craft_btn_y = detail_y + detail_h - craft_btn_h - 20
                 
-                craft_rect = pygame.Rect(craft_btn_x, craft_btn_y, craft_btn_w, craft_btn_h)
-                
-                if can_craft:
-                    pygame.draw.rect(self.screen, (80, 180, 80), craft_rect, border_radius=8)
-                    craft_text = "CRAFT"
-                    text_color = (0, 0, 0)
-                    
-                    def craft_action():
-                        success, msg, result_item, result_count = crafting_system.craft_item(
-                            self.crafting_selected_recipe,
-                            player_inventory,
-                            player_level
-                        )
-                        if success and battle:
-                            battle.add_log(msg, 'buff')
-                        elif not success and battle:
-                            battle.add_log(msg, 'info')
-                    
-                    self.crafting_ui_buttons.append({'rect': craft_rect, 'action': craft_action})
+                if max_count > 0:
+                    amounts = [1, 5, 10, max_count]
+                    labels = ['x1', 'x5', 'x10', 'Max']
+                    btn_w = 70
+                    btn_spacing = 8
+                    row_x = detail_x + (detail_w - (btn_w * 4 + btn_spacing * 3)) // 2
+                    for i, (amount, label) in enumerate(zip(amounts, labels)):
+                        if amount > max_count:
+                            continue  # Skip if not enough ingredients
+                        btn_rect = pygame.Rect(row_x + i * (btn_w + btn_spacing), craft_btn_y, btn_w, craft_btn_h)
+                        use_sub_recipes = amount > direct_count
+                        color = (200, 170, 60) if use_sub_recipes else (80, 180 - i * 10, 80)
+                        pygame.draw.rect(self.screen, color, btn_rect, border_radius=8)
+                        self._blit_text_outlined(self.screen, self.small_font, label, btn_rect.center, fg=(0, 0, 0), outline=(255, 255, 255), outline_width=1, center=True)
+                        
+                        def make_craft(rid=selected_id, qty=amount, chain=use_sub_recipes):
+                            def craft_action():
+                                success, msg, result_item, result_count = crafting_system.craft_bulk(
+                                    rid,
+                                    qty,
+                                    player_inventory,
+                                    player_level,
+                                    use_sub_recipes=chain
+                                )
+                                if success and battle:
+                                    battle.add_log(msg, 'buff')
+                                elif not success and battle:
+                                    battle.add_log(msg, 'info')
+                            return craft_action
+                        
+                        self.crafting_ui_buttons.append({'rect': btn_rect, 'action': make_craft()})
+                    if max_count > direct_count:
+                        chain_note = "Crafts missing ingredients first" if direct_count == 0 else f"Above x{direct_count}: crafts missing ingredients first"
+                        self._blit_text_outlined(self.screen, self.small_font, chain_note, (detail_x + detail_w // 2, craft_btn_y - 25), fg=(255, 220, 100), outline=(0,0,0), outline_width=1, center=True)
                 else:
+                    craft_rect = pygame.Rect(craft_btn_x, craft_btn_y, craft_btn_w, craft_btn_h)
                     pygame.draw.rect(self.screen, (80, 80, 80), craft_rect, border_radius=8)
-                    craft_text = "CANNOT CRAFT"
-                    text_color = (150, 150, 150)
-                
-                self._blit_text_outlined(self.screen, self.title_font, craft_text, craft_rect.center, fg=text_color, outline=(0,0,0) if can_craft else (50,50,50), outline_width=2, center=True)
-                
-                # Show reason if can't craft
-                if not can_craft:
+                    self._blit_text_outlined(self.screen, self.title_font, "CANNOT CRAFT", craft_rect.center, fg=(150, 150, 150), outline=(50,50,50), outline_width=2, center=True)
+                    
+                    # Show reason if can't craft
                     reason_y = craft_btn_y - 25
                     self._blit_text_outlined(self.screen, self.small_font, reason, (detail_x + detail_w // 2, reason_y), fg=(255, 150, 100), outline=(0,0,0), outline_width=1, center=True)
     
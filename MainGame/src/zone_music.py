@@ -0,0 +1,118 @@
+# src/zone_music.py
+"""Per-zone background music streamed with pygame.mixer.music.
+
+Each zone in zones.json may list tracks (files in assets/sounds/music):
+    "music": ["flower_field.ogg", "meadow.ogg"]
+No tracks ship with the game: zones without a "music" key (or whose files
+are missing) stay silent. The zone's tracks play in order and loop.
+`mixer.music` streams from disk in the mixer's audio thread, so no track is
+decoded up front on the main thread and memory use does not depend on
+track length.
+
+The main loop calls `update(battle.current_zone)` every frame. On a zone
+change the current track fades out (volume stepped per frame, nothing
+blocks), then the new zone's first track fades in. mixer.music has a single
+stream, so the crossfade is out-then-in rather than overlapping.
+"""
+import time
+from pathlib import Path
+
+import pygame
+
+try:
+    from game_log import get_logger
+except Exception:
+    from .game_log import get_logger
+
+log = get_logger('audio')
+
+MUSIC_DIR = Path(__file__).resolve().parents[1] / 'assets' / 'sounds' / 'music'
+FADE_MS = 1500
+
+
+class ZoneMusic:
+    def __init__(self, music_dir=MUSIC_DIR, volume=0.8, fade_ms=FADE_MS, clock=time.monotonic):
+        self.music_dir = Path(music_dir)
+        self.volume = max(0.0, min(1.0, float(volume)))
+        self.fade = fade_ms / 1000.0
+        self.clock = clock
+        self.zone_id = None
+        self.tracks = []
+        self.index = 0
+        self.current = None
+        # 'idle' (nothing playing), 'playing' or 'fading' (out, before the next zone)
+        self.state = 'idle'
+        self._fade_start = 0.0
+        self._missing = set()
+
+    def playlist(self, zone):
+        """Existing track paths of a zone's "music" list"""
+        tracks = []
+        names = (zone or {}).get('music') or []
+        if isinstance(names, str):
+            names = [names]
+        for name in names:
+            path = self.music_dir / name
+            if path.exists():
+                tracks.append(path)
+            elif name not in self._missing:
+                self._missing.add(name)
+                log.debug("Music track not found: %s", path)
+        return tracks
+
+    def update(self, zone, now=None):
+        """Call once per frame with the current zone"""
+        if not pygame.mixer.get_init():
+            return
+        now = self.clock() if now is None else now
+        zone_id = zone.get('id', zone.get('name')) if zone else None
+        if zone_id != self.zone_id:
+            self.zone_id = zone_id
+            self.tracks = self.playlist(zone)
+            self.index = 0
+            if self.state == 'playing':
+                self.state = 'fading'
+                self._fade_start = now
+            elif self.state == 'idle':
+                self._play_next()
+
+        if self.state == 'fading':
+            progress = (now - self._fade_start) / self.fade if self.fade > 0 else 1.0
+            if progress >= 1.0:
+                pygame.mixer.music.stop()
+                self._play_next()
+            else:
+                pygame.mixer.music.set_volume(self.volume * (1.0 - progress))
+        elif self.state == 'playing' and not pygame.mixer.music.get_busy():
+            # Track ended: next one of the same zone
+            self.index += 1
+            self._play_next()
+
+    def _play_next(self):
+        while self.tracks:
+            self.index %= len(self.tracks)
+            path = self.tracks[self.index]
+            try:
+                pygame.mixer.music.load(str(path))
+                pygame.mixer.music.set_volume(self.volume)
+                pygame.mixer.music.play(fade_ms=int(self.fade * 1000))
+            except Exception as e:
+                log.warning("Could not play music %s: %s", path.name, e)
+                self.tracks.pop(self.index)
+                continue
+            self.current = path
+            self.state = 'playing'
+            return
+        self.current = None
+        self.state = 'idle'
+
+    def set_volume(self, volume):
+        self.volume = max(0.0, min(1.0, float(volume)))
+        if self.state == 'playing' and pygame.mixer.get_init():
+            pygame.mixer.music.set_volume(self.volume)
+
+    def stop(self):
+        if pygame.mixer.get_init():
+            pygame.mixer.music.stop()
+        self.current = None
+        self.state = 'idle'
@@ -0,0 +1,65 @@
+# src/zones.py
+"""Zone selection shared by the game loop and fast-forward mode"""
+import random
+
+
+def select_zone(wave, zones, current_zone=None):
+    """Select a zone based on wave number and spawn chances"""
+    if not zones:
+        return None
+    
+    # Filter zones by minimum wave
+    available_zones = [z for z in zones if z.get('min_wave', 1) <= wave]
+    if not available_zones:
+        return None
+    
+    # For wave 1, always select a starting zone
+    if wave == 1:
+        # Prefer zones with min_wave=1
+        starting_zones = [z for z in available_zones if z.get('min_wave', 1) == 1]
+        if starting_zones:
+            total_chance = sum(z.get('spawn_chance', 1) for z in starting_zones)
+            if total_chance > 0:
+                roll = random.random() * total_chance
+                current = 0
+                for zone in starting_zones:
+                    current += zone.get('spawn_chance', 1)
+                    if roll <= current:
+                        return zone
+            return random.choice(starting_zones)
+        return random.choice(available_zones)
+    
+    # Only consider zone changes every 25 waves (not random)
+    if wave % 25 != 0:
+        return current_zone  # Keep current zone
+    
+    # At wave 25, 50, 75, etc., roll for zone change based on spawn_chance
+    # Roll for each zone: random() * spawn_chance, pick highest
+    zone_rolls = []
+    for zone in available_zones:
+        spawn_chance = zone.get('spawn_chance', 1)
+        roll = random.random() * spawn_chance
+        zone_rolls.append((roll, zone))
+    
+    # Sort by roll value (highest first)
+    zone_rolls.sort(key=lambda x: x[0], reverse=True)
+    
+    # Get the highest roll
+    highest_roll = zone_rolls[0][0]
+    
+    # Find all zones with the same highest roll (ties)
+    tied_zones = [zone for roll, zone in zone_rolls if roll == highest_roll]
+    
+    # If multiple zones tied, pick randomly between them
+    return random.choice(tied_zones)
+
+
+def resolve_zone_for_wave(wave, zones):
+    """Resolve a stable zone for the current wave when no saved zone is available."""
+    if not zones:
+        return None
+    eligible = [z for z in zones if z.get('min_wave', 1) <= wave]
+    if not eligible:
+        return None
+    # Pick the zone with the highest min_wave to represent the last unlocked zone.
+    return max(eligible, key=lambda z: z.get('min_wave', 1))
@@ -0,0 +1,96 @@
+"""Test the shared audio bank (decode once, PCM cache, voice limits)"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# Add src directory to path
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+import pygame
+import audio_bank
+from audio_bank import AudioBank, get_audio_bank
+from player import Player
+from battle_system import BattleSystem
+
+
+def _init_mixer(channels):
+    pygame.mixer.init()
+    pygame.mixer.set_num_channels(channels)
+
+
+def test_decode_once_and_pcm_cache():
+    """First bank decodes the MP3s and writes PCM; the next one reads it back"""
+    print("\n=== Test 1: Decode Once + PCM Cache ===")
+    _init_mixer(16)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            first = AudioBank(cache_dir=tmp)
+            sounds = first.load()
+            assert set(sounds) == {'monster_hit', 'player_hit', 'monster_kill'}
+            assert first.load() is sounds
+            assert first.stats['decoded'] == 3 and first.stats['cached'] == 0
+            assert len(list(Path(tmp).glob('*.pcm'))) == 3
+
+            second = AudioBank(cache_dir=tmp)
+            second.load()
+            assert second.stats['decoded'] == 0 and second.stats['cached'] == 3
+            for key, sound in sounds.items():
+                assert second.sounds[key].get_length() == sound.get_length()
+
+        # Every BattleSystem (e.g. each Retry) shares the process-wide bank
+        battles = [BattleSystem(Player({"name": "Retry", "hp": 100})) for _ in range(2)]
+        assert battles[0].load_sounds() is battles[1].load_sounds() is get_audio_bank().sounds
+    finally:
+        # Its sounds die with the mixer
+        audio_bank._bank = None
+        pygame.mixer.quit()
+    print("✓ PASS: Decoded once")
+
+
+def test_voice_limits_and_priority():
+    """Hit spam restarts its own voices; higher priority takes lower channels"""
+    print("\n=== Test 2: Voice Limits ===")
+    _init_mixer(4)
+    try:
+        bank = AudioBank()
+        bank.load()
+        for _ in range(6):
+            assert bank.play('monster_hit') is not None
+        assert bank.stats['restarted'] == 3, bank.stats
+        assert sum(1 for voice in bank._live_voices() if voice[1] == 'monster_hit') == 3
+
+        bank.play('player_hit')
+        assert bank.play('monster_kill') is not None, "Kill takes a hit's channel"
+        assert bank.stats['stolen'] == 1
+        assert bank.play('monster_kill') is not None
+        bank.play('monster_hit')
+        assert bank.stats['dropped'] == 1, "No lower-priority channel left for a hit"
+        keys = sorted(voice[1] for voice in bank._live_voices())
+        print(keys, bank.stats)
+        assert keys == ['monster_hit', 'monster_kill', 'monster_kill', 'player_hit']
+    finally:
+        pygame.mixer.quit()
+    print("✓ PASS: Voices limited")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing Audio Bank")
+    print("=" * 60)
+
+    try:
+        test_decode_once_and_pcm_cache()
+        test_voice_limits_and_priority()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,80 @@
+"""Test the benchmark harness (percentiles, baselines, regression checks)"""
+import sys
+import tempfile
+from pathlib import Path
+
+# Add benchmarks directory to path (the harness adds src)
+sys.path.insert(0, str(Path(__file__).parent / 'benchmarks'))
+
+from harness import percentile, summarize, compare_results, save_results, load_results, time_call, quiet
+
+
+def test_percentiles():
+    """Interpolated percentiles over per-call samples"""
+    print("\n=== Test 1: Percentiles ===")
+    samples = list(range(1, 101))
+    assert percentile(samples, 50) == 50.5
+    assert percentile(samples, 0) == 1 and percentile(samples, 100) == 100
+    assert abs(percentile(samples, 95) - 95.05) < 1e-9
+    summary = summarize([3.0, 1.0, 2.0])
+    assert (summary['p50'], summary['min'], summary['samples']) == (2.0, 1.0, 3)
+    assert len(time_call(lambda: None, repeat=4, min_batch=0.001)) == 4
+    print("✓ PASS: p50/p95/p99")
+
+
+def test_compare_flags_regressions():
+    """Slower than the threshold is a regression; new and missing are reported"""
+    print("\n=== Test 2: Baseline Compare ===")
+    baseline = {'a': {'p50': 1.0}, 'b': {'p50': 1.0}, 'c': {'p50': 1.0}, 'gone': {'p50': 1.0}}
+    current = {'a': {'p50': 1.1}, 'b': {'p50': 1.5}, 'c': {'p50': 0.5}, 'added': {'p50': 2.0}}
+    status = {row[0]: row[4] for row in compare_results(baseline, current, threshold=0.2)}
+    print(f"Statuses: {status}")
+    assert status == {'a': 'ok', 'b': 'regression', 'c': 'faster', 'added': 'new', 'gone': 'missing'}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'baselines' / 'suite.json'
+        with quiet():
+            save_results(path, 'suite', current)
+        assert load_results(path) == current
+    print("✓ PASS: Regressions flagged")
+
+
+def test_hot_path_benchmarks_run():
+    """Every hot-path benchmark sets up and runs once"""
+    print("\n=== Test 3: Hot-Path Suite ===")
+    import bench_hot_paths
+    with quiet():
+        for name, factory in bench_hot_paths.BENCHMARKS:
+            factory()()
+    print(f"✓ PASS: {len(bench_hot_paths.BENCHMARKS)} benchmarks run")
+
+
+def test_ui_frame_benchmarks_run():
+    """Every screen renders a frame headless (SDL dummy video driver)"""
+    print("\n=== Test 4: UI Frames ===")
+    import bench_ui_frames
+    with quiet():
+        for name, factory in bench_ui_frames.BENCHMARKS:
+            factory()()
+    print(f"✓ PASS: {len(bench_ui_frames.BENCHMARKS)} screens rendered")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing Benchmark Harness")
+    print("=" * 60)
+
+    try:
+        test_percentiles()
+        test_compare_flags_regressions()
+        test_hot_path_benchmarks_run()
+        test_ui_frame_benchmarks_run()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
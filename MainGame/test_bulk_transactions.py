@@ -0,0 +1,173 @@
+"""Test bulk craft / open / use transactions"""
+import sys
+import time
+import random
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from player import Player
+from crafting_system import CraftingSystem
+from crafting_planner import CraftingPlanner
+from effect_manager import EffectManager
+
+
+def test_bulk_use():
+    """N potions in one call end where N single uses end"""
+    print("\n=== Test 1: Bulk Use ===")
+    one_by_one = Player({"name": "Single", "hp": 500})
+    bulk = Player({"name": "Bulk", "hp": 500})
+    for player in (one_by_one, bulk):
+        player.hp = 10
+        player.inventory['potion'] = 8
+        player.inventory['medium_health_elixir'] = 3
+
+    for _ in range(5):
+        one_by_one.use_item('potion')
+    one_by_one.use_item('medium_health_elixir')
+    assert bulk.use_items('potion', 5) == 5
+    assert bulk.use_items('medium_health_elixir', 1) == 1
+    assert (bulk.hp, bulk.inventory) == (one_by_one.hp, one_by_one.inventory)
+
+    assert bulk.use_items('potion', 100) == 3, "Clamped to the quantity held"
+    assert 'potion' not in bulk.inventory
+    assert bulk.use_items('potion', 1) == 0
+    assert bulk.use_items('iron_sword', 1) == 0, "Not a consumable"
+
+    # Each unit still stacks its own buff
+    manager = EffectManager()
+    player = Player({"name": "Tonic", "hp": 100})
+    player._load_item_by_id = lambda item_id: {'id': item_id, 'name': 'Battle Tonic', 'type': 'consumable',
+                                               'effect': {'atk_boost': 4, 'duration': 3}}
+    player.inventory['battle_tonic'] = 3
+    assert player.use_items('battle_tonic', 3, manager) == 3
+    assert len(manager.get_effects(player)) == 3
+    print("✓ PASS: Same result as single uses")
+
+
+def test_bulk_open():
+    """Loot is rolled per pool entry for the whole batch and granted once"""
+    print("\n=== Test 2: Bulk Open ===")
+    player = Player({"name": "Hoarder", "hp": 100})
+    player.inventory['wooden_chest'] = 500
+    start = time.perf_counter()
+    opened, granted = player.open_containers('wooden_chest', 500, rng=random.Random(3))
+    elapsed = time.perf_counter() - start
+    print(f"Opened {opened} chests in {elapsed * 1000:.2f} ms: {granted}")
+    assert opened == 500 and 'wooden_chest' not in player.inventory
+    grants = {grant[1]: grant for grant in granted}
+    # potion: 60% of 500 chests x2
+    assert 500 < grants['potion'][2] < 700
+    assert player.inventory['potion'] == grants['potion'][2]
+    _, _, upgrades, level = grants['skill_heal_minor']
+    assert player.skill_levels['skill_heal_minor'] == level == upgrades
+    assert elapsed < 0.05
+
+    player.inventory['wooden_chest'] = 2
+    assert player.open_containers('wooden_chest', 10)[0] == 2, "Clamped to the quantity held"
+    assert player.open_containers('wooden_chest', 1) == (0, [])
+    assert player.open_containers('potion', 1) == (0, []), "Not a container"
+    print("✓ PASS: Aggregated grants")
+
+
+def test_bulk_craft():
+    """Crafting N validates the batch up front and is all-or-nothing"""
+    print("\n=== Test 3: Bulk Craft ===")
+    crafting = CraftingSystem(Path(__file__).parent / 'data')
+    inventory = {'herb_healing': 7, 'water_crystal': 3}
+    ok, msg, result, qty = crafting.craft_bulk('health_potion', 3, inventory, 1)
+    print(msg)
+    assert ok and qty == 3 * crafting.planner.outputs['health_potion'][1]
+    assert 'water_crystal' not in inventory and inventory['herb_healing'] == 1
+
+    before = dict(inventory)
+    ok, msg, _, _ = crafting.craft_bulk('health_potion', 1, inventory, 1)
+    assert not ok and inventory == before, "Nothing consumed on failure"
+    assert crafting.craft_item('health_potion', {'herb_healing': 2, 'water_crystal': 1}, 1)[0]
+
+    # Chained batch crafts intermediates first
+    crafting.planner = CraftingPlanner([
+        {'id': 'plank', 'result_item_id': 'plank', 'ingredients': [{'item_id': 'wood', 'quantity': 2}]},
+        {'id': 'box', 'result_item_id': 'box', 'ingredients': [{'item_id': 'plank', 'quantity': 3}]},
+    ])
+    crafting.recipes_by_id = {'box': {'id': 'box', 'name': 'Box'}, 'plank': {'id': 'plank', 'name': 'Plank'}}
+    inventory = {'wood': 13, 'plank': 1}
+    assert not crafting.craft_bulk('box', 2, inventory)[0], "Needs sub-recipes"
+    ok, msg, _, qty = crafting.craft_bulk('box', 2, inventory, use_sub_recipes=True)
+    assert ok and inventory == {'wood': 3, 'box': 2}, inventory
+    assert not crafting.craft_bulk('box', 1, inventory, use_sub_recipes=True)[0]
+    print("✓ PASS: One transaction per batch")
+
+
+def test_craft_buttons_chain_per_amount():
+    """Craft buttons use sub-recipes only for amounts the inventory can't cover directly"""
+    print("\n=== Test 4: Craft Buttons ===")
+    import os
+    import json
+    import tempfile
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from ui_manager import UIManager
+
+    class FakeBattle:
+        def __init__(self, crafting_system):
+            self.crafting_system = crafting_system
+            self.log = []
+
+        def add_log(self, msg, kind='info'):
+            self.log.append(msg)
+
+    recipes = {'recipes': [
+        {'id': 'plank', 'name': 'Plank', 'result_item_id': 'plank', 'ingredients': [{'item_id': 'log', 'quantity': 1}]},
+        {'id': 'box', 'name': 'Box', 'result_item_id': 'box', 'ingredients': [{'item_id': 'plank', 'quantity': 2}]},
+    ]}
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(Path(tmp) / 'recipes.json', 'w', encoding='utf-8') as f:
+            json.dump(recipes, f)
+        battle = FakeBattle(CraftingSystem(tmp))
+    ui = UIManager(screen, data_path=Path(__file__).parent / 'data')
+    ui.crafting_selected_recipe = 'box'
+
+    def craft_buttons(player):
+        ui.crafting_ui_buttons = []
+        ui._draw_craft_content(player, battle, 190, 110, 900, 500)
+        # After the two recipe entries: x1, x5, (x10,) Max
+        return ui.crafting_ui_buttons[2:]
+
+    player = Player({"name": "Carpenter", "hp": 100})
+    player.inventory = {'plank': 2, 'log': 10}
+    buttons = craft_buttons(player)
+    assert len(buttons) == 3, "x1, x5 and Max (6)"
+    buttons[0]['action']()  # x1: direct
+    assert player.inventory == {'log': 10, 'box': 1}, player.inventory
+    player.inventory = {'plank': 2, 'log': 10}
+    craft_buttons(player)[-1]['action']()  # Max: 1 direct + 5 via planks
+    print(battle.log)
+    assert player.inventory == {'box': 6}, player.inventory
+    pygame.quit()
+    print("✓ PASS: Max crafts through sub-recipes")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing Bulk Transactions")
+    print("=" * 60)
+
+    try:
+        test_bulk_use()
+        test_bulk_open()
+        test_bulk_craft()
+        test_craft_buttons_chain_per_amount()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
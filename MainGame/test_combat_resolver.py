@@ -0,0 +1,177 @@
+"""Test CombatResolver snapshots and hit resolution"""
+import sys
+import random
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from player import Player
+from enemy import Enemy
+from effect_manager import EffectManager
+from combat_resolver import CombatResolver
+
+
+def make_enemy(defense=30, hp=1000):
+    enemy = Enemy(name="Dummy", hp=hp, atk=5)
+    enemy.defense = defense
+    return enemy
+
+
+def test_attacker_snapshot():
+    """Snapshot folds modifiers and overcrit thresholds in once"""
+    print("\n=== Test 1: Attacker Snapshot ===")
+    manager = EffectManager()
+    resolver = CombatResolver(manager)
+    player = Player({"name": "Snap", "hp": 100, "atk": 20, "def": 5})
+    player.critchance = 1.4
+    player.critdamage = 1.5
+    manager.add_effect(player, {'type': 'buff', 'stat': 'atk', 'value': 10, 'duration': 2, 'source': 'Test'})
+
+    attacker = resolver.snapshot_attacker(player)
+    print(f"Snapshot: atk={attacker.atk} crit={attacker.crit_chance} critdmg={attacker.crit_damage:.2f} overcrit={attacker.overcrit_chance:.2f}")
+    assert attacker.atk == 30, "Buff should be folded into atk"
+    assert attacker.crit_chance == 1.0, "Crit chance over 100% always crits"
+    assert abs(attacker.crit_damage - 1.9) < 1e-9, "Each 1% overcrit adds 1% crit damage"
+    assert abs(attacker.overcrit_chance - 0.2) < 1e-9, "Overcrit chance is half the excess"
+    try:
+        attacker.atk = 999
+        assert False, "Snapshot should be immutable"
+    except AttributeError:
+        pass
+    print("✓ PASS: Snapshot built once with modifiers")
+
+
+def test_hit_matches_take_damage():
+    """Resolver mitigation gives the same damage as Enemy.take_damage"""
+    print("\n=== Test 2: Mitigation Parity ===")
+    manager = EffectManager()
+    resolver = CombatResolver(manager)
+    player = Player({"name": "Parity", "hp": 100, "atk": 50, "def": 5})
+    player.critchance = 0.0
+    for defense in (0, 15, 30, 45, 75, 120):
+        for pen in (0, 20, 60, 90):
+            player.penetration = pen
+            reference = make_enemy(defense)
+            manager.add_effect(reference, {'type': 'debuff', 'stat': 'def', 'value': -5, 'duration': 3, 'source': 'Test'})
+            expected = reference.take_damage(137, pen, manager)
+
+            target = make_enemy(defense)
+            target.effect_handle = reference.effect_handle  # share the debuff
+            hit = resolver.resolve_hit(resolver.snapshot_attacker(player), resolver.snapshot_defender(target), 137)
+            assert hit.damage == expected, f"def={defense} pen={pen}: {hit.damage} != {expected}"
+            assert target.hp == reference.hp
+    print("✓ PASS: Same damage as take_damage")
+
+
+def test_overcrit_rolls():
+    """Crit chance > 100% always crits; overcrit triples the crit multiplier"""
+    print("\n=== Test 3: Overcrit Rolls ===")
+    resolver = CombatResolver(rng=random.Random(3))
+    player = Player({"name": "Crit", "hp": 100, "atk": 100, "def": 5})
+    player.critchance = 2.0
+    player.critdamage = 2.0
+    attacker = resolver.snapshot_attacker(player)
+    rolls = [resolver.roll_crit(attacker) for _ in range(2000)]
+    assert all(is_crit for is_crit, _, _ in rolls), "Always crit above 100%"
+    overcrits = sum(1 for _, over, _ in rolls if over)
+    print(f"Overcrits: {overcrits}/2000 (expected ~1000)")
+    assert 800 < overcrits < 1200
+    assert all(mult == 9.0 for _, over, mult in rolls if over), "Overcrit = 3x (2.0 + 1.0)"
+    print("✓ PASS: Overcrit computed from snapshot thresholds")
+
+
+def test_batched_multi_hit():
+    """A combo resolves in one pass and stops at the overkill point"""
+    print("\n=== Test 4: Batched Multi-Hit ===")
+    resolver = CombatResolver(rng=random.Random(11))
+    player = Player({"name": "Flurry", "hp": 100, "atk": 100, "def": 5})
+    player.critchance = 0.5
+    player.critdamage = 2.0
+    attacker = resolver.snapshot_attacker(player)
+
+    target = make_enemy(defense=0, hp=10**9)
+    combo = resolver.resolve_multi_hit(attacker, resolver.snapshot_defender(target), 10, 1000)
+    assert len(combo.hits) == 1000 and combo.total == sum(h.damage for h in combo.hits)
+    assert target.hp == 10**9 - combo.total, "HP updated once with the total"
+    assert {h.damage for h in combo.hits} <= {10, 20}, "Only normal/crit outcomes without overcrit"
+    print(f"1000 hits: total={combo.total} crits={combo.crit_count}")
+
+    target = make_enemy(defense=0, hp=35)
+    combo = resolver.resolve_multi_hit(attacker, resolver.snapshot_defender(target), 10, 100000)
+    print(f"Overkill stop after {len(combo.hits)} hits")
+    assert target.hp == 0 and len(combo.hits) <= 4, "Stop at the killing blow"
+    print("✓ PASS: Combo batched and capped")
+
+
+def test_multi_hit_matches_per_hit():
+    """Batched combo deals what hit-by-hit resolution would, for each crit rounding"""
+    print("\n=== Test 5: Batched vs Per-Hit ===")
+    player = Player({"name": "Flurry", "hp": 100, "atk": 100, "def": 5})
+    player.critchance = 0.5
+    player.critdamage = 1.7
+    for crit_round in (round, int):
+        resolver = CombatResolver(rng=random.Random(7))
+        attacker = resolver.snapshot_attacker(player)
+        defender = resolver.snapshot_defender(make_enemy(defense=20, hp=10**9))
+        # 7 * 1.7 = 11.9: rounding gives 12, truncation 11
+        combo = resolver.resolve_multi_hit(attacker, defender, 7, 200, crit_round=crit_round)
+
+        rng = random.Random(7)
+        expected = []
+        for _ in range(200):
+            is_crit = rng.random() < attacker.crit_chance
+            raw = int(crit_round(7 * attacker.crit_damage)) if is_crit else 7
+            expected.append(resolver.mitigate(defender, raw, attacker.pen_percent))
+        assert [hit.damage for hit in combo.hits] == expected, crit_round
+        assert combo.crit_count > 0
+    print("✓ PASS: Same damage per hit")
+
+
+def test_multi_hit_weapon_event():
+    """A high-hit weapon emits one aggregated damage event"""
+    print("\n=== Test 6: Aggregated Combo Event ===")
+    from battle_system import BattleSystem
+    player = Player({"name": "Weaver", "hp": 100, "atk": 30, "def": 5, "game_seed": 5})
+    battle = BattleSystem(player)
+    battle.enemy.hp = battle.enemy.max_hp = 10**6
+    battle.damage_events.clear()
+    battle._execute_multi_hit_attack({'hits': 500, 'damage_per_hit': 0.1})
+    enemy_events = [ev for ev in battle.damage_events if ev.get('target') == 'enemy']
+    assert len(enemy_events) == 1, "One event per combo"
+    assert len(enemy_events[0]['hits']) == 500
+    assert enemy_events[0]['amount'] == 10**6 - battle.enemy.hp
+
+    # Multi-hit skills go through the same batched path
+    battle.skill_manager.skills['test_flurry'] = {'id': 'test_flurry', 'name': 'Flurry', 'type': 'damage', 'power': 40,
+                                                  'scaling_stat': 'atk', 'multi_hit': {'hits': 50, 'damage_per_hit': 0.2}}
+    events = []
+    before = battle.enemy.hp
+    result, _ = battle.skill_manager.use_skill(player, battle.enemy, 'test_flurry', battle.effect_manager, events)
+    assert len(events) == 1 and len(events[0]['hits']) == 50 and result['hit_count'] == 50
+    assert result['damage'] == events[0]['amount'] == before - battle.enemy.hp
+    print("✓ PASS: One event with per-hit detail")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing Combat Resolver")
+    print("=" * 60)
+
+    try:
+        test_attacker_snapshot()
+        test_hit_matches_take_damage()
+        test_overcrit_rolls()
+        test_batched_multi_hit()
+        test_multi_hit_matches_per_hit()
+        test_multi_hit_weapon_event()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
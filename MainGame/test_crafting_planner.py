@@ -0,0 +1,139 @@
+"""Test the crafting planner (recipe DAG, max craftable, craft plans)"""
+import sys
+import time
+import random
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from crafting_system import CraftingSystem
+from crafting_planner import CraftingPlanner
+
+DATA_PATH = Path(__file__).parent / 'data'
+
+
+def recipe(recipe_id, result, ingredients, result_quantity=1, level=1):
+    return {'id': recipe_id, 'result_item_id': result, 'result_quantity': result_quantity, 'required_level': level,
+            'ingredients': [{'item_id': item_id, 'quantity': qty} for item_id, qty in ingredients.items()]}
+
+
+def run_plan(planner, plan, inventory):
+    """Execute plan steps on a copy of the inventory; None if a step can't be afforded"""
+    inventory = dict(inventory)
+    for recipe_id, times in plan.steps:
+        for item_id, qty in planner.ingredients[recipe_id]:
+            inventory[item_id] = inventory.get(item_id, 0) - qty * times
+            if inventory[item_id] < 0:
+                return None
+        result, result_qty = planner.outputs[recipe_id]
+        inventory[result] = inventory.get(result, 0) + result_qty * times
+    return inventory
+
+
+def test_direct_counts_match_can_craft():
+    """Without sub-recipes, counts are min(have // need) and agree with can_craft"""
+    print("\n=== Test 1: Direct Counts ===")
+    crafting = CraftingSystem(DATA_PATH)
+    inventory = {'herb_healing': 7, 'water_crystal': 3, 'broken_tool': 10, 'iron_core': 4, 'iron_ore': 5}
+    counts = crafting.get_max_craftable(inventory, 10)
+    for r in crafting.recipes:
+        can_craft, _ = crafting.can_craft(r['id'], inventory, 10)
+        assert (counts[r['id']] > 0) == can_craft, r['id']
+    assert counts['health_potion'] == 3
+    assert counts['greatscraphammercraft'] == 2
+    assert crafting.get_max_craftable(inventory, 1)['greatscraphammercraft'] == 0, "Level 5 recipe"
+    print(f"✓ PASS: {sum(1 for c in counts.values() if c)} recipes craftable")
+
+
+def test_chained_plan():
+    """Intermediates are crafted from the inventory; shared demand is summed"""
+    print("\n=== Test 2: Multi-Step Plan ===")
+    planner = CraftingPlanner([
+        recipe('plank', 'plank', {'wood': 2}),
+        recipe('box', 'box', {'plank': 3, 'nail': 1}),
+        recipe('crate', 'crate', {'box': 1, 'plank': 2}),
+        recipe('nails', 'nail', {'iron': 1}, result_quantity=4),
+    ])
+    inventory = {'wood': 13, 'plank': 1, 'iron': 1}
+    counts = planner.max_craftable(inventory)
+    # 7 planks available (1 + 13 // 2), nails come from iron (4 per craft)
+    assert counts == {'plank': 6, 'box': 2, 'crate': 1, 'nails': 1}, counts
+
+    plan = planner.plan('crate', 1, inventory)
+    print(f"Crate plan: {plan.steps}")
+    assert not plan.missing
+    assert sorted(plan.steps[:2]) == [('nails', 1), ('plank', 4)]
+    assert plan.steps[2:] == [('box', 1), ('crate', 1)]
+    assert plan.consumed == {'plank': 1, 'wood': 8, 'iron': 1}
+    assert run_plan(planner, plan, inventory)['crate'] == 1
+
+    plan = planner.plan('crate', 2, inventory)
+    # 2 crates need 10 planks: 9 crafted (18 wood) from 13 wood
+    assert plan.missing == {'wood': 5}, plan.missing
+    assert planner.plan('gold_bar', 1, inventory).missing == {'gold_bar': 1}, "No recipe"
+    print("✓ PASS: Minimal plan with intermediates")
+
+
+def test_max_counts_are_exact():
+    """Max count is feasible and max + 1 is not, on a random recipe DAG"""
+    print("\n=== Test 3: Random DAG ===")
+    rng = random.Random(5)
+    tiers = [[f"raw{i}" for i in range(20)]]
+    recipes = []
+    for tier in range(3):
+        pool = [item for items in tiers for item in items]
+        made = []
+        for n in range(30):
+            result = f"t{tier}_{n}"
+            needs = {rng.choice(tiers[-1]): rng.randint(1, 3)}
+            for item in rng.sample(pool, k=rng.randint(0, 2)):
+                needs[item] = rng.randint(1, 3)
+            recipes.append(recipe('r_' + result, result, needs, result_quantity=rng.choice([1, 1, 2])))
+            made.append(result)
+        tiers.append(made)
+    planner = CraftingPlanner(recipes)
+    inventory = {item: rng.randint(0, 25) for item in tiers[0]}
+    inventory.update({item: rng.randint(0, 2) for item in rng.sample(tiers[1] + tiers[2], 15)})
+
+    counts = planner.max_craftable(inventory)
+    for recipe_id, count in counts.items():
+        if count:
+            after = run_plan(planner, planner.plan_recipe(recipe_id, count, inventory), inventory)
+            assert after is not None, f"{recipe_id} x{count} should be craftable"
+        assert planner.plan_recipe(recipe_id, count + 1, inventory).missing, f"{recipe_id} x{count + 1} too many"
+
+    # A page of recipes after an inventory change stays well under a frame
+    ids = list(planner.ingredients)
+    timings = []
+    for n in range(10):
+        inventory[f"raw{n}"] += 1
+        start = time.perf_counter()
+        planner.max_craftable(inventory, 1, ids[-6:])
+        timings.append(time.perf_counter() - start)
+    fresh = CraftingPlanner(recipes)
+    assert planner.max_craftable(inventory) == fresh.max_craftable(inventory), "Kept counts still valid"
+    print(f"Page recompute: {max(timings) * 1000:.3f} ms max")
+    assert max(timings) < 0.005
+    print("✓ PASS: Exact counts")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing Crafting Planner")
+    print("=" * 60)
+
+    try:
+        test_direct_counts_match_can_craft()
+        test_chained_plan()
+        test_max_counts_are_exact()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,205 @@
+"""Test EffectManager bookkeeping: stable handles, aggregated stat modifiers and the expiry timeline"""
+import sys
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from player import Player
+from enemy import Enemy
+from effect_manager import EffectManager
+from battle_system import BattleSystem
+
+
+def buff(stat, value, duration):
+    return {'type': 'buff', 'stat': stat, 'value': value, 'duration': duration, 'source': 'Test'}
+
+
+def test_modifiers_track_add_and_expire():
+    """Modifier sums follow effects being added, expiring and removed"""
+    print("\n=== Test 1: Aggregated Modifiers ===")
+    manager = EffectManager()
+    player = Player({"name": "Buffed", "hp": 100, "atk": 10, "def": 5})
+
+    manager.add_effect(player, buff('atk', 8, 1))
+    manager.add_effect(player, buff('atk', 4, 3))
+    manager.add_effect(player, {'type': 'debuff', 'stat': 'def', 'value': -3, 'duration': 2, 'source': 'Test'})
+    print(f"Modifiers: {manager.apply_active_effects(player)}")
+    assert manager.apply_active_effects(player) == {'atk': 12, 'def': -3}
+
+    manager.tick_effects(player)
+    assert manager.get_modifier(player, 'atk') == 4, "Expired buff should be subtracted"
+    manager.tick_effects(player)
+    assert manager.get_modifier(player, 'def') == 0, "Expired debuff should be subtracted"
+    manager.tick_effects(player)
+    assert manager.apply_active_effects(player) == {}, "All effects expired"
+    print("✓ PASS: Modifiers updated incrementally")
+
+
+def test_handles_are_not_reused():
+    """A new enemy never inherits effects from a previous one"""
+    print("\n=== Test 2: Stable Handles ===")
+    manager = EffectManager()
+    old_enemy = Enemy(name="Old")
+    manager.add_effect(old_enemy, {'type': 'debuff', 'stat': 'def', 'value': -10, 'duration': 5, 'source': 'Test'})
+    handle = old_enemy.effect_handle
+    del old_enemy
+
+    # Spawn many enemies; CPython may hand out the freed address again
+    for _ in range(50):
+        new_enemy = Enemy(name="New")
+        assert manager.apply_active_effects(new_enemy) == {}, "Fresh enemy should have no effects"
+        assert new_enemy.effect_handle is None, "Handles are only assigned when an effect is added"
+    new_enemy = Enemy(name="New")
+    assert EffectManager.get_handle(new_enemy) != handle
+    print("✓ PASS: Handles are unique")
+
+
+def test_effects_released_when_enemy_leaves():
+    """Replacing battle.enemy drops the old enemy's effects"""
+    print("\n=== Test 3: Cleanup On Enemy Change ===")
+    player = Player({"name": "Cleaner", "hp": 100, "atk": 10, "def": 5, "game_seed": 7})
+    battle = BattleSystem(player)
+    for _ in range(30):
+        battle.effect_manager.add_effect(battle.enemy, {'type': 'dot', 'damage': 3, 'duration': 3, 'source': 'Test'})
+        battle.effect_manager.add_effect(battle.enemy, {'type': 'debuff', 'stat': 'def', 'value': -2, 'duration': 3, 'source': 'Test'})
+        battle.enemy = Enemy.random_enemy(battle.wave)
+    tracked = len(battle.effect_manager.active_effects)
+    print(f"Tracked entities after 30 enemy swaps: {tracked}")
+    assert tracked <= 1, "Only the current enemy may hold effects"
+    assert len(battle.effect_manager.stat_modifiers) <= 1
+    print("✓ PASS: Memory stays flat across enemies")
+
+
+def test_timeline_ticks_only_expired():
+    """Ticking pops only the effects whose expiry turn has come"""
+    print("\n=== Test 4: Expiry Timeline ===")
+    manager = EffectManager()
+    player = Player({"name": "Clock", "hp": 100, "atk": 10, "def": 5})
+    for duration in range(1, 201):
+        manager.add_effect(player, buff('atk', 1, duration))
+    assert manager.get_modifier(player, 'atk') == 200
+
+    expired = manager.tick_effects(player)
+    assert len(expired) == 1 and expired[0].duration == 0, "Only the 1-turn buff should expire"
+    assert manager.get_modifier(player, 'atk') == 199
+    longest = manager.get_effects(player)[-1]
+    assert manager.get_remaining_duration(player, longest) == 199, "Remaining turns follow the entity clock"
+    for _ in range(198):
+        manager.tick_effects(player)
+    assert len(manager.get_effects(player)) == 1
+    print(f"Summary: {manager.get_effect_summary(player)}")
+    assert manager.get_effect_summary(player) == ["+1 ATK (1t) [Test]"]
+    assert len(manager.tick_effects(player)) == 1
+    assert manager.get_effects(player) == []
+    print("✓ PASS: Expired effects popped in order")
+
+
+def test_ids_unique_after_removal():
+    """Effect ids are never reused within a battle, even after removal"""
+    print("\n=== Test 5: Unique Effect IDs ===")
+    manager = EffectManager()
+    enemy = Enemy(name="Target")
+    first = manager.add_effect(enemy, {'type': 'debuff', 'stat': 'def', 'value': -4, 'duration': 3, 'source': 'A'})
+    manager.add_effect(enemy, {'type': 'debuff', 'stat': 'def', 'value': -2, 'duration': 3, 'source': 'B'})
+    manager.remove_effect(enemy, first)
+    assert manager.get_modifier(enemy, 'def') == -2, "Removed debuff should be subtracted"
+    third = manager.add_effect(enemy, {'type': 'debuff', 'stat': 'def', 'value': -1, 'duration': 3, 'source': 'C'})
+    ids = [e.id for e in manager.get_effects(enemy)]
+    assert len(set(ids)) == len(ids) and third != first, "Ids must stay unique"
+    # The removed effect's heap entry surfaces later and is skipped
+    for _ in range(3):
+        manager.tick_effects(enemy)
+    assert manager.apply_active_effects(enemy) == {}
+    print("✓ PASS: Ids unique, removals skipped lazily")
+
+
+def test_dot_and_counter_buckets():
+    """DoTs are summed from their own bucket; counters are looked up directly"""
+    print("\n=== Test 6: DoT And Counter Buckets ===")
+    manager = EffectManager()
+    enemy = Enemy(name="Burning")
+    enemy.hp = 100
+    player = Player({"name": "Caster", "hp": 100, "atk": 10, "def": 5})
+    manager.add_effect(enemy, {'type': 'debuff', 'stat': 'def', 'value': -2, 'duration': 5, 'source': 'Test'})
+    manager.add_effect(enemy, {'type': 'dot', 'damage': 5, 'duration': 2, 'source': 'Burn'}, caster=player)
+    manager.add_effect(enemy, {'type': 'dot', 'damage': 3, 'duration': 1, 'source': 'Bleed'})
+    # Physical DoT scales 20% with caster atk: 5 + 2
+    assert manager.process_dot_effects(enemy) == 10
+    assert enemy.hp == 90
+    manager.tick_effects(enemy)
+    assert manager.process_dot_effects(enemy) == 7, "Expired DoT leaves the bucket"
+
+    assert manager.has_counter_effect(player) is None
+    manager.add_effect(player, {'type': 'counter', 'damage_percent': 1.0, 'duration': 2, 'source': 'Parry',
+                                'damage_stored': 0, 'turn_count': 0})
+    assert manager.has_counter_effect(player).source == 'Parry'
+    manager.tick_effects(player)
+    manager.tick_effects(player)
+    assert manager.has_counter_effect(player) is None, "Counter expires with its duration"
+    print("✓ PASS: Buckets kept in sync")
+
+
+def test_templates_are_cloned():
+    """Skill and item effects are cloned from shared templates, never mutated in place"""
+    print("\n=== Test 7: Effect Templates ===")
+    from skill_manager import SkillManager
+    from effects import Counter, COUNTER
+    skills = SkillManager()
+    manager = EffectManager()
+    player = Player({"name": "Parry", "hp": 100, "atk": 10, "def": 5})
+    enemy = Enemy(name="Brute")
+
+    counter_skill = next(s for s in skills.skills.values()
+                         if any(e.get('type') == 'counter' for e in s.get('effects', [])))
+    template = skills.effect_templates[counter_skill['id']][0]
+    assert isinstance(template, Counter) and template.kind == COUNTER
+    skills.apply_skill_effects(counter_skill, player, enemy, manager)
+    live = manager.has_counter_effect(player)
+    assert live is not template, "Applied effect must be a clone"
+    manager.store_counter_damage(player, 40)
+    assert live.damage_stored == 40 and template.damage_stored == 0, "Template must stay pristine"
+    assert not hasattr(live, '__dict__'), "Effect records are slotted"
+    print("✓ PASS: Templates cloned onto entities")
+
+
+def test_item_boosts_use_records():
+    """Consumable stat boosts become Buff records on the player"""
+    print("\n=== Test 8: Item Boosts ===")
+    manager = EffectManager()
+    player = Player({"name": "Drinker", "hp": 100, "atk": 10, "def": 5})
+    player._load_item_by_id = lambda item_id: {'id': item_id, 'name': 'Rage Tonic', 'type': 'consumable',
+                                               'effect': {'atk_boost': 6, 'def_boost': 2, 'duration': 3}}
+    player.inventory = {'rage_tonic': 2}
+    assert player.use_item('rage_tonic', manager)
+    assert manager.apply_active_effects(player) == {'atk': 6, 'def': 2}
+    assert player.use_item('rage_tonic', manager)
+    assert manager.get_modifier(player, 'atk') == 12, "Each use stacks its own clone"
+    print(f"Summary: {manager.get_effect_summary(player)}")
+    print("✓ PASS: Item boosts applied as Buff records")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing Effect Manager")
+    print("=" * 60)
+
+    try:
+        test_modifiers_track_add_and_expire()
+        test_handles_are_not_reused()
+        test_effects_released_when_enemy_leaves()
+        test_timeline_ticks_only_expired()
+        test_ids_unique_after_removal()
+        test_dot_and_counter_buckets()
+        test_templates_are_cloned()
+        test_item_boosts_use_records()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
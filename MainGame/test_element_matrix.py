@@ -0,0 +1,100 @@
+"""Test the element x category effectiveness matrix and equipment bonus vector"""
+import sys
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from player import Player
+from enemy import Enemy
+from skill_manager import SkillManager
+from elements import element_index
+
+
+def reference_multiplier(skill, category):
+    """The original strong_vs/weak_vs list check"""
+    effectiveness = skill.get('effectiveness', {})
+    if category in effectiveness.get('strong_vs', []):
+        return 1.5
+    if category in effectiveness.get('weak_vs', []):
+        return 0.5
+    return 1.0
+
+
+def test_matrix_matches_lists():
+    """Matrix lookups agree with the skills.json lists for every category"""
+    print("\n=== Test 1: Effectiveness Matrix ===")
+    manager = SkillManager()
+    categories = ['beast', 'undead', 'dragon', 'demon', 'construct', 'elemental', 'fey', None, 'unheard_of']
+    enemy = Enemy(name="Target")
+    for skill in manager.skills.values():
+        for category in categories:
+            enemy.category = category
+            expected = reference_multiplier(skill, category)
+            assert manager.get_effectiveness_multiplier(skill, enemy) == expected, \
+                f"{skill['id']} vs {category}"
+    # Ad-hoc skill dicts still work
+    enemy.category = 'fey'
+    adhoc = {'id': 'x', 'effectiveness': {'strong_vs': ['fey']}}
+    assert manager.get_effectiveness_multiplier(adhoc, enemy) == 1.5
+    print(f"Categories indexed: {sorted(manager.category_index)}")
+    print("✓ PASS: Matrix matches strong_vs/weak_vs")
+
+
+def test_equipment_bonus_vector():
+    """Bonus vector is built from damage_type_bonuses and only rebuilt on equipment change"""
+    print("\n=== Test 2: Element Bonus Vector ===")
+    manager = SkillManager()
+    player = Player({"name": "Pyro", "hp": 100, "atk": 10, "def": 5})
+    items = {
+        'ember_ring': {'id': 'ember_ring', 'type': 'relic', 'damage_type_bonuses': {'fire': 20, 'void': 5}},
+        'frost_charm': {'id': 'frost_charm', 'type': 'relic', 'damage_type_bonuses': {'fire': 5, 'ice': 10}},
+    }
+    loads = []
+
+    def fake_load(item_id):
+        loads.append(item_id)
+        return items.get(item_id)
+    player._load_item_by_id = fake_load
+
+    player.equipment['relic1'] = 'ember_ring'
+    assert manager.get_damage_type_bonus(player, 'fire') == 20
+    assert manager.get_damage_type_bonus(player, 'void') == 5, "Elements missing from elements.json still work"
+    assert manager.get_damage_type_bonus(player, 'ice') == 0
+    assert loads == ['ember_ring'], "Vector built once for unchanged equipment"
+
+    player.equipment['relic2'] = 'frost_charm'
+    assert manager.get_damage_type_bonus(player, 'fire') == 25
+    assert manager.get_damage_type_bonus(player, 'ice') == 10
+    assert element_index('void') == element_index('void')
+
+    # Skill damage reads the element index precomputed at load
+    fire_skill = next(skill for skill in manager.skills.values() if skill.get('element') == 'fire')
+    assert manager.skill_element_index[fire_skill['id']] == element_index('fire')
+    attacker = manager.combat.snapshot_attacker(player)
+    boosted = manager._skill_raw_damage(fire_skill, player, None, attacker)
+    player.equipment['relic1'] = player.equipment['relic2'] = None
+    plain = manager._skill_raw_damage(fire_skill, player, None, attacker)
+    assert boosted == int(plain * 1.25), (boosted, plain)
+    print(f"Item loads: {loads}")
+    print("✓ PASS: Vector rebuilt only on equipment change")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing Element Matrix")
+    print("=" * 60)
+
+    try:
+        test_matrix_matches_lists()
+        test_equipment_bonus_vector()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
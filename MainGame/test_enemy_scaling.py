@@ -0,0 +1,99 @@
+"""Test the precomputed enemy scaling tables and flyweight monster templates"""
+import sys
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+import enemy as enemy_module
+from enemy import Enemy
+
+
+def _scale_value(base_val, wave, per_wave_pct, flat_per_5waves=0, is_boss=False):
+    """The original per-call scaling formula, kept as the reference"""
+    if not is_boss:
+        per_wave_pct = per_wave_pct * 0.6
+    return max(1, int(round(base_val * (1.0 + per_wave_pct * wave) + (wave // 5) * flat_per_5waves)))
+
+
+def test_curves_match_scale_value():
+    """Stat curves agree with the per-call scaling formula"""
+    print("\n=== Test 1: Stat Curves ===")
+    data = Enemy._load_monsters()
+    scaling = data['scaling_notes']
+    for mon in data['enemies'][:10]:
+        curves = Enemy.stat_curves(mon['id'], 120)
+        first = enemy_module._monster_data['by_id'][mon['id']]
+        is_boss = first.is_boss
+        for wave in (1, 5, 37, 120):
+            expected_hp = _scale_value(first.hp_base, wave,
+                                       float(scaling['hp_scale_per_wave_pct']), flat_per_5waves=10, is_boss=is_boss)
+            assert curves['hp'][wave - 1] == expected_hp, f"{mon['id']} wave {wave}"
+            spawned = Enemy.from_id(mon['id'], wave)
+            for stat in enemy_module.SCALED_STATS:
+                assert curves[stat][wave - 1] == getattr(spawned, stat), f"{mon['id']} {stat} wave {wave}"
+    print(f"Grunt HP waves 1-10: {Enemy.stat_curves('grunt_basic', 10)['hp']}")
+    print("✓ PASS: Curves match spawned enemies")
+
+
+def test_table_is_bounded():
+    """The lazily filled table never exceeds its LRU bound"""
+    print("\n=== Test 2: LRU Bound ===")
+    old_size = enemy_module.SCALING_CACHE_SIZE
+    enemy_module.SCALING_CACHE_SIZE = 50
+    try:
+        for wave in range(1, 500):
+            Enemy.from_id('grunt_basic', wave)
+        assert len(enemy_module._scaling_cache) <= 50
+        # Recent waves are hits, not recomputed
+        row = enemy_module._scaling_cache[next(reversed(enemy_module._scaling_cache))]
+        assert Enemy.from_id('grunt_basic', 499).hp == row[1]
+    finally:
+        enemy_module.SCALING_CACHE_SIZE = old_size
+    print("✓ PASS: Table bounded")
+
+
+def test_enemies_share_templates():
+    """Spawned enemies hold a shared immutable template and no __dict__"""
+    print("\n=== Test 3: Flyweight Templates ===")
+    first = Enemy.from_id('grunt_basic', 12)
+    second = Enemy.from_id('grunt_basic', 12)
+    assert first.template is second.template, "Template shared between spawns"
+    assert first.name == "Grunt Lv.12" and first.id == 'grunt_basic' and first.category == 'beast'
+    assert not hasattr(first, '__dict__'), "Enemy uses __slots__"
+    first.hp -= 5
+    assert second.hp == second.max_hp, "HP is per instance"
+    try:
+        first.template.hp_base = 999
+        assert False, "Templates are immutable"
+    except AttributeError:
+        pass
+    # Gold/XP are clamped at 0 like the Enemy constructor does
+    cursed = enemy_module.MonsterTemplate({'id': 'cursed', 'gold_base': -40, 'xp_base': -3})
+    spawned = Enemy._spawn(cursed, 12, {})
+    assert spawned.gold == 0 and spawned.xp == 0
+    # Ad-hoc enemies still work
+    slime = Enemy(name="Slime", hp="oops")
+    assert slime.hp == 30 and slime.id is None and not slime.is_boss
+    print("✓ PASS: Enemies share templates")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing Enemy Scaling Tables")
+    print("=" * 60)
+
+    try:
+        test_curves_match_scale_value()
+        test_table_is_bounded()
+        test_enemies_share_templates()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
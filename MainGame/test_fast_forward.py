@@ -0,0 +1,114 @@
+"""Test fast-forward (auto-resolve) waves mode"""
+import sys
+import json
+import time
+import random
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from player import Player
+from battle_system import BattleSystem
+from shop import Shop
+from auto_battle import AutoPlayPolicy, fast_forward
+
+DATA_PATH = Path(__file__).parent / 'data'
+
+
+def make_battle(hp=3000, atk=400, defense=40):
+    player = Player({"name": "Skipper", "hp": hp, "atk": atk, "def": defense, "game_seed": 7})
+    player.skills = ['skill_power_strike', 'skill_heal_minor']
+    player.skill_levels = {skill_id: 1 for skill_id in player.skills}
+    return BattleSystem(player)
+
+
+def test_hundred_waves_fast():
+    """100 waves resolve in well under a second with drops, shops and zones"""
+    print("\n=== Test 1: 100 Waves ===")
+    random.seed(1)
+    with open(DATA_PATH / 'zones.json', 'r', encoding='utf-8') as f:
+        zones = json.load(f)['zones']
+    battle = make_battle()
+    battle.current_zone = zones[0]
+    player = battle.player
+    gold_before = player.gold
+    battle.damage_events.append({'type': 'note', 'msg': 'before', 'time': time.time()})
+
+    start = time.perf_counter()
+    summary = battle.fast_forward(100, policy=AutoPlayPolicy(restock_potions=3), zones=zones, shop=Shop(DATA_PATH))
+    elapsed = time.perf_counter() - start
+    print(f"{summary['waves_cleared']} waves in {elapsed * 1000:.0f} ms, {summary['shops']} shops, "
+          f"zones {summary['zone_changes']}")
+    assert elapsed < 1.0, f"Too slow: {elapsed:.2f}s"
+    assert summary['waves_cleared'] == 100 and battle.wave == 101
+    assert summary['kills'] + summary['shops'] >= 100
+    assert summary['gold'] == player.gold - gold_before
+    assert summary['levels'] == player.level - 1 and summary['levels'] > 0
+    assert summary['loot'], "Drops collected"
+    # Auto-bought potions count in the shop statistics like interactive purchases
+    assert summary['bought'] and player.total_items_bought == sum(summary['bought'].values())
+    assert player.total_gold_spent > 0
+    assert summary['zone_changes'], "Zones rolled on waves 25/50/75/100"
+    assert player.highest_wave == 101
+    # UI only receives the summary note
+    notes = [ev.get('msg') for ev in battle.damage_events]
+    assert notes == ['before', notes[-1]] and notes[-1].startswith('Fast-forward: 100 waves')
+    print("✓ PASS: Fast and summarized")
+
+
+def test_policy_potions_and_skills():
+    """Potions below the HP threshold, skills by priority, basic attack otherwise"""
+    print("\n=== Test 2: Auto-Play Policy ===")
+    battle = make_battle()
+    player = battle.player
+    policy = AutoPlayPolicy(skill_priority=['skill_heal_minor', 'skill_power_strike'], potion_threshold=0.5)
+    # Healthy: heal skill is skipped, power strike picked
+    assert policy.choose_skill(battle) == 'skill_power_strike'
+    player.hp = 1
+    assert policy.choose_skill(battle) == 'skill_heal_minor'
+    player.current_mana = 0
+    assert policy.choose_skill(battle) is None, "No mana -> basic attack"
+
+    player.add_item({'id': 'potion', 'name': 'Potion', 'type': 'consumable', 'effect': {'heal': 50}}, auto_equip=False)
+    assert policy.choose_potion(player) == 'potion'
+    offer = {'id': 'potion', 'type': 'consumable', 'effect': {'heal': 50}, '_final_cost': 1}
+    assert policy.shop(player, [offer]) == [], "No restocking by default"
+    player.gold = 10
+    assert len(AutoPlayPolicy(restock_potions=3).shop(player, [offer])) == 2, "Tops up to 3 potions"
+    print("✓ PASS: Policy choices")
+
+
+def test_stops_when_player_dies():
+    """A losing run stops early and reports the defeat"""
+    print("\n=== Test 3: Defeat ===")
+    random.seed(2)
+    battle = make_battle(hp=20, atk=1, defense=0)
+    sounds = battle.sounds
+    summary = fast_forward(battle, 100, policy=AutoPlayPolicy(use_skills=False))
+    print(f"Died after {summary['waves_cleared']} waves")
+    assert summary['died'] and battle.player.is_dead()
+    assert summary['waves_cleared'] < 100
+    assert battle.sounds is sounds, "Sounds restored"
+    print("✓ PASS: Defeat reported")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing Fast-Forward Mode")
+    print("=" * 60)
+
+    try:
+        test_hundred_waves_fast()
+        test_policy_potions_and_skills()
+        test_stops_when_player_dies()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
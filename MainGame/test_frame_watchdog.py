@@ -0,0 +1,90 @@
+"""Test the frame-budget watchdog (slow frames logged with the main thread's stack)"""
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from frame_watchdog import FrameWatchdog
+
+
+def slow_zone_load(seconds):
+    time.sleep(seconds)
+
+
+def test_slow_frame_logged_with_stack():
+    """An overrun is logged with phase, context and the stack at the deadline"""
+    print("\n=== Test 1: Slow Frame ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / 'profiles' / 'slow_frames.log'
+        watchdog = FrameWatchdog(20, log_path=log_path, context=lambda: {'wave': 25, 'modal': 'crafting'})
+        watchdog.start()
+        try:
+            # Fast frame: nothing logged
+            watchdog.begin_frame()
+            watchdog.mark('events')
+            assert watchdog.end_frame() is None
+
+            watchdog.begin_frame()
+            watchdog.mark('events')
+            watchdog.mark('battle.update')
+            watchdog.mark('ui.update')
+            slow_zone_load(0.08)
+            elapsed = watchdog.end_frame()
+        finally:
+            watchdog.stop()
+        text = log_path.read_text(encoding='utf-8')
+    print(text)
+    assert elapsed and elapsed >= 80
+    assert watchdog.overruns == 1 and watchdog.logged == 1
+    assert 'SLOW FRAME' in text and 'phase=other' in text
+    assert 'wave=25' in text and 'modal=crafting' in text
+    assert 'in slow_zone_load' in text, "Stack captured while the frame was running"
+    print("✓ PASS: Logged with stack")
+
+
+def test_rate_limit():
+    """Back-to-back overruns are counted but only one stack per interval is written"""
+    print("\n=== Test 2: Rate Limit ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / 'slow_frames.log'
+        watchdog = FrameWatchdog(5, log_path=log_path, min_interval=60)
+        watchdog.start()
+        try:
+            for _ in range(3):
+                watchdog.begin_frame('shop')
+                slow_zone_load(0.015)
+                watchdog.end_frame()
+        finally:
+            watchdog.stop()
+        text = log_path.read_text(encoding='utf-8')
+    assert watchdog.overruns == 3 and watchdog.logged == 1
+    assert text.count('SLOW FRAME') == 1 and 'phase=shop' in text
+    # Not started: frames are not measured
+    idle = FrameWatchdog(1)
+    idle.begin_frame()
+    slow_zone_load(0.005)
+    assert idle.end_frame() is None
+    print("✓ PASS: One stack per interval")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing Frame Watchdog")
+    print("=" * 60)
+
+    try:
+        test_slow_frame_logged_with_stack()
+        test_rate_limit()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
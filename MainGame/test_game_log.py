@@ -0,0 +1,110 @@
+"""Test leveled subsystem logging (lazy formatting, queue output, muting)"""
+import io
+import os
+import sys
+import logging
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+import game_log
+from game_log import get_logger, parse_levels, setup_logging, shutdown_logging, muted
+from player import Player
+
+
+class Expensive:
+    """Counts how often it is formatted"""
+    calls = 0
+
+    def __str__(self):
+        Expensive.calls += 1
+        return "expensive"
+
+
+def _reset():
+    shutdown_logging()
+    root = logging.getLogger(game_log.ROOT)
+    root.setLevel(logging.NOTSET)
+    root.propagate = True
+    for subsystem in game_log.SUBSYSTEMS:
+        get_logger(subsystem).setLevel(logging.NOTSET)
+
+
+def test_levels_and_lazy_formatting():
+    """Per-subsystem levels; disabled messages are never formatted"""
+    print("\n=== Test 1: Levels ===")
+    assert parse_levels('combat=debug, drops=WARNING') == {'combat': logging.DEBUG, 'drops': logging.WARNING}
+    assert parse_levels('DEBUG') == {'': logging.DEBUG}
+    assert parse_levels('combat=bogus') == {'combat': logging.INFO}
+
+    stream = io.StringIO()
+    old_env = os.environ.pop(game_log.ENV_VAR, None)
+    os.environ[game_log.ENV_VAR] = 'drops=DEBUG'
+    try:
+        setup_logging({'level': 'INFO', 'combat': 'WARNING'}, stream=stream)
+        Expensive.calls = 0
+        get_logger('combat').debug("hit %s", Expensive())
+        get_logger('combat').info("hit %s", Expensive())
+        assert Expensive.calls == 0, "Disabled records are not formatted"
+        get_logger('combat').warning("combat %s", 'warning')
+        get_logger('drops').debug("drop %s", 'debug')
+        get_logger('waves').info("wave %s", 7)
+        get_logger('waves').debug("wave %s", 'debug')
+    finally:
+        _reset()
+        if old_env is None:
+            os.environ.pop(game_log.ENV_VAR, None)
+        else:
+            os.environ[game_log.ENV_VAR] = old_env
+    lines = stream.getvalue().splitlines()
+    print(lines)
+    assert lines == ['combat warning', 'drop debug', 'wave 7']
+    print("✓ PASS: Levels per subsystem")
+
+
+def test_game_messages_and_muted():
+    """Game code logs through its subsystem; muted() silences info chatter"""
+    print("\n=== Test 2: Game Messages ===")
+    stream = io.StringIO()
+    try:
+        setup_logging({'level': 'INFO'}, stream=stream)
+        player = Player({"name": "Logger", "hp": 100})
+        player.gain_xp(10 ** 4)
+        get_logger('combat').setLevel('DEBUG')
+        logging.getLogger('other').setLevel(logging.INFO)
+        with muted():
+            player.gain_xp(10 ** 5)
+            get_logger('combat').warning("still %s", 'shown')
+            get_logger('combat').info("combat %s", 'chatter')
+            # Only the game's loggers are raised
+            assert logging.getLogger('other').isEnabledFor(logging.INFO)
+            assert logging.root.manager.disable == logging.NOTSET
+        assert get_logger('combat').level == logging.DEBUG, "Levels restored"
+    finally:
+        _reset()
+    text = stream.getvalue()
+    print(text)
+    assert text.count('est maintenant niveau') == 1
+    assert 'still shown' in text and 'combat chatter' not in text
+    print("✓ PASS: Routed through the queue")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing Game Logging")
+    print("=" * 60)
+
+    try:
+        test_levels_and_lazy_formatting()
+        test_game_messages_and_muted()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
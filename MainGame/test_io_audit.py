@@ -0,0 +1,91 @@
+"""Test the data-file I/O audit tracer (opt-in via VL_IO_AUDIT)"""
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from io_audit import IOAudit
+from enemy import Enemy
+
+DATA_PATH = Path(__file__).parent / 'data'
+
+
+def read_items():
+    with open(DATA_PATH / 'items.json', 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_counts_per_frame_and_site():
+    """Opens and parses are counted once each, with the calling line"""
+    print("\n=== Test 1: Counting ===")
+    audit = IOAudit(startup_frames=2)
+    assert not audit.enabled, "Off unless installed"
+    audit.install(report_at_exit=False)
+    try:
+        audit.begin_frame(turn_key=(1, 'player'))
+        read_items()
+        # Outside the data/asset roots: not counted
+        with tempfile.TemporaryFile() as f:
+            f.write(b'{}')
+        json.loads('{}')
+        audit.begin_frame(turn_key=(1, 'player'))
+        audit.begin_frame(turn_key=(1, 'enemy'))
+    finally:
+        audit.uninstall()
+    kinds = {(kind, path): count for (kind, path, _), count in audit.events.items()}
+    print(kinds)
+    assert kinds == {('open', 'data/items.json'): 1, ('parse', 'data/items.json'): 1, ('parse', '<string>'): 1}
+    sites = {site for _, _, site in audit.events}
+    assert any(site.startswith('test_io_audit.py:') and '(read_items)' in site for site in sites), sites
+    assert audit.per_frame[1] == 3 and audit.frame == 3 and audit.turn == 2
+    assert audit.steady_state_reads() == 0
+    print("✓ PASS: One open + one parse per read")
+
+
+def test_steady_state_guard():
+    """Cached loaders read nothing after startup; a stray read is reported"""
+    print("\n=== Test 2: Steady State ===")
+    audit = IOAudit(startup_frames=1)
+    Enemy.random_enemy(10)
+    audit.install(report_at_exit=False)
+    try:
+        for wave in range(2, 6):
+            audit.begin_frame(turn_key=(wave, 'player'))
+            Enemy.random_enemy(wave)
+        assert audit.steady_state_reads() == 0, audit.report()
+        audit.begin_frame(turn_key=(6, 'player'))
+        read_items()
+    finally:
+        audit.uninstall()
+    report = audit.report()
+    print(report)
+    assert audit.steady_state_reads() == 2
+    assert '❌ Steady state' in report and 'data/items.json' in report
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = audit.report_at_exit(tmp)
+        assert path.read_text(encoding='utf-8') == report
+    print("✓ PASS: Guard catches reads")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing I/O Audit")
+    print("=" * 60)
+
+    try:
+        test_counts_per_frame_and_site()
+        test_steady_state_guard()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,83 @@
+"""Test the stack-sampling profiler (collapsed stacks and top-N summary)"""
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from sampling_profiler import SamplingProfiler
+
+
+def hot_loop(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(200))
+    return total
+
+
+def outer(seconds):
+    return hot_loop(seconds)
+
+
+def test_samples_main_thread():
+    """Stacks of the calling thread are sampled root first"""
+    print("\n=== Test 1: Sampling ===")
+    profiler = SamplingProfiler(interval=0.002)
+    assert profiler.start() and not profiler.start(), "Already running"
+    outer(0.3)
+    samples = profiler.stop()
+    print(f"{samples} samples")
+    assert samples > 10 and not profiler.running
+    assert profiler.stop() == 0
+
+    top = profiler.top(5)
+    print(top)
+    label, own, total = top[0]
+    assert label.startswith('test_sampling_profiler.py:hot_loop:'), label
+    assert own > samples * 0.8 and total >= own
+
+    lines = profiler.collapsed()
+    stack, count = lines[0].rsplit(' ', 1)
+    frames = stack.split(';')
+    assert frames[-1].split(':')[1] == 'hot_loop' and frames[-2].split(':')[1] == 'outer', frames
+    assert sum(int(line.rsplit(' ', 1)[1]) for line in lines) == samples
+    print("✓ PASS: hot_loop on top")
+
+
+def test_write_files():
+    """A .folded flamegraph input and a .txt summary are written"""
+    print("\n=== Test 2: Output Files ===")
+    profiler = SamplingProfiler()
+    profiler.start(interval=0.002)
+    hot_loop(0.1)
+    profiler.stop()
+    with tempfile.TemporaryDirectory() as tmp:
+        folded, summary = profiler.write(Path(tmp) / 'profiles')
+        folded_lines = folded.read_text(encoding='utf-8').splitlines()
+        summary_text = summary.read_text(encoding='utf-8')
+    assert folded_lines and all(line.rsplit(' ', 1)[1].isdigit() for line in folded_lines)
+    assert 'hot_loop' in summary_text and 'self%' in summary_text
+    print("✓ PASS: Files written")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing Sampling Profiler")
+    print("=" * 60)
+
+    try:
+        test_samples_main_thread()
+        test_write_files()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,183 @@
+"""Test the append-only save journal (deltas between full snapshots)"""
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from player import Player
+from save_manager import SaveManager
+
+
+class FakeBattle:
+    def __init__(self, wave):
+        self.wave = wave
+        self.current_zone = {'id': 'flower_field'}
+        self.enemy = None
+        self.in_shop = False
+
+
+def make_player():
+    player = Player({"name": "Journal", "hp": 100, "atk": 10, "def": 5, "gold": 50, "game_seed": 1})
+    player.inventory = {"potion": 2, "broken_tool": 1}
+    return player
+
+
+def test_journal_replay():
+    """Deltas appended after a snapshot are replayed by load()"""
+    print("\n=== Test 1: Journal Replay ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SaveManager(tmp)
+        player = make_player()
+        manager.save(player, battle=FakeBattle(10))
+
+        # Three waves of progress, journaled only
+        for wave in (11, 12, 13):
+            player.gold += 25
+            player.xp += 5
+            player.inventory["potion"] = player.inventory.get("potion", 0) + 1
+            if wave == 12:
+                player.remove_item("broken_tool", 1)
+                player.equipment["weapon"] = "iron_sword"
+            assert manager.append_journal(player, battle=FakeBattle(wave)), "Journal entry should be written"
+
+        # Nothing changed: no entry
+        assert not manager.append_journal(player, battle=FakeBattle(13)), "Unchanged state should not be journaled"
+
+        data = SaveManager(tmp).load()
+        print(f"Loaded gold={data['gold']} wave={data['wave']} inventory={data['inventory']}")
+        assert data['gold'] == player.gold, "Gold should include journaled deltas"
+        assert data['xp'] == player.xp, "XP should include journaled deltas"
+        assert data['wave'] == 13, "Wave should be the last journaled wave"
+        assert data['inventory'] == {"potion": 5}, "Removed stacks should be gone after replay"
+        assert data['equipment']['weapon'] == "iron_sword", "Equipment change should be replayed"
+    print("✓ PASS: Journal deltas replayed on load")
+
+
+def test_full_save_truncates_journal():
+    """A full snapshot supersedes the journal"""
+    print("\n=== Test 2: Snapshot Truncates Journal ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SaveManager(tmp)
+        player = make_player()
+        manager.save(player, battle=FakeBattle(1))
+        player.gold = 999
+        manager.append_journal(player, battle=FakeBattle(2))
+        assert manager.journal_path.exists(), "Journal file should exist after append"
+        manager.save(player, battle=FakeBattle(2))
+        assert not manager.journal_path.exists(), "Full save should remove the journal"
+        assert SaveManager(tmp).load()['gold'] == 999
+    print("✓ PASS: Full save replaces journal")
+
+
+def test_compaction():
+    """Journal past the size threshold is folded into a new snapshot"""
+    print("\n=== Test 3: Journal Compaction ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SaveManager(tmp, journal_compact_bytes=256)
+        player = make_player()
+        manager.save(player, battle=FakeBattle(1))
+        for wave in range(2, 30):
+            player.gold += 10
+            player.inventory[f"loot_{wave}"] = wave
+            manager.append_journal(player, battle=FakeBattle(wave))
+        if manager._compact_thread is not None:
+            manager._compact_thread.join()
+        assert not manager.compacting_path.exists(), "Compaction should finish and remove rotated journal"
+        size = manager.journal_path.stat().st_size if manager.journal_path.exists() else 0
+        print(f"Journal size after compaction: {size} bytes")
+        data = SaveManager(tmp).load()
+        assert data['gold'] == player.gold, "Compacted snapshot + journal should match live state"
+        assert data['inventory'] == player.inventory, "Compacted inventory should match live state"
+    print("✓ PASS: Journal compacted without losing deltas")
+
+
+def test_level_up_replayed():
+    """A crash after a level-up keeps the level's gains and the shop counters"""
+    print("\n=== Test 4: Level-Up Replay ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SaveManager(tmp)
+        player = make_player()
+        manager.save(player, battle=FakeBattle(1))
+        player.level_up(6)  # -> level 7
+        player.total_gold_spent, player.total_items_bought, player.cumulative_price_increase = 120, 3, 0.15
+        manager.append_journal(player, battle=FakeBattle(2))
+
+        # Crash: only the snapshot and the journal are on disk
+        data = SaveManager(tmp).load()
+        print(f"Replayed level={data['level']} points={data['unspent_points']} base_max_hp={data['base_max_hp']}")
+        assert data['level'] == 7 and data['unspent_points'] == player.unspent_points == 18
+        for key in ('max_hp', 'base_max_hp', 'base_atk', 'base_defense', 'base_agility', 'base_hp_regen',
+                    'total_gold_spent', 'total_items_bought', 'cumulative_price_increase'):
+            assert data[key] == getattr(player, key), key
+    print("✓ PASS: Level gains replayed")
+
+
+def test_failed_compaction_recovers():
+    """A compaction that fails is retried by the next one instead of blocking it"""
+    print("\n=== Test 5: Failed Compaction ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SaveManager(tmp)
+        player = make_player()
+        manager.save(player, battle=FakeBattle(1))
+        player.gold += 10
+        manager.append_journal(player, battle=FakeBattle(2))
+
+        def broken_snapshot(data):
+            raise OSError("disk full")
+        manager._write_snapshot = broken_snapshot
+        manager.compact_journal(background=False)
+        assert manager.compacting_path.exists(), "Rotated journal kept after the failure"
+        del manager._write_snapshot
+
+        player.gold += 10
+        player.inventory["late_loot"] = 1
+        manager.append_journal(player, battle=FakeBattle(3))
+        assert SaveManager(tmp).load()['gold'] == player.gold, "Nothing lost before the retry"
+        manager.compact_journal(background=False)
+        assert not manager.compacting_path.exists() and not manager.journal_path.exists()
+        data = SaveManager(tmp).load()
+        assert data['gold'] == player.gold and data['wave'] == 3
+        assert data['inventory'] == player.inventory
+    print("✓ PASS: Compaction retried")
+
+
+def test_torn_line_ignored():
+    """A partially written last line (crash mid-append) is skipped"""
+    print("\n=== Test 6: Torn Journal Line ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SaveManager(tmp)
+        player = make_player()
+        manager.save(player, battle=FakeBattle(1))
+        player.gold = 70
+        manager.append_journal(player, battle=FakeBattle(2))
+        with open(manager.journal_path, 'ab') as f:
+            f.write(b"eyJnb2xkIjo")
+        data = SaveManager(tmp).load()
+        assert data['gold'] == 70, "Intact entries should still be replayed"
+    print("✓ PASS: Torn line ignored")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing Save Journal")
+    print("=" * 60)
+
+    try:
+        test_journal_replay()
+        test_full_save_truncates_journal()
+        test_compaction()
+        test_level_up_replayed()
+        test_failed_compaction_recovers()
+        test_torn_line_ignored()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,118 @@
+"""Test memoized shop offers and the item id index"""
+import sys
+import random
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+import shop as shop_module
+from shop import Shop, ShopOffer
+
+DATA_PATH = Path(__file__).parent / 'data'
+
+
+def reference_offers(items, wave, player_seed, cumulative_increase=0.0, current_zone=None):
+    """The original full-catalog scan that copied every offered item"""
+    rng = random.Random((player_seed + wave * 7919) % 1000000007)
+    offers = []
+    for i in items:
+        cost = i.get('cost')
+        if cost is None:
+            continue
+        shop_zones = i.get('shop_zones', [])
+        if shop_zones and current_zone:
+            zone_id = current_zone.get('id') if isinstance(current_zone, dict) else current_zone
+            if zone_id not in shop_zones:
+                continue
+        if rng.random() > float(i.get('shopchance', 1.0)):
+            continue
+        gv = i.get('goldvariation')
+        final_cost = cost
+        if gv is not None:
+            if isinstance(gv, list) and len(gv) >= 2:
+                factor = rng.uniform(float(gv[0]), float(gv[1]))
+            else:
+                factor = float(gv)
+            final_cost = max(1, int(cost * (1.0 + factor)))
+        adjusted_increase = cumulative_increase
+        if wave > 50 and wave % 5 == 0:
+            adjusted_increase = cumulative_increase * 2
+        final_cost = max(1, int(final_cost * (1.0 + adjusted_increase)))
+        offers.append({**i, '_final_cost': final_cost})
+    return offers
+
+
+def test_offers_match_reference():
+    """Seeded offers are identical to the original implementation"""
+    print("\n=== Test 1: Offer Parity ===")
+    shop = Shop(DATA_PATH)
+    zones = [None, {'id': 'flower_field'}, {'id': 'volcanic_peak'}, 'dark_forest']
+    checked = 0
+    for seed in (1, 4242):
+        for wave in (1, 10, 55, 60):
+            for zone in zones:
+                for increase in (0.0, 0.8):
+                    expected = reference_offers(shop.items, wave, seed, increase, zone)
+                    offers = shop.get_offers_for_wave(wave, seed, increase, zone)
+                    assert [dict(o) for o in offers] == expected, f"seed={seed} wave={wave} zone={zone}"
+                    checked += 1
+    print(f"✓ PASS: {checked} seeded shops identical")
+
+
+def test_memoized_views():
+    """Reopening a shop reuses the cached views; the cache is bounded"""
+    print("\n=== Test 2: Memoized Offer Views ===")
+    shop = Shop(DATA_PATH)
+    first = shop.get_offers_for_wave(12, 99, 0.25, {'id': 'flower_field'})
+    again = shop.get_offers_for_wave(12, 99, 0.25, {'id': 'flower_field'})
+    assert first == again and all(a is b for a, b in zip(first, again)), "Same views returned"
+    offer = first[0]
+    assert isinstance(offer, ShopOffer)
+    assert offer.item is shop.find_item(offer.get('id')), "View references the catalog item"
+    assert offer['_final_cost'] == offer.get('_final_cost') == offer.final_cost
+    assert offer.get('missing', 'x') == 'x' and '_final_cost' in offer
+    purchase = {k: v for k, v in offer.items() if not k.startswith('_')}
+    assert purchase == offer.item and purchase is not offer.item
+
+    old_size = shop_module.OFFER_CACHE_SIZE
+    shop_module.OFFER_CACHE_SIZE = 5
+    try:
+        for wave in range(1, 30):
+            shop.get_offers_for_wave(wave, 99, 0.0, None)
+        assert len(shop._offer_cache) == 5
+    finally:
+        shop_module.OFFER_CACHE_SIZE = old_size
+    print("✓ PASS: Views cached and bounded")
+
+
+def test_find_item_index():
+    """find_item uses the id index (first definition wins)"""
+    print("\n=== Test 3: Item Index ===")
+    shop = Shop(DATA_PATH)
+    for item in shop.items:
+        expected = next(i for i in shop.items if i.get('id') == item.get('id'))
+        assert shop.find_item(item.get('id')) is expected
+    assert shop.find_item('does_not_exist') is None
+    print(f"✓ PASS: {len(shop.items_by_id)} items indexed")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing Shop Offers")
+    print("=" * 60)
+
+    try:
+        test_offers_match_reference()
+        test_memoized_views()
+        test_find_item_index()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
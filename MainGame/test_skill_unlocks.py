@@ -0,0 +1,154 @@
+"""Test indexed skill unlocks (level table, item map, boss drops)"""
+import sys
+import json
+import random
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+import skill_index
+from skill_index import get_skill_index, skills_for_levels, skills_for_item
+from player import Player
+from battle_system import BattleSystem
+
+SKILLS_PATH = Path(__file__).parent / 'data' / 'skills.json'
+
+
+def load_skills():
+    with open(SKILLS_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)['skills']
+
+
+def test_index_matches_scan():
+    """Level table and item map agree with a linear scan of skills.json"""
+    print("\n=== Test 1: Skill Index ===")
+    skills = load_skills()
+    index = get_skill_index()
+    assert list(index.ids) == [s['id'] for s in skills]
+    assert index.unlock_levels == sorted(index.unlock_levels)
+    for low, high in ((0, 4), (0, 5), (4, 9), (5, 10), (10, 1000)):
+        expected = [s['id'] for s in skills
+                    if low < ((s.get('unlock_requirements') or {}).get('level') or 0) <= high]
+        assert sorted(skills_for_levels(low, high)) == sorted(expected), f"({low}, {high}]"
+    for skill in skills:
+        item_id = (skill.get('unlock_requirements') or {}).get('item_equipped')
+        if item_id:
+            assert skill['id'] in skills_for_item(item_id)
+    assert skills_for_item('no_such_item') == ()
+    assert index.required_levels == {s['id']: s['unlock_requirements']['level'] for s in skills
+                                     if (s.get('unlock_requirements') or {}).get('level')}
+    mtime = skill_index._cache['mtime']
+    get_skill_index()
+    assert skill_index._cache['mtime'] == mtime, "Index built once per file version"
+    print(f"Level unlocks: {list(zip(index.unlock_levels, index.level_skills))}")
+    print("✓ PASS: Index matches skills.json")
+
+
+def _scan_level_unlocks(player, all_skills, levels_gained):
+    """The original skills.json scan, applied to a plain skills/skill_levels copy"""
+    skills, levels = player['skills'], player['skill_levels']
+    level = player['level']
+    for skill in all_skills:
+        skill_id = skill.get('id')
+        required_level = (skill.get('unlock_requirements') or {}).get('level')
+        if required_level and level >= required_level and skill_id:
+            times = level - max(level - levels_gained + 1, required_level) + 1
+            if skill_id not in skills:
+                skills.append(skill_id)
+                levels[skill_id] = 1
+            else:
+                levels[skill_id] = levels.get(skill_id, 1) + 1
+            if times > 1:
+                levels[skill_id] = levels.get(skill_id, 1) + times - 1
+
+
+def test_level_unlocks_match_scan():
+    """Level-ups unlock new skills and keep leveling owned ones, like the skills.json scan"""
+    print("\n=== Test 2: Level Unlocks ===")
+    player = Player({"name": "Learner", "hp": 100})
+    player.level_up(4)  # -> level 5
+    assert player.skill_levels.get('skill_fireball_advanced') == 1
+    player.level_up()  # -> level 6: owned skills level up again
+    assert player.skill_levels.get('skill_fireball_advanced') == 2
+    player.level_up(4)  # -> level 10
+    assert player.skill_levels.get('skill_fireball_advanced') == 6
+    assert 'skill_lightning_bolt' in player.skills
+
+    all_skills = load_skills()
+    rng = random.Random(9)
+    player = Player({"name": "Grinder", "hp": 100})
+    player.unlock_skill('skill_ice_lance')  # owned early (e.g. a boss drop)
+    reference = {'level': player.level, 'skills': list(player.skills), 'skill_levels': dict(player.skill_levels)}
+    for _ in range(12):
+        gained = rng.randint(1, 9)
+        player.level_up(gained)
+        reference['level'] += gained
+        _scan_level_unlocks(reference, all_skills, gained)
+        assert player.skills == reference['skills'] and player.skill_levels == reference['skill_levels']
+    print(f"Level {player.level}: {len(player.skills)} skills, same as the scan")
+    print("✓ PASS: Same unlocks as the scan")
+
+
+def test_unowned_set_and_boss_drop():
+    """Unowned set is kept up to date and boss drops pick in file order"""
+    print("\n=== Test 3: Boss Unlocks ===")
+    index = get_skill_index()
+    player = Player({"name": "Slayer", "hp": 100})
+    unowned = player.get_unowned_skills()
+    assert unowned == set(index.ids)
+    player.unlock_skill('skill_ice_lance')
+    assert 'skill_ice_lance' not in player.get_unowned_skills()
+    assert player.get_unowned_skills() is unowned, "Maintained, not rebuilt"
+    # Replacing the list (save load, character select) rebuilds the set
+    player.skills = ['skill_shield_bash']
+    assert player.get_unowned_skills() == set(index.ids) - {'skill_shield_bash'}
+
+    battle = BattleSystem(player)
+    random.seed(4)
+    picks = []
+    for _ in range(400):
+        before = set(player.skills)
+        battle._try_boss_skill_unlock()
+        picks.extend(set(player.skills) - before)
+    # Same choice as the old "scan skills.json in order" implementation
+    random.seed(4)
+    reference = ['skill_shield_bash']
+    expected = []
+    for _ in range(400):
+        if random.random() > 0.15:
+            continue
+        locked = [sid for sid in index.ids if sid not in reference]
+        if not locked:
+            random.choice(reference)
+            continue
+        choice = random.choice(locked)
+        reference.append(choice)
+        expected.append(choice)
+    assert picks == expected
+    assert not player.get_unowned_skills()
+    messages = [entry['message'] for entry in battle.combat_log]
+    assert f"Boss dropped skill: {index.names[picks[0]]}!" in messages, "Name from the id -> name map"
+    print(f"Boss drops: {picks[:4]}...")
+    print("✓ PASS: Boss drops use the unowned set")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing Skill Unlock Indexes")
+    print("=" * 60)
+
+    try:
+        test_index_matches_scan()
+        test_level_unlocks_match_scan()
+        test_unowned_set_and_boss_drop()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,86 @@
+"""Test the startup timeline and deferred loading"""
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from startup_profile import StartupTimeline, DeferredTasks, FLAG
+from player import Player
+from battle_system import BattleSystem
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_timeline():
+    """Steps record their offset and duration; report only with the flag"""
+    print("\n=== Test 1: Timeline ===")
+    clock = FakeClock()
+    timeline = StartupTimeline.from_argv(['main.py', FLAG], start=0.0)
+    timeline.clock = clock
+    clock.now = 0.050
+    timeline.mark('imports')
+    clock.now = 0.120
+    timeline.first_frame()
+    clock.now = 0.500
+    timeline.first_frame()
+    assert [label for label, _, _ in timeline.steps] == ['imports', 'first frame']
+    assert abs(timeline.elapsed('first frame') - 120.0) < 1e-6
+    assert abs(timeline.steps[1][2] - 70.0) < 1e-6
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = timeline.finish(tmp)
+        assert 'Time to first frame: 120.0 ms' in path.read_text(encoding='utf-8')
+    assert timeline.finish(tmp) is None, "Reported once"
+    assert StartupTimeline.from_argv(['main.py']).finish() is None, "Off without the flag"
+    print("✓ PASS: Timeline")
+
+
+def test_deferred_tasks():
+    """One task per call, in order; a failing load doesn't stop the rest"""
+    print("\n=== Test 2: Deferred Tasks ===")
+    timeline = StartupTimeline()
+    deferred = DeferredTasks(timeline)
+    done = []
+    deferred.add('a', lambda: done.append('a'))
+    deferred.add('broken', lambda: 1 / 0)
+    deferred.add('b', lambda: done.append('b'))
+    assert deferred.run_next() and done == ['a'] and len(deferred) == 2
+    while deferred.run_next():
+        pass
+    assert done == ['a', 'b']
+    assert [label for label, _, _ in timeline.steps] == ['deferred: a', 'deferred: broken', 'deferred: b']
+
+    # Battle sounds are decoded on demand, not in the constructor
+    battle = BattleSystem(Player({"name": "Quiet", "hp": 100}))
+    assert battle.sounds is None
+    battle.play_sound('monster_hit')
+    assert isinstance(battle.sounds, dict)
+    print("✓ PASS: Deferred in order")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing Startup Profile")
+    print("=" * 60)
+
+    try:
+        test_timeline()
+        test_deferred_tasks()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,82 @@
+"""Test closed-form XP leveling with the cumulative XP table"""
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+from player import Player, xp_required_for, level_for_total_xp, total_xp_for_level
+
+
+def reference_levels(level, xp):
+    """The original one-level-at-a-time loop"""
+    required = xp_required_for(level)
+    while xp >= required:
+        xp -= required
+        level += 1
+        required = xp_required_for(level)
+    return level, xp
+
+
+def test_table_matches_loop():
+    """Binary search over the cumulative table gives the same level and leftover XP"""
+    print("\n=== Test 1: Cumulative XP Table ===")
+    assert total_xp_for_level(1) == 0
+    assert total_xp_for_level(3) == xp_required_for(1) + xp_required_for(2)
+    for total in (0, 99, 100, 382, 383, 10**5, 10**7):
+        assert level_for_total_xp(total) == reference_levels(1, total), f"total={total}"
+    for start in (1, 2, 9, 40):
+        for amount in (0, 1, 282, 5000, 123456, 10**6):
+            player = Player({"name": "Grinder", "hp": 100})
+            player.level = start
+            player.gain_xp(amount)
+            assert (player.level, player.xp) == reference_levels(start, amount), f"start={start} +{amount}"
+    print("✓ PASS: Same levels as the per-level loop")
+
+
+def test_batched_level_up():
+    """Per-level gains are all applied; unlocks run once for the range"""
+    print("\n=== Test 2: Batched Level-Up ===")
+    player = Player({"name": "Batch", "hp": 100})
+    checks = []
+    original_check = player._check_level_unlocks
+    player._check_level_unlocks = lambda levels=1: checks.append(levels) or original_check(levels)
+
+    player.level_up(6)  # levels 2..7, milestones at 3 and 6
+    assert player.level == 7
+    assert player.unspent_points == 18
+    assert player.base_max_hp == 100 + 6 * 10 + 2 * 5
+    assert player.base_atk == 10 + 2 and player.base_agility == 2
+    assert checks == [6], "Unlock check runs once"
+    # skill_fireball_advanced needs level 5: unlocked at 5, then leveled at 6 and 7
+    assert player.skill_levels.get('skill_fireball_advanced') == 3
+
+    player = Player({"name": "Whale", "hp": 100})
+    start = time.perf_counter()
+    player.gain_xp(10**9)
+    elapsed = time.perf_counter() - start
+    print(f"1e9 XP -> level {player.level} in {elapsed * 1000:.2f} ms")
+    assert elapsed < 0.1
+    assert (player.level, player.xp) == reference_levels(1, 10**9)
+    print("✓ PASS: Huge grants are instant")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing XP Leveling")
+    print("=" * 60)
+
+    try:
+        test_table_matches_loop()
+        test_batched_level_up()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
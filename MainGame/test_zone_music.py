@@ -0,0 +1,85 @@
+"""Test streamed zone music and its non-blocking crossfade"""
+import os
+import sys
+import tempfile
+import wave
+from pathlib import Path
+
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# Add src directory to path
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+import pygame
+from zone_music import ZoneMusic
+
+
+def _write_track(path, seconds=2.0):
+    """Silent 16-bit stereo WAV"""
+    with wave.open(str(path), 'wb') as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(22050)
+        f.writeframes(b'\x00' * int(22050 * seconds) * 4)
+
+
+def test_zone_change_crossfade():
+    """Zone change fades the track out frame by frame, then starts the new zone's"""
+    print("\n=== Test 1: Zone Crossfade ===")
+    pygame.mixer.init()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ('field.wav', 'forest.wav'):
+                _write_track(Path(tmp) / name)
+            field = {'id': 'flower_field', 'music': ['field.wav', 'missing.ogg']}
+            forest = {'id': 'dark_forest', 'music': ['forest.wav']}
+            music = ZoneMusic(tmp, volume=0.8, fade_ms=1000)
+
+            music.update(field, now=0.0)
+            assert music.state == 'playing' and music.current.name == 'field.wav'
+            assert [p.name for p in music.tracks] == ['field.wav'], "Missing files are skipped"
+
+            music.update(forest, now=10.0)
+            assert music.state == 'fading' and music.current.name == 'field.wav'
+            music.update(forest, now=10.5)
+            assert abs(pygame.mixer.music.get_volume() - 0.4) < 0.02
+            music.update(forest, now=11.0)
+            assert music.state == 'playing' and music.current.name == 'forest.wav'
+
+            # A zone without tracks goes quiet once faded out
+            music.update({'id': 'void_realm'}, now=20.0)
+            music.update({'id': 'void_realm'}, now=21.0)
+            assert music.state == 'idle' and music.current is None
+            music.stop()
+    finally:
+        pygame.mixer.quit()
+    print("✓ PASS: Crossfaded")
+
+
+def test_without_mixer():
+    """No mixer: update is a no-op"""
+    print("\n=== Test 2: No Mixer ===")
+    music = ZoneMusic(tempfile.gettempdir())
+    music.update({'id': 'flower_field', 'music': ['field.wav']}, now=0.0)
+    assert music.state == 'idle'
+    print("✓ PASS: Silent without a mixer")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing Zone Music")
+    print("=" * 60)
+
+    try:
+        test_zone_change_crossfade()
+        test_without_mixer()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
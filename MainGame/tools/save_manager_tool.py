@@ -9,10 +9,14 @@ import sys
 # Add parent directory to path to import from src
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.save_manager import SaveManager
+
 class SaveManagerTool:
     def __init__(self):
         self.save_dir = Path(__file__).parent.parent / "saves"
         self.save_file = self.save_dir / "save.save"
+        # Delta journals written by the game between full snapshots
+        self.journal_files = [self.save_dir / "save.journal.compacting", self.save_dir / "save.journal"]
     
     def decode_save(self, encoded_data):
         """Decode save file"""
@@ -39,7 +43,12 @@ class SaveManagerTool:
         
         data = self.decode_save(encoded)
         if data:
+            # Fold in per-wave journal entries so we edit the latest state
+            manager = SaveManager(self.save_dir)
+            replayed = sum(manager._replay_journal(data, path) for path in self.journal_files)
             print("✅ Save file loaded successfully")
+            if replayed:
+                print(f"✅ Replayed {replayed} journal entries")
         return data
     
     def display_save(self, data):
@@ -159,6 +168,10 @@ class SaveManagerTool:
         encoded = self.encode_save(data)
         with open(self.save_file, 'wb') as f:
             f.write(encoded)
+        # The journal is already folded into data; drop it so it can't override the edits
+        for path in self.journal_files:
+            if path.exists():
+                path.unlink()
         print("✅ Changes saved successfully")
     
     def clear_save(self):
@@ -170,6 +183,9 @@ class SaveManagerTool:
         confirm = input("⚠️  Are you sure you want to delete the save file? (yes/no): ").strip().lower()
         if confirm == 'yes':
             self.save_file.unlink()
+            for path in self.journal_files:
+                if path.exists():
+                    path.unlink()
             print("✅ Save file deleted")
         else:
             print("❌ Cancelled")